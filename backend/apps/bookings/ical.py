@@ -0,0 +1,145 @@
+"""
+Minimal iCalendar (RFC 5545) support for property availability feeds.
+
+Only what channel managers (Airbnb, Booking, VRBO...) exchange is covered: all-day VEVENTs with
+UID, DTSTART/DTEND, SUMMARY and STATUS. No external dependency needed.
+"""
+import datetime
+import hashlib
+
+PRODID = '-//Grupo Bairen//Property Calendar//ES'
+
+
+def _escape(text):
+    return (
+        str(text).replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+        .replace('\r\n', '\\n').replace('\n', '\\n')
+    )
+
+
+def _unescape(text):
+    out, i = [], 0
+    while i < len(text):
+        ch = text[i]
+        if ch == '\\' and i + 1 < len(text):
+            nxt = text[i + 1]
+            out.append('\n' if nxt in 'nN' else nxt)
+            i += 2
+            continue
+        out.append(ch)
+        i += 1
+    return ''.join(out)
+
+
+def _fold(line):
+    # Líneas de máx. 75 octetos; continuación con un espacio inicial
+    raw = line.encode('utf-8')
+    if len(raw) <= 75:
+        return line
+    parts, chunk = [], b''
+    for ch in line:
+        enc = ch.encode('utf-8')
+        if len(chunk) + len(enc) > (75 if not parts else 74):
+            parts.append(chunk.decode('utf-8'))
+            chunk = b''
+        chunk += enc
+    parts.append(chunk.decode('utf-8'))
+    return '\r\n '.join(parts)
+
+
+def _date(value):
+    return value.strftime('%Y%m%d')
+
+
+def _stamp(value):
+    return value.astimezone(datetime.timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def build_calendar(bookings, name, domain):
+    """
+    Renders bookings (iterable of Booking-like objects) as an iCalendar string.
+    Guest data is never exported: events only say Reserved / Blocked.
+    """
+    lines = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        f'PRODID:{PRODID}',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        f'X-WR-CALNAME:{_escape(name)}',
+    ]
+    for b in bookings:
+        summary = 'Blocked' if b.status == 'blocked' else 'Reserved'
+        lines += [
+            'BEGIN:VEVENT',
+            f'UID:booking-{b.id}@{domain}',
+            f'DTSTAMP:{_stamp(b.updated_at)}',
+            f'DTSTART;VALUE=DATE:{_date(b.check_in_date)}',
+            f'DTEND;VALUE=DATE:{_date(b.check_out_date)}',
+            f'SUMMARY:{_escape(summary)}',
+            'STATUS:TENTATIVE' if b.status == 'pending' else 'STATUS:CONFIRMED',
+            'TRANSP:OPAQUE',
+            'END:VEVENT',
+        ]
+    lines.append('END:VCALENDAR')
+    return '\r\n'.join(_fold(line) for line in lines) + '\r\n'
+
+
+def calendar_etag(count, last_updated, last_id):
+    """Strong validator for a feed: changes on any insert, update or delete of its rows."""
+    raw = f'{count}:{last_updated.isoformat() if last_updated else "-"}:{last_id or 0}'
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def _parse_date(value):
+    # DATE (20250101) o DATE-TIME (20250101T140000Z / local); sólo interesa el día
+    value = value.strip()
+    return datetime.date(int(value[0:4]), int(value[4:6]), int(value[6:8]))
+
+
+def parse_events(text):
+    """
+    Parses VEVENTs from an iCalendar string.
+    Returns a list of dicts {uid, check_in_date, check_out_date, summary}; cancelled events and
+    events without UID/DTSTART are skipped. Missing DTEND means a single day.
+    """
+    # Unfold: líneas que empiezan con espacio/tab continúan la anterior
+    unfolded = []
+    for line in text.replace('\r\n', '\n').replace('\r', '\n').split('\n'):
+        if line[:1] in (' ', '\t') and unfolded:
+            unfolded[-1] += line[1:]
+        elif line:
+            unfolded.append(line)
+
+    events, current = [], None
+    for line in unfolded:
+        if line == 'BEGIN:VEVENT':
+            current = {}
+            continue
+        if line == 'END:VEVENT':
+            if current is not None:
+                events.append(current)
+            current = None
+            continue
+        if current is None or ':' not in line:
+            continue
+        head, value = line.split(':', 1)
+        key = head.split(';', 1)[0].upper()
+        current.setdefault(key, value)
+
+    out = []
+    for ev in events:
+        uid = ev.get('UID', '').strip()
+        if not uid or 'DTSTART' not in ev or ev.get('STATUS', '').upper() == 'CANCELLED':
+            continue
+        start = _parse_date(ev['DTSTART'])
+        end = _parse_date(ev['DTEND']) if 'DTEND' in ev else start + datetime.timedelta(days=1)
+        if end <= start:
+            end = start + datetime.timedelta(days=1)
+        out.append({
+            'uid': uid,
+            'check_in_date': start,
+            'check_out_date': end,
+            'summary': _unescape(ev.get('SUMMARY', '')).strip()[:255],
+        })
+    return out
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.1 on 2026-10-19 11:32
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0003_alter_booking_guest'),
+        ('properties', '0008_propertyimage_s3_key_propertyimage_url'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['property', 'status', 'check_in_date'], name='booking_prop_status_in_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['guest', 'created_at'], name='booking_guest_created_idx'),
+        ),
+    ]
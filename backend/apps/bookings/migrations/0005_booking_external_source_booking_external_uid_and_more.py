@@ -0,0 +1,30 @@
+# Generated by Django 5.1.1 on 2026-10-19 11:34
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0004_booking_booking_prop_status_in_idx_and_more'),
+        ('properties', '0008_propertyimage_s3_key_propertyimage_url'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='external_source',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='booking',
+            name='external_uid',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddConstraint(
+            model_name='booking',
+            constraint=models.UniqueConstraint(condition=models.Q(('external_uid', ''), _negated=True), fields=('property', 'external_source', 'external_uid'), name='booking_unique_external_uid'),
+        ),
+    ]
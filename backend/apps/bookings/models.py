@@ -21,11 +21,27 @@ class Booking(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     special_requests = models.TextField(blank=True, null=True)
     reason = models.CharField(max_length=255, blank=True, null=True)  # Nuevo campo 'reason'
+    # Origen de bloqueos importados desde feeds iCal externos (Airbnb, Booking, etc.)
+    external_source = models.CharField(max_length=255, blank=True, default='')
+    external_uid = models.CharField(max_length=255, blank=True, default='')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Calendario / solapamientos por propiedad (owner side)
+            models.Index(fields=['property', 'status', 'check_in_date'], name='booking_prop_status_in_idx'),
+            # Reservas del huésped, ordenadas por fecha de creación (guest side)
+            models.Index(fields=['guest', 'created_at'], name='booking_guest_created_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['property', 'external_source', 'external_uid'],
+                condition=~models.Q(external_uid=''),
+                name='booking_unique_external_uid',
+            ),
+        ]
 
     def __str__(self):
         return f"Booking {self.id} - {self.property.title}"
\ No newline at end of file
@@ -32,4 +32,84 @@ class BookingSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         validated_data['guest'] = self.context['request'].user
-        return super().create(validated_data)
\ No newline at end of file
+        return super().create(validated_data)
+
+# Máximo de entradas por request en las operaciones masivas de bloqueo
+MAX_BULK_BLOCK_ITEMS = 1000
+
+
+class BlockItemSerializer(serializers.Serializer):
+    property = serializers.IntegerField()
+    check_in_date = serializers.DateField()
+    check_out_date = serializers.DateField()
+    reason = serializers.CharField(max_length=255, required=False, allow_blank=True, allow_null=True)
+
+    def validate(self, data):
+        if data['check_in_date'] >= data['check_out_date']:
+            raise serializers.ValidationError({
+                'check_out_date': 'Check-out date must be after check-in date'
+            })
+        return data
+
+
+class BulkBlockSerializer(serializers.Serializer):
+    """
+    Accepts either explicit entries:
+        { "items": [ {"property": 1, "check_in_date": "...", "check_out_date": "...", "reason": "..."}, ... ] }
+    or one date range applied to a set of properties:
+        { "properties": [1, 2, 3], "check_in_date": "...", "check_out_date": "...", "reason": "..." }
+    Entries are validated one by one later so each gets its own result.
+    """
+    items = serializers.ListField(child=serializers.DictField(), required=False)
+    properties = serializers.ListField(child=serializers.IntegerField(), required=False)
+    check_in_date = serializers.DateField(required=False)
+    check_out_date = serializers.DateField(required=False)
+    reason = serializers.CharField(max_length=255, required=False, allow_blank=True, allow_null=True)
+
+    def validate(self, data):
+        if 'items' in data:
+            entries = data['items']
+        elif data.get('properties') and data.get('check_in_date') and data.get('check_out_date'):
+            entries = [
+                {
+                    'property': prop_id,
+                    'check_in_date': data['check_in_date'],
+                    'check_out_date': data['check_out_date'],
+                    'reason': data.get('reason'),
+                }
+                for prop_id in data['properties']
+            ]
+        else:
+            raise serializers.ValidationError(
+                'Provide "items" or "properties" with check_in_date and check_out_date.'
+            )
+        if not entries:
+            raise serializers.ValidationError({'items': ['No entries provided.']})
+        if len(entries) > MAX_BULK_BLOCK_ITEMS:
+            raise serializers.ValidationError({'items': [f'At most {MAX_BULK_BLOCK_ITEMS} entries per request.']})
+        data['entries'] = entries
+        return data
+
+
+class BulkUnblockSerializer(serializers.Serializer):
+    """
+    { "ids": [10, 11] } deletes those blocks, or
+    { "properties": [1, 2], "check_in_date": "...", "check_out_date": "..." } frees that range.
+    """
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False, max_length=MAX_BULK_BLOCK_ITEMS)
+    properties = serializers.ListField(child=serializers.IntegerField(), required=False, max_length=MAX_BULK_BLOCK_ITEMS)
+    check_in_date = serializers.DateField(required=False)
+    check_out_date = serializers.DateField(required=False)
+
+    def validate(self, data):
+        if data.get('ids'):
+            return data
+        if not (data.get('properties') and data.get('check_in_date') and data.get('check_out_date')):
+            raise serializers.ValidationError(
+                'Provide "ids" or "properties" with check_in_date and check_out_date.'
+            )
+        if data['check_in_date'] >= data['check_out_date']:
+            raise serializers.ValidationError({
+                'check_out_date': 'Check-out date must be after check-in date'
+            })
+        return data
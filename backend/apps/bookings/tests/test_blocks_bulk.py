@@ -0,0 +1,90 @@
+import datetime
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from apps.properties.models import Property
+from apps.bookings.models import Booking
+
+User = get_user_model()
+
+D = datetime.date
+
+
+def admin_client():
+    admin = User.objects.create_user(username='admin', email='admin@x.com', password='p', is_staff=True)
+    client = APIClient()
+    client.force_authenticate(admin)
+    return client, admin
+
+
+def make_properties(owner, n):
+    return Property.objects.bulk_create([
+        Property(
+            title=f't{i}', description='d', address='a', city='c', state='s', zip_code='z',
+            property_type='temporal', bedrooms=1, bathrooms=1, square_feet=10, price=10,
+            created_by=owner,
+        )
+        for i in range(n)
+    ])
+
+
+def make_booking(prop, start, end, status):
+    return Booking.objects.create(
+        property=prop, status=status, check_in_date=start, check_out_date=end,
+        guest_count=0, total_amount=0,
+    )
+
+
+def test_bulk_block_range_over_many_properties_uses_constant_queries(db, django_assert_max_num_queries):
+    client, admin = admin_client()
+    props = make_properties(admin, 50)
+    make_booking(props[0], D(2025, 1, 10), D(2025, 1, 12), 'confirmed')
+
+    with django_assert_max_num_queries(8):
+        resp = client.post('/api/blocks/bulk/', {
+            'properties': [p.id for p in props] + [999999],
+            'check_in_date': '2025-01-01',
+            'check_out_date': '2025-03-01',
+            'reason': 'temporada',
+        }, format='json')
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body['ok'] == 49 and body['failed'] == 2
+    assert body['results'][0]['status'] == 'error'
+    assert body['results'][-1]['errors'] == {'property': ['Invalid property.']}
+    assert Booking.objects.filter(status='blocked').count() == 49
+
+
+def test_bulk_block_merges_adjacent_blocks_into_one_row(db):
+    client, admin = admin_client()
+    prop = make_properties(admin, 1)[0]
+    existing = make_booking(prop, D(2025, 1, 1), D(2025, 1, 5), 'blocked')
+    make_booking(prop, D(2025, 1, 20), D(2025, 1, 25), 'blocked')
+
+    resp = client.post('/api/blocks/bulk/', {'items': [
+        {'property': prop.id, 'check_in_date': '2025-01-05', 'check_out_date': '2025-01-10'},
+        {'property': prop.id, 'check_in_date': '2025-01-10', 'check_out_date': '2025-01-20'},
+        {'property': prop.id, 'check_in_date': '2025-01-09', 'check_out_date': '2025-01-08'},
+    ]}, format='json')
+
+    body = resp.json()
+    assert [r['status'] for r in body['results']] == ['merged', 'merged', 'error']
+    blocks = list(Booking.objects.filter(property=prop, status='blocked'))
+    assert len(blocks) == 1
+    assert blocks[0].id == existing.id
+    assert (blocks[0].check_in_date, blocks[0].check_out_date) == (D(2025, 1, 1), D(2025, 1, 25))
+
+
+def test_bulk_unblock_splits_and_trims_blocks(db):
+    client, admin = admin_client()
+    a, b = make_properties(admin, 2)
+    make_booking(a, D(2025, 1, 1), D(2025, 1, 31), 'blocked')
+    make_booking(b, D(2025, 1, 10), D(2025, 1, 15), 'blocked')
+
+    resp = client.post('/api/blocks/bulk_unblock/', {
+        'properties': [a.id, b.id], 'check_in_date': '2025-01-10', 'check_out_date': '2025-01-20',
+    }, format='json')
+
+    assert resp.json() == {'deleted': 1, 'updated': 1, 'created': 1}
+    ranges = sorted(Booking.objects.filter(status='blocked').values_list('property_id', 'check_in_date', 'check_out_date'))
+    assert ranges == [(a.id, D(2025, 1, 1), D(2025, 1, 10)), (a.id, D(2025, 1, 20), D(2025, 1, 31))]
@@ -0,0 +1,67 @@
+import datetime
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from apps.properties.models import Property
+from apps.bookings.models import Booking
+
+User = get_user_model()
+
+
+def make_properties(owner, n):
+    return Property.objects.bulk_create([
+        Property(
+            title=f't{i}', description='d', address='a', city='c', state='s', zip_code='z',
+            property_type='temporal', bedrooms=1, bathrooms=1, square_feet=10, price=10,
+            created_by=owner,
+        )
+        for i in range(n)
+    ])
+
+
+def make_booking(prop, guest=None, status='confirmed'):
+    return Booking.objects.create(
+        property=prop, guest=guest, status=status,
+        check_in_date=datetime.date(2025, 1, 1), check_out_date=datetime.date(2025, 1, 5),
+        guest_count=2, total_amount=100,
+    )
+
+
+def test_host_with_many_properties_lists_bookings_in_constant_queries(db, django_assert_num_queries):
+    host = User.objects.create_user(username='host', email='host@x.com', password='p')
+    guest = User.objects.create_user(username='guest', email='guest@x.com', password='p')
+    props = make_properties(host, 300)
+    Booking.objects.bulk_create([
+        Booking(
+            property=p, guest=guest, status='confirmed',
+            check_in_date=datetime.date(2025, 1, 1), check_out_date=datetime.date(2025, 1, 5),
+            guest_count=2, total_amount=100,
+        )
+        for p in props
+    ])
+
+    client = APIClient()
+    client.force_authenticate(host)
+    # count (paginación) + página
+    with django_assert_num_queries(2):
+        resp = client.get('/api/bookings/')
+    assert resp.status_code == 200
+    assert resp.json()['count'] == 300
+
+
+def test_bookings_visible_to_guest_and_owner_only(db):
+    host = User.objects.create_user(username='host', email='host@x.com', password='p')
+    guest = User.objects.create_user(username='guest', email='guest@x.com', password='p')
+    other = User.objects.create_user(username='other', email='other@x.com', password='p')
+    own_prop, foreign_prop = make_properties(host, 1)[0], make_properties(other, 1)[0]
+    hosted = make_booking(own_prop, guest=other)
+    travelled = make_booking(foreign_prop, guest=host)
+    make_booking(foreign_prop, guest=guest)
+
+    client = APIClient()
+    client.force_authenticate(host)
+    resp = client.get('/api/bookings/')
+    ids = {b['id'] for b in resp.json()['results']}
+    assert ids == {hosted.id, travelled.id}
+
+    resp = client.get(f'/api/bookings/?property={own_prop.id}')
+    assert [b['id'] for b in resp.json()['results']] == [hosted.id]
@@ -0,0 +1,77 @@
+import datetime
+from pathlib import Path
+from django.core.management import call_command
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from apps.properties.models import Property
+from apps.bookings.models import Booking
+
+User = get_user_model()
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+
+def make_property(status='published'):
+    owner = User.objects.create_user(username='host', email='host@x.com', password='p')
+    return Property.objects.create(
+        title='Depto, Palermo', description='d', address='a', city='c', state='s', zip_code='z',
+        property_type='temporal', bedrooms=1, bathrooms=1, square_feet=10, price=10,
+        created_by=owner, status=status,
+    )
+
+
+def run_import(prop, name):
+    call_command('import_ical', '--property-id', str(prop.id), '--file', str(FIXTURES / name), '--source', 'airbnb')
+
+
+def test_import_is_diff_based(db):
+    prop = make_property()
+    run_import(prop, 'airbnb_v1.ics')
+    assert Booking.objects.filter(property=prop, status='blocked', external_source='airbnb').count() == 3
+
+    before = {b.id: b.updated_at for b in Booking.objects.all()}
+    run_import(prop, 'airbnb_v1.ics')  # mismo feed: sin escrituras
+    assert {b.id: b.updated_at for b in Booking.objects.all()} == before
+
+    run_import(prop, 'airbnb_v2.ics')
+    rows = {b.external_uid: b for b in Booking.objects.filter(property=prop)}
+    assert set(rows) == {
+        '1418fb94e984-aaa@airbnb.com', '1418fb94e984-bbb@airbnb.com', '1418fb94e984-ddd@airbnb.com',
+    }
+    aaa, bbb = rows['1418fb94e984-aaa@airbnb.com'], rows['1418fb94e984-bbb@airbnb.com']
+    assert aaa.updated_at == before[aaa.id]  # sin cambios
+    assert bbb.check_out_date == datetime.date(2025, 2, 3)
+    assert rows['1418fb94e984-ddd@airbnb.com'].reason.endswith('to exercise the unfolding logic')
+
+
+def test_feed_exports_events_and_revalidates_with_304(db):
+    prop = make_property()
+    run_import(prop, 'airbnb_v1.ics')
+    client = APIClient()
+
+    resp = client.get(f'/api/calendars/{prop.id}.ics')
+    assert resp.status_code == 200
+    assert resp['Content-Type'].startswith('text/calendar')
+    body = resp.content.decode()
+    assert body.count('BEGIN:VEVENT') == 3
+    assert 'DTSTART;VALUE=DATE:20250105' in body
+    assert 'X-WR-CALNAME:Depto\\, Palermo' in body
+    assert 'UID:booking-' in body and '@bairengroup.com' in body
+    assert not resp.has_header('Last-Modified')
+
+    etag = resp['ETag']
+    resp = client.get(f'/api/calendars/{prop.id}.ics', HTTP_IF_NONE_MATCH=etag)
+    assert resp.status_code == 304
+
+    Booking.objects.filter(property=prop).first().delete()
+    resp = client.get(f'/api/calendars/{prop.id}.ics', HTTP_IF_NONE_MATCH=etag)
+    assert resp.status_code == 200
+    assert resp.content.decode().count('BEGIN:VEVENT') == 2
+    # Sin Last-Modified, If-Modified-Since solo nunca da 304
+    resp = client.get(f'/api/calendars/{prop.id}.ics', HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT')
+    assert resp.status_code == 200
+
+
+def test_feed_hidden_for_unpublished_property(db):
+    prop = make_property(status='draft')
+    assert APIClient().get(f'/api/calendars/{prop.id}.ics').status_code == 404
@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import BlockViewSet, BookingViewSet
+from .views import BlockViewSet, BookingViewSet, property_calendar_feed
 
 router = DefaultRouter()
 router.register(r'bookings', BookingViewSet, basename='booking')
@@ -8,4 +8,5 @@ router.register(r'blocks', BlockViewSet, basename='block')
 
 urlpatterns = [
     path('', include(router.urls)),
+    path('calendars/<int:property_id>.ics', property_calendar_feed, name='property-calendar-feed'),
 ]
\ No newline at end of file
@@ -0,0 +1,235 @@
+from collections import defaultdict
+from django.db import transaction
+from django.utils import timezone
+from apps.properties.models import Property
+from .models import Booking
+
+# Estados que ocupan el calendario y bloquean nuevas reservas/bloqueos
+ACTIVE_STATUSES = ('pending', 'confirmed')
+
+
+def merge_intervals(intervals):
+    """
+    Merges (start, end, payload) intervals that overlap or touch.
+    Dates are half-open like check_in/check_out, so end == next start is adjacent.
+    Returns a list of (start, end, [payloads]) sorted by start.
+    """
+    merged = []
+    for start, end, payload in sorted(intervals, key=lambda i: (i[0], i[1])):
+        if merged and start <= merged[-1][1]:
+            last = merged[-1]
+            last[1] = max(last[1], end)
+            last[2].append(payload)
+        else:
+            merged.append([start, end, [payload]])
+    return [(s, e, p) for s, e, p in merged]
+
+
+def _reason(kind, payload):
+    return payload.reason if kind == 'existing' else payload.get('reason')
+
+
+def apply_bulk_blocks(entries):
+    """
+    Creates blocked bookings for many (property, check_in_date, check_out_date, reason) entries.
+
+    entries: list of dicts already validated (property, check_in_date, check_out_date, reason) with 'index'.
+    Returns per-entry results in the same order. Conflicts are detected with a single query over all
+    properties involved; new blocks are merged with each other and with adjacent/overlapping existing
+    blocks, so each continuous blocked range ends up as one row.
+    """
+    results = {e['index']: {'index': e['index']} for e in entries}
+    if not entries:
+        return []
+
+    property_ids = {e['property'] for e in entries}
+    min_start = min(e['check_in_date'] for e in entries)
+    max_end = max(e['check_out_date'] for e in entries)
+
+    with transaction.atomic():
+        # Lock de las propiedades afectadas: serializa bulk blocks concurrentes sobre el mismo calendario
+        existing_props = set(
+            Property.objects.select_for_update().filter(pk__in=property_ids).values_list('pk', flat=True)
+        )
+
+        # Una sola consulta por conjunto: reservas activas y bloqueos que tocan el rango global
+        by_property = defaultdict(list)
+        candidates = Booking.objects.filter(
+            property_id__in=existing_props,
+            status__in=ACTIVE_STATUSES + ('blocked',),
+            check_in_date__lte=max_end,
+            check_out_date__gte=min_start,
+        ).only('id', 'property_id', 'status', 'check_in_date', 'check_out_date', 'reason')
+        for b in candidates:
+            by_property[b.property_id].append(b)
+
+        accepted = defaultdict(list)
+        for e in entries:
+            res = results[e['index']]
+            if e['property'] not in existing_props:
+                res.update(status='error', errors={'property': ['Invalid property.']})
+                continue
+            conflicts = [
+                b.id for b in by_property[e['property']]
+                if b.status in ACTIVE_STATUSES
+                and b.check_in_date < e['check_out_date'] and b.check_out_date > e['check_in_date']
+            ]
+            if conflicts:
+                res.update(
+                    status='error',
+                    errors={'non_field_errors': ['Property is not available for these dates']},
+                    conflicts=conflicts,
+                )
+                continue
+            accepted[e['property']].append(e)
+
+        to_create, to_update, to_delete = [], [], []
+        # (fila resultante, entradas que la originaron, si hubo merge con bloqueos existentes)
+        outcomes = []
+        now = timezone.now()
+        for prop_id, prop_entries in accepted.items():
+            intervals = [(e['check_in_date'], e['check_out_date'], ('new', e)) for e in prop_entries]
+            intervals += [
+                (b.check_in_date, b.check_out_date, ('existing', b))
+                for b in by_property[prop_id] if b.status == 'blocked'
+            ]
+            for start, end, payloads in merge_intervals(intervals):
+                new = [p for kind, p in payloads if kind == 'new']
+                if not new:
+                    continue  # bloqueo existente no afectado por esta operación
+                existing = sorted((p for kind, p in payloads if kind == 'existing'), key=lambda b: b.id)
+                reason = next((r for r in (_reason(kind, p) for kind, p in payloads) if r), None)
+                if existing:
+                    keep = existing[0]
+                    keep.check_in_date, keep.check_out_date, keep.reason = start, end, reason
+                    keep.updated_at = now
+                    to_update.append(keep)
+                    to_delete.extend(b.id for b in existing[1:])
+                    outcomes.append((keep, new, True))
+                else:
+                    row = Booking(
+                        property_id=prop_id, guest=None, status='blocked',
+                        check_in_date=start, check_out_date=end,
+                        guest_count=0, total_amount=0, reason=reason,
+                    )
+                    to_create.append(row)
+                    outcomes.append((row, new, len(new) > 1))
+
+        if to_delete:
+            Booking.objects.filter(pk__in=to_delete).delete()
+        if to_update:
+            Booking.objects.bulk_update(to_update, ['check_in_date', 'check_out_date', 'reason', 'updated_at'])
+        if to_create:
+            Booking.objects.bulk_create(to_create)
+
+    for row, new, merged in outcomes:
+        for e in new:
+            results[e['index']].update(
+                status='merged' if merged else 'created',
+                id=row.id,
+                property=row.property_id,
+                check_in_date=row.check_in_date,
+                check_out_date=row.check_out_date,
+            )
+    return [results[e['index']] for e in entries]
+
+
+def apply_bulk_unblock(property_ids, start, end):
+    """
+    Frees [start, end) on the given properties: blocks fully inside are deleted, partially
+    overlapping ones are trimmed and blocks spanning the whole range are split in two.
+    Returns counters {'deleted', 'updated', 'created'}.
+    """
+    with transaction.atomic():
+        blocks = list(
+            Booking.objects.select_for_update().filter(
+                property_id__in=property_ids,
+                status='blocked',
+                check_in_date__lt=end,
+                check_out_date__gt=start,
+            )
+        )
+        to_delete, to_update, to_create = [], [], []
+        now = timezone.now()
+        for b in blocks:
+            keeps_left = b.check_in_date < start
+            keeps_right = b.check_out_date > end
+            if not keeps_left and not keeps_right:
+                to_delete.append(b.id)
+                continue
+            if keeps_left and keeps_right:
+                to_create.append(Booking(
+                    property_id=b.property_id, guest=None, status='blocked',
+                    check_in_date=end, check_out_date=b.check_out_date,
+                    guest_count=0, total_amount=0, reason=b.reason,
+                ))
+            if keeps_left:
+                b.check_out_date = start
+            else:
+                b.check_in_date = end
+            b.updated_at = now
+            to_update.append(b)
+
+        if to_delete:
+            Booking.objects.filter(pk__in=to_delete).delete()
+        if to_update:
+            Booking.objects.bulk_update(to_update, ['check_in_date', 'check_out_date', 'updated_at'])
+        if to_create:
+            Booking.objects.bulk_create(to_create)
+
+    return {'deleted': len(to_delete), 'updated': len(to_update), 'created': len(to_create)}
+
+
+def sync_external_events(property_id, source, events):
+    """
+    Diff-based upsert of external calendar events (see ical.parse_events) as blocked bookings.
+
+    Rows are keyed by (property, source, uid): new UIDs are inserted, events whose dates or
+    summary changed are updated and UIDs missing from the feed are deleted. Unchanged events
+    cause no writes. Returns counters {'created', 'updated', 'deleted', 'unchanged'}.
+    """
+    incoming = {}
+    for ev in events:
+        incoming[ev['uid']] = ev  # último gana si el feed repite UID
+
+    with transaction.atomic():
+        current = {
+            b.external_uid: b
+            for b in Booking.objects.select_for_update().filter(
+                property_id=property_id, external_source=source,
+            ).exclude(external_uid='')
+        }
+
+        to_create, to_update = [], []
+        now = timezone.now()
+        for uid, ev in incoming.items():
+            reason = ev['summary'] or source
+            row = current.get(uid)
+            if row is None:
+                to_create.append(Booking(
+                    property_id=property_id, guest=None, status='blocked',
+                    check_in_date=ev['check_in_date'], check_out_date=ev['check_out_date'],
+                    guest_count=0, total_amount=0, reason=reason,
+                    external_source=source, external_uid=uid,
+                ))
+            elif (row.check_in_date, row.check_out_date, row.reason) != (
+                ev['check_in_date'], ev['check_out_date'], reason
+            ):
+                row.check_in_date, row.check_out_date, row.reason = ev['check_in_date'], ev['check_out_date'], reason
+                row.updated_at = now
+                to_update.append(row)
+
+        stale = [b.id for uid, b in current.items() if uid not in incoming]
+        if stale:
+            Booking.objects.filter(pk__in=stale).delete()
+        if to_update:
+            Booking.objects.bulk_update(to_update, ['check_in_date', 'check_out_date', 'reason', 'updated_at'])
+        if to_create:
+            Booking.objects.bulk_create(to_create)
+
+    return {
+        'created': len(to_create),
+        'updated': len(to_update),
+        'deleted': len(stale),
+        'unchanged': len(incoming) - len(to_create) - len(to_update),
+    }
@@ -1,9 +1,17 @@
 from rest_framework import viewsets, permissions, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.db.models import Q
+from django.conf import settings
+from django.db.models import Count, Max
+from django.http import Http404, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+from django.views.decorators.http import require_GET
 from .models import Booking
-from .serializers import BookingSerializer
+from .serializers import BookingSerializer, BlockItemSerializer, BulkBlockSerializer, BulkUnblockSerializer
+from .utils import apply_bulk_blocks, apply_bulk_unblock
+from .ical import build_calendar, calendar_etag
+from apps.properties.models import Property
 from apps.properties.permissions import IsOwnerOrAdmin
 
 class BookingViewSet(viewsets.ModelViewSet):
@@ -14,11 +22,17 @@ class BookingViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         user = self.request.user
+        base = Booking.objects.select_related('property')
         if user.is_staff:
-            return Booking.objects.all()
-        return Booking.objects.filter(
-            Q(guest=user) | Q(property__created_by=user)
-        )
+            return base
+        # UNION de dos ramas indexables en lugar de un OR con JOIN:
+        #   - huésped: (guest_id, created_at)
+        #   - dueño:   property_id IN (propiedades del host) -> (property_id, status, check_in_date)
+        as_guest = Booking.objects.filter(guest=user).order_by().values('pk')
+        as_owner = Booking.objects.filter(
+            property_id__in=Property.objects.filter(created_by=user).values('pk')
+        ).order_by().values('pk')
+        return base.filter(pk__in=as_guest.union(as_owner))
 
     @action(detail=True, methods=['post'])
     def cancel(self, request, pk=None):
@@ -47,7 +61,7 @@ class BookingViewSet(viewsets.ModelViewSet):
         return Response(BookingSerializer(booking).data)
 
 class BlockViewSet(viewsets.ModelViewSet):
-    queryset = Booking.objects.filter(status='blocked')
+    queryset = Booking.objects.filter(status='blocked').select_related('property')
     serializer_class = BookingSerializer
     permission_classes = [permissions.IsAdminUser]
 
@@ -59,4 +73,89 @@ class BlockViewSet(viewsets.ModelViewSet):
         property_id = self.request.query_params.get('property')
         if property_id:
             qs = qs.filter(property_id=property_id)
-        return qs
\ No newline at end of file
+        return qs
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        POST /api/blocks/bulk/
+        Creates many blocks at once (see BulkBlockSerializer). Overlaps are checked with one query,
+        rows are written in a single transaction and adjacent blocks are merged into one row.
+        Returns one result per entry: created | merged | error.
+        """
+        envelope = BulkBlockSerializer(data=request.data)
+        envelope.is_valid(raise_exception=True)
+
+        results, valid = [], []
+        for index, raw in enumerate(envelope.validated_data['entries']):
+            item = BlockItemSerializer(data=raw)
+            if item.is_valid():
+                valid.append({'index': index, **item.validated_data})
+                results.append(None)
+            else:
+                results.append({'index': index, 'status': 'error', 'errors': item.errors})
+
+        for res in apply_bulk_blocks(valid):
+            results[res['index']] = res
+
+        failed = sum(1 for r in results if r['status'] == 'error')
+        return Response({
+            'results': results,
+            'ok': len(results) - failed,
+            'failed': failed,
+        }, status=status.HTTP_200_OK if failed else status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['post'])
+    def bulk_unblock(self, request):
+        """
+        POST /api/blocks/bulk_unblock/
+        Deletes blocks by id, or frees a date range on a set of properties (trimming/splitting blocks).
+        """
+        serializer = BulkUnblockSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        if data.get('ids'):
+            ids = data['ids']
+            found = set(Booking.objects.filter(status='blocked', pk__in=ids).values_list('pk', flat=True))
+            Booking.objects.filter(pk__in=found).delete()
+            return Response({
+                'results': [{'id': i, 'status': 'deleted' if i in found else 'not_found'} for i in ids],
+                'deleted': len(found),
+            })
+
+        counters = apply_bulk_unblock(data['properties'], data['check_in_date'], data['check_out_date'])
+        return Response(counters)
+
+
+# Estados que ocupan el calendario y se publican en el feed iCal
+FEED_STATUSES = ('pending', 'confirmed', 'blocked')
+
+
+@require_GET
+def property_calendar_feed(request, property_id):
+    """
+    GET /api/calendars/<property_id>.ics
+    Public availability feed for channel managers. Answers conditional requests with 304 using
+    an ETag derived from one aggregate query (count, max updated_at, max id), so unchanged
+    calendars are never rendered. No Last-Modified: max(updated_at) does not move when a booking
+    other than the latest is deleted, so If-Modified-Since alone would get a wrong 304.
+    """
+    prop = Property.objects.filter(pk=property_id, status='published').only('id', 'title').first()
+    if prop is None:
+        raise Http404('Property not found')
+
+    qs = Booking.objects.filter(property_id=property_id, status__in=FEED_STATUSES)
+    state = qs.aggregate(count=Count('id'), last_updated=Max('updated_at'), last_id=Max('id'))
+    etag = quote_etag(calendar_etag(state['count'], state['last_updated'], state['last_id']))
+
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        bookings = qs.only('id', 'status', 'check_in_date', 'check_out_date', 'updated_at').order_by('check_in_date')
+        # Dominio fijo: el UID de un evento no puede depender del host que sirvió el feed
+        body = build_calendar(bookings, prop.title, settings.ICAL_UID_DOMAIN)
+        response = HttpResponse(body, content_type='text/calendar; charset=utf-8')
+        response['Content-Disposition'] = f'inline; filename="property-{prop.id}.ics"'
+    response['ETag'] = etag
+    patch_cache_control(response, public=True, max_age=60)
+    return response
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Property, PropertyImage
+from .models import Property, PropertyImage, Feature
 
 class PropertyImageInline(admin.TabularInline):
     model = PropertyImage
@@ -10,3 +10,8 @@ class PropertyImageInline(admin.TabularInline):
 class PropertyAdmin(admin.ModelAdmin):
     list_display = ('id','title','city','price','property_type','created_by','created_at')
     inlines = [PropertyImageInline]
+
+@admin.register(Feature)
+class FeatureAdmin(admin.ModelAdmin):
+    list_display = ('id', 'name', 'slug')
+    search_fields = ('name', 'slug')
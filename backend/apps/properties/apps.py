@@ -1,4 +1,7 @@
 from django.apps import AppConfig
 
 class PropertiesConfig(AppConfig):
-    name = 'apps.properties'
\ No newline at end of file
+    name = 'apps.properties'
+
+    def ready(self):
+        from . import signals  # noqa: F401
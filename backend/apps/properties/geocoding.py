@@ -0,0 +1,79 @@
+"""
+Google Geocoding for property addresses.
+
+`geocode` (requests) is used by PropertySerializer on sync writes; `ageocode` (httpx) lets the
+async write views (SERVER_MODE=asgi) resolve coordinates without holding a worker thread. Both
+return (lat, lng) or None and never raise. The HTTP libraries are imported on first lookup, so
+workers that never write properties don't load them.
+"""
+import logging
+from functools import lru_cache
+from urllib.parse import quote
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+GEOCODE_URL = 'https://maps.googleapis.com/maps/api/geocode/json'
+GEOCODE_TIMEOUT = 6
+ADDRESS_FIELDS = ('address', 'city', 'state', 'zip_code')
+
+
+def geocoding_enabled():
+    return getattr(settings, 'USE_GEOCODING', True)
+
+
+def address_query(data, instance=None):
+    """
+    '<address>, <city>, <state>, <zip>, Argentina' from `data`, falling back to the instance
+    values for fields not present (updates). None when there is no address at all.
+    """
+    parts = []
+    for field in ADDRESS_FIELDS:
+        default = getattr(instance, field, '') if instance is not None else ''
+        value = str(data.get(field, default) or '')
+        if value:
+            parts.append(value)
+    if not parts:
+        return None
+    return ', '.join(parts) + ', Argentina'
+
+
+def _request_url(query):
+    return (
+        f'{GEOCODE_URL}?address={quote(query)}&components=country:AR&region=ar&language=es'
+        f'&key={settings.GOOGLE_MAPS_API_KEY}'
+    )
+
+
+def _parse(payload):
+    if payload.get('status') == 'OK' and payload.get('results'):
+        loc = payload['results'][0]['geometry']['location']
+        return loc.get('lat'), loc.get('lng')
+    return None
+
+
+@lru_cache(maxsize=None)
+def _http_session():
+    # Sesión por proceso: reutiliza la conexión TLS con Google entre requests
+    import requests
+    return requests.Session()
+
+
+def geocode(query):
+    try:
+        resp = _http_session().get(_request_url(query), timeout=GEOCODE_TIMEOUT)
+        return _parse(resp.json() if resp.ok else {})
+    except Exception as e:
+        logger.exception("[geocoding] Lookup failed: %s", e)
+        return None
+
+
+async def ageocode(query):
+    import httpx
+    try:
+        async with httpx.AsyncClient(timeout=GEOCODE_TIMEOUT) as client:
+            resp = await client.get(_request_url(query))
+        return _parse(resp.json() if resp.is_success else {})
+    except Exception as e:
+        logger.exception("[geocoding] Lookup failed: %s", e)
+        return None
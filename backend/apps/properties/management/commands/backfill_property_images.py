@@ -1,8 +1,9 @@
 import os
-import boto3
 from django.core.management.base import BaseCommand
 from django.conf import settings
 from apps.properties.models import PropertyImage
+from apps.properties.media import public_url
+from core.aws import s3_client
 from botocore.exceptions import ClientError
 
 
@@ -115,7 +116,7 @@ class Command(BaseCommand):
         total = len(images)
         self.stdout.write(f"Found {total} images to process")
 
-        s3 = boto3.client("s3", region_name="us-east-1")
+        s3 = s3_client()
         bucket_name = settings.AWS_STORAGE_BUCKET_NAME
 
         processed_count = 0
@@ -229,7 +230,7 @@ class Command(BaseCommand):
                 # Update DB
                 img.s3_key = new_key
                 if img.url and old_key in img.url:
-                    img.url = img.url.replace(old_key, new_key)
+                    img.url = public_url(new_key) or img.url.replace(old_key, new_key)
                 img.save()
 
                 success_count += 1
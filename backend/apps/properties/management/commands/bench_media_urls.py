@@ -0,0 +1,51 @@
+import time
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+from django.utils import timezone
+from apps.properties import media
+from apps.properties.models import PropertyImage
+from apps.properties.serializers import PropertyImageSerializer
+
+
+class Command(BaseCommand):
+    help = "Micro-benchmark: serialize N in-memory property images (no DB) and report timings"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--images', type=int, default=2000, help='Images per run (default: 2000)')
+        parser.add_argument('--runs', type=int, default=20, help='Timed runs (default: 20)')
+        parser.add_argument('--bucket', default='bench-bucket',
+                            help='Bucket used to build URLs during the benchmark (default: bench-bucket)')
+
+    def handle(self, *args, **options):
+        n, runs = options['images'], options['runs']
+        now = timezone.now()
+        # Mitad con url guardada, mitad sólo con s3_key; 20 imágenes por propiedad como un listado real
+        images = [
+            PropertyImage(
+                id=i + 1, property_id=i // 20 + 1,
+                s3_key=f"properties/original/{i // 20 + 1}/img-{i}.jpg",
+                url='' if i % 2 else f"https://{options['bucket']}.s3.amazonaws.com/properties/original/{i // 20 + 1}/img-{i}.jpg",
+                is_primary=i % 20 == 0, order=i % 20, created_at=now,
+            )
+            for i in range(n)
+        ]
+
+        with override_settings(AWS_STORAGE_BUCKET_NAME=options['bucket']):
+            cold, warm = [], []
+            for _ in range(runs):
+                media.clear_caches()
+                cold.append(self._time(images))
+                warm.append(self._time(images))
+
+        for label, samples in (('cold caches', cold), ('warm caches', warm)):
+            samples.sort()
+            self.stdout.write(
+                f"{label:>12}: {n} images  median {samples[len(samples) // 2] * 1000:.1f} ms  "
+                f"min {samples[0] * 1000:.1f} ms  ({n / samples[len(samples) // 2]:.0f} images/s)"
+            )
+
+    @staticmethod
+    def _time(images):
+        start = time.perf_counter()
+        PropertyImageSerializer(images, many=True).data
+        return time.perf_counter() - start
@@ -0,0 +1,186 @@
+"""
+Media URL resolver for property images (and the S3 media storage).
+
+Every image URL is built here from its S3 key:
+  - base: MEDIA_CDN_HOST when set (CloudFront or any edge cache in front of the bucket),
+    otherwise https://<bucket>.s3.amazonaws.com
+  - MEDIA_URL_VERSION adds ?v=<token>; objects are served as immutable, so bumping the token is
+    how edge/browser caches are invalidated globally
+  - MEDIA_URL_SIGNING ('s3' | 'cloudfront') returns signed, expiring URLs for private buckets
+
+Configuration is resolved once per process (reset on setting_changed) and per-key results are
+memoized. `image_urls` works over a whole batch of images at once; serializers should use it
+instead of building URLs image by image.
+"""
+import datetime
+import os
+import time
+from functools import lru_cache
+from typing import NamedTuple
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from core.s3_presign import presign_url
+
+ORIGINAL_PREFIX = 'properties/original/'
+DERIVED_PREFIX = 'properties/derived'
+DERIVED_SIZES = (480, 768)
+SIGNING_MODES = ('', 's3', 'cloudfront')
+_S3_HOST_MARKER = 'amazonaws.com/'
+
+
+class MediaConfig(NamedTuple):
+    bucket: str
+    base: str       # sin barra final; '' si no hay bucket ni CDN
+    version: str
+    signing: str
+    ttl: int
+
+
+@lru_cache(maxsize=None)
+def media_config():
+    bucket = getattr(settings, 'AWS_STORAGE_BUCKET_NAME', '') or os.environ.get('S3_MEDIA_BUCKET', '')
+    cdn = (getattr(settings, 'MEDIA_CDN_HOST', '') or '').strip().rstrip('/')
+    if cdn and '://' not in cdn:
+        cdn = f"https://{cdn}"
+    signing = (getattr(settings, 'MEDIA_URL_SIGNING', '') or '').lower()
+    if signing not in SIGNING_MODES:
+        raise ImproperlyConfigured(f"MEDIA_URL_SIGNING must be one of {SIGNING_MODES}, got {signing!r}")
+    return MediaConfig(
+        bucket=bucket,
+        base=cdn or (f"https://{bucket}.s3.amazonaws.com" if bucket else ''),
+        version=str(getattr(settings, 'MEDIA_URL_VERSION', '') or ''),
+        signing=signing,
+        ttl=int(getattr(settings, 'MEDIA_SIGNED_URL_TTL', 3600)),
+    )
+
+
+def media_base():
+    """Public base URL without trailing slash ('' when neither CDN nor bucket is configured)."""
+    return media_config().base
+
+
+@lru_cache(maxsize=8192)
+def public_url(key):
+    """Unsigned URL for an S3 key (CDN host and version token applied), or None."""
+    cfg = media_config()
+    if not key or not cfg.base:
+        return None
+    url = f"{cfg.base}/{key}"
+    return f"{url}?v={cfg.version}" if cfg.version else url
+
+
+def media_url(key):
+    """URL to hand out to clients for an S3 key: signed when MEDIA_URL_SIGNING is set."""
+    cfg = media_config()
+    if not key or not cfg.signing:
+        return public_url(key)
+    return _signed_url(key, _expiry_window(cfg.ttl))
+
+
+def _expiry_window(ttl):
+    # Expiración redondeada a ventanas de ttl/2: dentro de una ventana la URL firmada es la misma
+    # (memoizable y cacheable en el borde) y siempre le queda entre ttl/2 y ttl de validez.
+    step = max(ttl // 2, 1)
+    return (int(time.time()) // step + 2) * step
+
+
+@lru_cache(maxsize=8192)
+def _signed_url(key, expires_at):
+    cfg = media_config()
+    if cfg.signing == 's3':
+        return presign_url(
+            'get_object', {'Bucket': cfg.bucket, 'Key': key}, max(expires_at - int(time.time()), 1),
+        )
+    url = public_url(key)
+    if not url:
+        return None
+    return _cloudfront_signer().generate_presigned_url(
+        url, date_less_than=datetime.datetime.fromtimestamp(expires_at, datetime.timezone.utc),
+    )
+
+
+@lru_cache(maxsize=None)
+def _cloudfront_signer():
+    key_id = getattr(settings, 'MEDIA_CLOUDFRONT_KEY_ID', '')
+    pem = getattr(settings, 'MEDIA_CLOUDFRONT_PRIVATE_KEY', '')
+    if not key_id or not pem:
+        raise ImproperlyConfigured("MEDIA_URL_SIGNING='cloudfront' needs MEDIA_CLOUDFRONT_KEY_ID and MEDIA_CLOUDFRONT_PRIVATE_KEY")
+    try:
+        from cryptography.hazmat.primitives import hashes, serialization
+        from cryptography.hazmat.primitives.asymmetric import padding
+    except ImportError:
+        raise ImproperlyConfigured("MEDIA_URL_SIGNING='cloudfront' requires the 'cryptography' package")
+    from botocore.signers import CloudFrontSigner
+
+    private_key = serialization.load_pem_private_key(pem.encode(), password=None)
+
+    def rsa_signer(message):
+        return private_key.sign(message, padding.PKCS1v15(), hashes.SHA1())
+
+    return CloudFrontSigner(key_id, rsa_signer)
+
+
+def key_from_url(url):
+    """S3 key from a stored URL (bucket domain or current media base), ignoring the query string."""
+    if not url:
+        return None
+    url = url.split('?', 1)[0]
+    base = media_base()
+    if base and url.startswith(base + '/'):
+        return url[len(base) + 1:]
+    # Formato legado: https://<bucket>.s3.amazonaws.com/<KEY>
+    if _S3_HOST_MARKER in url:
+        return url.split(_S3_HOST_MARKER, 1)[1]
+    return None
+
+
+@lru_cache(maxsize=8192)
+def derived_keys(key):
+    """
+    (480, 768) WebP variant keys for an original key, or (None, None).
+    properties/original/<property_id>/<file>.<ext> -> properties/derived/<size>/<property_id>/<file>.webp
+    """
+    if not key or ORIGINAL_PREFIX not in key:
+        return (None, None)
+    stem = key.split(ORIGINAL_PREFIX, 1)[1].rsplit('.', 1)[0]
+    return tuple(f"{DERIVED_PREFIX}/{size}/{stem}.webp" for size in DERIVED_SIZES)
+
+
+def derived_urls(key):
+    """(480, 768) WebP variant URLs for an original key, or (None, None)."""
+    return tuple(media_url(k) if k else None for k in derived_keys(key))
+
+
+def image_key(image):
+    """S3 key of a PropertyImage-like object: s3_key, else parsed from its url."""
+    return getattr(image, 's3_key', None) or key_from_url(getattr(image, 'url', None))
+
+
+def image_urls(images):
+    """
+    URL fields for a batch of PropertyImage-like objects, in order:
+    [{'url', 'originalUrl', 'derived480Url', 'derived768Url'}, ...].
+    'url' is resolved from the image key; the stored url is only used when there is no key
+    (e.g. external URLs).
+    """
+    out = []
+    for image in images:
+        key = image_key(image)
+        url = media_url(key) or image.url or None
+        d480, d768 = derived_urls(key)
+        out.append({'url': url, 'originalUrl': url, 'derived480Url': d480, 'derived768Url': d768})
+    return out
+
+
+def clear_caches():
+    for fn in (media_config, public_url, _signed_url, _cloudfront_signer, derived_keys):
+        fn.cache_clear()
+
+
+def _on_setting_changed(setting, **kwargs):
+    if setting == 'AWS_STORAGE_BUCKET_NAME' or setting.startswith('MEDIA_'):
+        clear_caches()
+
+
+setting_changed.connect(_on_setting_changed)
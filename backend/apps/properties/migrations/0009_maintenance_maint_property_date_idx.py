@@ -0,0 +1,17 @@
+# Generated by Django 5.1.1 on 2026-10-19 11:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0008_propertyimage_s3_key_propertyimage_url'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='maintenance',
+            index=models.Index(fields=['property', 'date'], name='maint_property_date_idx'),
+        ),
+    ]
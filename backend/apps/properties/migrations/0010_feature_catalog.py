@@ -0,0 +1,43 @@
+# Generated by Django 5.1.1 on 2026-10-19 11:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0009_maintenance_maint_property_date_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Feature',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('slug', models.SlugField(max_length=100, unique=True)),
+                ('name', models.CharField(max_length=100)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='propertyfeature',
+            name='feature',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='property_features', to='properties.feature'),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='amenities',
+            field=models.ManyToManyField(blank=True, related_name='properties', through='properties.PropertyFeature', to='properties.feature'),
+        ),
+        migrations.AddIndex(
+            model_name='propertyfeature',
+            index=models.Index(fields=['feature', 'property'], name='propfeature_feature_prop_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='propertyfeature',
+            constraint=models.UniqueConstraint(fields=('property', 'feature'), name='propertyfeature_unique_feature'),
+        ),
+    ]
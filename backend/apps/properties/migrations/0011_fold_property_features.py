@@ -0,0 +1,71 @@
+import re
+import unicodedata
+
+from django.db import migrations
+from django.utils.text import slugify
+
+# Copia congelada de apps.properties.utils.feature_slug / FEATURE_ALIASES al momento de esta
+# migración: las migraciones no pueden cambiar de comportamiento cuando utils evoluciona.
+FEATURE_ALIASES = {
+    'piscina': 'pileta',
+    'pileta de natacion': 'pileta',
+    'garage': 'cochera',
+    'garaje': 'cochera',
+    'estacionamiento': 'cochera',
+    'wi fi': 'wifi',
+    'internet': 'wifi',
+    'a a': 'aire acondicionado',
+    'aire': 'aire acondicionado',
+    'ac': 'aire acondicionado',
+    'asador': 'parrilla',
+    'quincho': 'parrilla',
+    'lavadora': 'lavarropas',
+    'mascotas': 'apto mascotas',
+    'pet friendly': 'apto mascotas',
+}
+
+
+def feature_slug(name):
+    text = unicodedata.normalize('NFKD', str(name or '')).encode('ascii', 'ignore').decode('ascii')
+    text = re.sub(r'[^a-z0-9]+', ' ', text.lower()).strip()
+    text = FEATURE_ALIASES.get(text, text)
+    return slugify(text)[:100]
+
+
+def fold_features(apps, schema_editor):
+    """Points every PropertyFeature at its canonical Feature, dropping duplicates within a property."""
+    Feature = apps.get_model('properties', 'Feature')
+    PropertyFeature = apps.get_model('properties', 'PropertyFeature')
+
+    catalog = {f.slug: f for f in Feature.objects.all()}
+    seen = set()
+    to_update, to_delete = [], []
+    for pf in PropertyFeature.objects.order_by('property_id', 'id').iterator(chunk_size=2000):
+        slug = feature_slug(pf.name)
+        if not slug:
+            to_delete.append(pf.id)
+            continue
+        if (pf.property_id, slug) in seen:
+            to_delete.append(pf.id)
+            continue
+        seen.add((pf.property_id, slug))
+        feature = catalog.get(slug)
+        if feature is None:
+            feature = catalog[slug] = Feature.objects.create(slug=slug, name=pf.name.strip())
+        pf.feature_id = feature.id
+        to_update.append(pf)
+
+    if to_delete:
+        PropertyFeature.objects.filter(pk__in=to_delete).delete()
+    PropertyFeature.objects.bulk_update(to_update, ['feature'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0010_feature_catalog'),
+    ]
+
+    operations = [
+        migrations.RunPython(fold_features, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0011_fold_property_features'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='propertyfeature',
+            name='feature',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='property_features', to='properties.feature'),
+        ),
+    ]
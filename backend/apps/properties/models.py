@@ -40,11 +40,16 @@ class Property(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
     longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
-    
+    # Catálogo canónico de amenities; PropertyFeature es la tabla intermedia
+    amenities = models.ManyToManyField('Feature', through='PropertyFeature', related_name='properties', blank=True)
 
     class Meta:
         ordering = ['-created_at']
         verbose_name_plural = 'Properties'
+        indexes = [
+            # ?bbox= / ?near=: rango sobre latitude y luego longitude (sin PostGIS)
+            models.Index(fields=['latitude', 'longitude'], name='property_lat_lng_idx'),
+        ]
 
 class PropertyImage(models.Model):
     property = models.ForeignKey(Property, related_name='images', on_delete=models.CASCADE)
@@ -59,12 +64,31 @@ class PropertyImage(models.Model):
     class Meta:
         ordering = ['order','-is_primary', 'id']  # <-- así siempre respeta el orden
 
+class Feature(models.Model):
+    """Canonical amenity. `slug` is the normalized key (see utils.feature_slug) shared by all variants."""
+    slug = models.SlugField(max_length=100, unique=True)
+    name = models.CharField(max_length=100)
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
 class PropertyFeature(models.Model):
     property = models.ForeignKey(Property, related_name='features', on_delete=models.CASCADE)
-    name = models.CharField(max_length=100)
+    feature = models.ForeignKey(Feature, related_name='property_features', on_delete=models.PROTECT)
+    name = models.CharField(max_length=100)  # texto tal como lo cargó el usuario
 
     class Meta:
         unique_together = ['property', 'name']
+        constraints = [
+            models.UniqueConstraint(fields=['property', 'feature'], name='propertyfeature_unique_feature'),
+        ]
+        indexes = [
+            # ?features=a,b -> GROUP BY property_id HAVING COUNT = n sobre feature_id
+            models.Index(fields=['feature', 'property'], name='propfeature_feature_prop_idx'),
+        ]
 
 class Pricing(models.Model):
     property = models.ForeignKey('Property', related_name='pricings', on_delete=models.CASCADE)
@@ -82,5 +106,10 @@ class Maintenance(models.Model):
     cost = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     resolved = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['property', 'date'], name='maint_property_date_idx'),
+        ]
+
     def __str__(self):
         return f"{self.property.title} - {self.date}: {self.description}"
\ No newline at end of file
@@ -1,10 +1,16 @@
-import requests
-import logging
-from urllib.parse import quote
-from django.conf import settings
+from django.db import models, transaction
 from rest_framework import serializers
-from .models import Property, PropertyImage, PropertyFeature, Pricing, Maintenance
-from .utils import extract_s3_key, build_derived_url
+from .models import Property, PropertyImage, Feature, PropertyFeature, Pricing, Maintenance
+from .utils import feature_slug
+from .media import image_urls, public_url
+from .geocoding import ADDRESS_FIELDS, address_query, geocode, geocoding_enabled
+
+class PropertyImageListSerializer(serializers.ListSerializer):
+    """many=True: las URLs de todo el lote se resuelven en una pasada (media.image_urls)."""
+
+    def to_representation(self, data):
+        images = data.all() if isinstance(data, models.manager.BaseManager) else data
+        return self.child.represent_batch(list(images))
 
 class PropertyImageSerializer(serializers.ModelSerializer):
     # Protect .image access: avoid calling ImageField.url on missing files
@@ -18,6 +24,7 @@ class PropertyImageSerializer(serializers.ModelSerializer):
         model = PropertyImage
         fields = ['id', 'property', 's3_key', 'url', 'is_primary', 'order', 'created_at', 'image']
         read_only_fields = ['id', 'created_at', 'image']
+        list_serializer_class = PropertyImageListSerializer
         extra_kwargs = {
             'is_primary': {'required': False},
             'order': {'required': False},
@@ -34,52 +41,87 @@ class PropertyImageSerializer(serializers.ModelSerializer):
         return getattr(obj, 'url', None)
 
     def to_representation(self, instance):
-        """Ensure 'url' is present when serializing by deriving from s3_key if missing."""
-        data = super().to_representation(instance)
-        if not data.get('url') and data.get('s3_key'):
-            import os as _os
-            bucket = getattr(settings, 'AWS_STORAGE_BUCKET_NAME', '') or _os.environ.get('S3_MEDIA_BUCKET', '')
-            if bucket:
-                data['url'] = f"https://{bucket}.s3.amazonaws.com/{data['s3_key']}"
-        
-        # Ensure originalUrl is present
-        data['originalUrl'] = data.get('url')
+        return self.represent_batch([instance])[0]
 
-        # Use helper to extract key (from s3_key or url)
-        s3_key = extract_s3_key(instance)
-        
-        # Generate derived URLs
-        data['derived480Url'] = build_derived_url(s3_key, 480)
-        data['derived768Url'] = build_derived_url(s3_key, 768)
-
-        return data
+    def represent_batch(self, images):
+        """
+        Field representation of each image plus its URL fields ('url' derived from s3_key when
+        missing, originalUrl, derived480Url/derived768Url), resolved for the whole batch at once.
+        """
+        rows = [super(PropertyImageSerializer, self).to_representation(image) for image in images]
+        for row, urls in zip(rows, image_urls(images)):
+            row.update(urls)
+        return rows
 
     def create(self, validated_data):
         """Create PropertyImage; if url not provided but s3_key present, compute default public URL."""
-        import os as _os
         s3_key = validated_data.get('s3_key')
-        url = validated_data.get('url')
-        if s3_key and not url:
-            bucket = getattr(settings, 'AWS_STORAGE_BUCKET_NAME', '') or _os.environ.get('S3_MEDIA_BUCKET', '')
-            if bucket:
-                validated_data['url'] = f"https://{bucket}.s3.amazonaws.com/{s3_key}"
+        if s3_key and not validated_data.get('url'):
+            url = public_url(s3_key)
+            if url:
+                validated_data['url'] = url
         return PropertyImage.objects.create(**validated_data)
 
+def _resolve_features(wanted):
+    """
+    Maps {slug: display name} to {slug: Feature id}, creating missing catalog entries.
+    At most three queries whatever the number of names.
+    """
+    if not wanted:
+        return {}
+    ids = dict(Feature.objects.filter(slug__in=wanted).values_list('slug', 'id'))
+    missing = [slug for slug in wanted if slug not in ids]
+    if missing:
+        Feature.objects.bulk_create([Feature(slug=slug, name=wanted[slug]) for slug in missing], ignore_conflicts=True)
+        ids.update(Feature.objects.filter(slug__in=missing).values_list('slug', 'id'))
+    return ids
+
+class SparseFieldsMixin:
+    """
+    Accepts a `fields` kwarg (iterable of names) restricting the representation to those fields.
+    Names in Meta.optional_fields are left out unless explicitly requested.
+    """
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        keep = set(fields) if fields is not None else set(self.fields) - set(getattr(self.Meta, 'optional_fields', ()))
+        for name in list(self.fields):
+            if name not in keep:
+                self.fields.pop(name)
+
+    @classmethod
+    def default_fields(cls):
+        return set(cls.Meta.fields) - set(getattr(cls.Meta, 'optional_fields', ()))
+
 class PropertyFeatureSerializer(serializers.ModelSerializer):
     class Meta:
         model = PropertyFeature
         fields = ['id', 'name']
 
-class PropertyListItemSerializer(serializers.ModelSerializer):
+class PropertyListItemSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     cover = serializers.SerializerMethodField()
+    # Sólo con ?include=images,features
+    images = PropertyImageSerializer(many=True, read_only=True)
+    features = PropertyFeatureSerializer(many=True, read_only=True)
 
     class Meta:
         model = Property
         fields = [
             'id', 'title', 'price', 'address', 'city', 'state', 'zip_code',
             'property_type', 'bedrooms', 'bathrooms', 'square_feet',
-            'is_featured', 'status', 'cover'
+            'is_featured', 'status', 'latitude', 'longitude', 'cover',
+            'images', 'features',
         ]
+        optional_fields = ['images', 'features']
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Presente sólo en búsquedas ?near= (anotación 'distance' en km)
+        distance = getattr(instance, 'distance', None)
+        if distance is not None:
+            data['distance_km'] = round(distance, 3)
+        return data
 
     def get_cover(self, obj):
         images = list(obj.images.all())
@@ -87,38 +129,19 @@ class PropertyListItemSerializer(serializers.ModelSerializer):
             return None
         
         cover_img = next((img for img in images if img.is_primary), images[0])
-        
-        url = getattr(cover_img, 'url', None)
-        s3_key = cover_img.s3_key
-
-        # Ensure we have a base URL
-        if not url and s3_key:
-            import os as _os
-            bucket = getattr(settings, 'AWS_STORAGE_BUCKET_NAME', '') or _os.environ.get('S3_MEDIA_BUCKET', '')
-            if bucket:
-                url = f"https://{bucket}.s3.amazonaws.com/{s3_key}"
-        
-        if not url:
+        urls = image_urls([cover_img])[0]
+        if not urls['url']:
             return None
 
-        # Use helper to extract key (from s3_key or url)
-        extracted_key = extract_s3_key(cover_img)
-        
-        # Generate derived URLs
-        derived480 = build_derived_url(extracted_key, 480)
-        derived768 = build_derived_url(extracted_key, 768)
-
         # Prioritize derived768 if exists, else derived480, else original
-        cover_url = derived768 or derived480 or url
-
         return {
-            'originalUrl': url,
-            'derived480Url': derived480, 
-            'derived768Url': derived768,
-            'coverUrl': cover_url
+            'originalUrl': urls['url'],
+            'derived480Url': urls['derived480Url'],
+            'derived768Url': urls['derived768Url'],
+            'coverUrl': urls['derived768Url'] or urls['derived480Url'] or urls['url'],
         }
 
-class PropertySerializer(serializers.ModelSerializer):
+class PropertySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     images = PropertyImageSerializer(many=True, read_only=True)
     image_keys = serializers.ListField(
         child=serializers.CharField(), write_only=True, required=False,
@@ -163,115 +186,122 @@ class PropertySerializer(serializers.ModelSerializer):
         images_data = validated_data.pop('images', None)
         s3_keys = validated_data.pop('image_keys', [])
         # Geocode solo si está activado
-        if getattr(settings, 'USE_GEOCODING', True):
-            try:
-                # Construye dirección de forma segura (coerción a str y manejo de faltantes)
-                addr = str(validated_data.get('address', '') or '')
-                city = str(validated_data.get('city', '') or '')
-                state = str(validated_data.get('state', '') or '')
-                zipc = str(validated_data.get('zip_code', '') or '')
-                parts = [p for p in [addr, city, state, zipc] if p]
-                full_address = ', '.join(parts) + ', Argentina'
-                if full_address.strip(', ').strip():
-                    encoded = quote(full_address)
-                    api_key = settings.GOOGLE_MAPS_API_KEY
-                    url = (
-                        'https://maps.googleapis.com/maps/api/geocode/json'
-                        f'?address={encoded}&components=country:AR&region=ar&language=es&key={api_key}'
-                    )
-                    resp = requests.get(url, timeout=6)
-                    data = resp.json() if resp.ok else {}
-                    if data.get('status') == 'OK' and data.get('results'):
-                        loc = data['results'][0]['geometry']['location']
-                        validated_data['latitude'] = loc.get('lat')
-                        validated_data['longitude'] = loc.get('lng')
-            except Exception as e:
-                logging.getLogger(__name__).exception("[properties.create] Geocoding failed: %s", e)
+        if geocoding_enabled():
+            coords = self._geocode(validated_data)
+            if coords:
+                validated_data['latitude'], validated_data['longitude'] = coords
         else:
             # Puedes poner coordenadas dummy o dejar en None
             validated_data['latitude'] = None
             validated_data['longitude'] = None
 
-        instance = super().create(validated_data)
-        if features_data is not None:
-            for feature in features_data:
-                PropertyFeature.objects.create(property=instance, name=feature)
-        if images_data is not None:
-            for idx, img_data in enumerate(images_data):
-                PropertyImage.objects.create(
-                    property=instance,
-                    image=img_data['image'],
-                    is_primary=img_data.get('is_primary', False),
-                    order=img_data.get('order', idx)
-                )
-        if s3_keys:
-            bucket = getattr(settings, 'AWS_STORAGE_BUCKET_NAME', None)
-            domain = f"https://{bucket}.s3.amazonaws.com" if bucket else None
-            PropertyImage.objects.bulk_create([
-                PropertyImage(property=instance, s3_key=k, url=(f"{domain}/{k}" if domain else "")) for k in s3_keys
-            ])
+        with transaction.atomic():
+            instance = super().create(validated_data)
+            if features_data is not None:
+                self._sync_features(instance, features_data, created=True)
+            if images_data is not None:
+                for idx, img_data in enumerate(images_data):
+                    PropertyImage.objects.create(
+                        property=instance,
+                        image=img_data['image'],
+                        is_primary=img_data.get('is_primary', False),
+                        order=img_data.get('order', idx)
+                    )
+            if s3_keys:
+                PropertyImage.objects.bulk_create([
+                    PropertyImage(property=instance, s3_key=k, url=public_url(k) or "") for k in s3_keys
+                ])
         return instance
 
+    def _geocode(self, data, instance=None):
+        """
+        Coordinates for the address in `data`. The async write views resolve them before
+        entering the sync path and pass them as context['geocoded']; otherwise look them up here.
+        """
+        if 'geocoded' in self.context:
+            return self.context['geocoded']
+        query = address_query(data, instance)
+        return geocode(query) if query else None
+
+    def _sync_features(self, instance, names, created=False):
+        """
+        Deja las features de la propiedad iguales a `names` con un número constante de queries.
+        Los nombres se normalizan contra el catálogo (Feature) y se comparan por feature_id: un
+        SELECT de las actuales (omitido al crear), un INSERT masivo de las nuevas y un único
+        DELETE de las que sobran.
+        """
+        wanted = {}
+        for raw in names:
+            name = (raw or '').strip()
+            slug = feature_slug(name)
+            if slug and slug not in wanted:
+                wanted[slug] = name
+        catalog = _resolve_features(wanted)
+        wanted_ids = {catalog[slug]: name for slug, name in wanted.items()}
+
+        existing = set() if created else set(
+            PropertyFeature.objects.filter(property=instance).values_list('feature_id', flat=True)
+        )
+        added = [fid for fid in wanted_ids if fid not in existing]
+        removed = existing.difference(wanted_ids)
+        if added:
+            PropertyFeature.objects.bulk_create(
+                [PropertyFeature(property=instance, feature_id=fid, name=wanted_ids[fid]) for fid in added],
+                ignore_conflicts=True,
+            )
+        if removed:
+            PropertyFeature.objects.filter(property=instance, feature_id__in=removed).delete()
+
+    def _apply_images_order(self, instance, images_order):
+        """
+        images_order es una lista de IDs [id1, id2, id3]. Las imágenes listadas van primero en ese
+        orden; las no incluidas (ej: recién subidas) quedan al final respetando su orden actual.
+        La primera queda como única principal. Sólo se escriben las filas que cambian, en un único
+        UPDATE ... CASE WHEN (bulk_update).
+        """
+        position = {img_id: idx for idx, img_id in enumerate(dict.fromkeys(images_order))}
+        images = list(PropertyImage.objects.filter(property=instance).only('id', 'order', 'is_primary'))
+        listed = sorted((img for img in images if img.id in position), key=lambda img: position[img.id])
+        unlisted = [img for img in images if img.id not in position]
+
+        changed = []
+        for idx, img in enumerate(listed + unlisted):
+            is_primary = idx == 0
+            if img.order != idx or img.is_primary != is_primary:
+                img.order, img.is_primary = idx, is_primary
+                changed.append(img)
+        if changed:
+            PropertyImage.objects.bulk_update(changed, ['order', 'is_primary'])
+
     def update(self, instance, validated_data):
         # Campos extra para manejo manual
         removed_ids = validated_data.pop('removed_image_ids', [])
         images_order = validated_data.pop('images_order', [])
+        features_data = validated_data.pop('feature_list', None)
         # images_data será None si el campo es read_only, pero lo dejamos por si acaso
         _ = validated_data.pop('images', None)
 
         # Geocode solo si está activado y si cambió la dirección
-        if getattr(settings, 'USE_GEOCODING', True) and any(
-            field in validated_data for field in ('address', 'city', 'state', 'zip_code')
-        ):
-            try:
-                addr = str(validated_data.get('address', instance.address) or '')
-                city = str(validated_data.get('city', instance.city) or '')
-                state = str(validated_data.get('state', instance.state) or '')
-                zipc = str(validated_data.get('zip_code', instance.zip_code) or '')
-                parts = [p for p in [addr, city, state, zipc] if p]
-                full_address = ', '.join(parts) + ', Argentina'
-                if full_address.strip(', ').strip():
-                    encoded = quote(full_address)
-                    api_key = settings.GOOGLE_MAPS_API_KEY
-                    url = (
-                        'https://maps.googleapis.com/maps/api/geocode/json'
-                        f'?address={encoded}&components=country:AR&region=ar&language=es&key={api_key}'
-                    )
-                    resp = requests.get(url, timeout=6)
-                    data = resp.json() if resp.ok else {}
-                    if data.get('status') == 'OK' and data.get('results'):
-                        loc = data['results'][0]['geometry']['location']
-                        validated_data['latitude'] = loc.get('lat')
-                        validated_data['longitude'] = loc.get('lng')
-            except Exception as e:
-                logging.getLogger(__name__).exception("[properties.update] Geocoding failed: %s", e)
-
-        instance = super().update(instance, validated_data)
-
-        # 1. Eliminar imágenes solicitadas
-        if removed_ids:
-            # Filtramos para asegurar que pertenecen a esta propiedad
-            PropertyImage.objects.filter(property=instance, id__in=removed_ids).delete()
-
-        # 2. Reordenar y marcar primaria
-        if images_order:
-            # images_order es una lista de IDs [id1, id2, id3]
-            # Validamos que los IDs existan y sean de esta property
-            valid_images = {
-                img.id: img 
-                for img in PropertyImage.objects.filter(property=instance, id__in=images_order)
-            }
-            
-            # Recorremos el orden enviado
-            for idx, img_id in enumerate(images_order):
-                if img_id in valid_images:
-                    img = valid_images[img_id]
-                    img.order = idx
-                    img.is_primary = (idx == 0) # El primero es principal
-                    img.save(update_fields=['order', 'is_primary'])
-            
-            # Asegurar que si quedan imágenes fuera del orden (ej: recién subidas y no incluidas en order), no queden "rotas"
-            # (Opcional: ponerlas al final)
+        if geocoding_enabled() and any(field in validated_data for field in ADDRESS_FIELDS):
+            coords = self._geocode(validated_data, instance)
+            if coords:
+                validated_data['latitude'], validated_data['longitude'] = coords
+
+        with transaction.atomic():
+            instance = super().update(instance, validated_data)
+
+            # 0. Sincronizar features (sólo si se envió feature_list)
+            if features_data is not None:
+                self._sync_features(instance, features_data)
+
+            # 1. Eliminar imágenes solicitadas
+            if removed_ids:
+                # Filtramos para asegurar que pertenecen a esta propiedad
+                PropertyImage.objects.filter(property=instance, id__in=removed_ids).delete()
+
+            # 2. Reordenar y marcar primaria
+            if images_order:
+                self._apply_images_order(instance, images_order)
 
         return instance
 
@@ -0,0 +1,19 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Property, PropertyImage, Feature, PropertyFeature
+from .utils import bump_catalog_version
+
+
+# Sólo post_save en imágenes/features: un receiver de post_delete impediría el "fast delete"
+# (un único DELETE) en los borrados masivos del serializer. Esos borrados ocurren siempre en la
+# misma transacción que el save() de la propiedad, que ya invalida al hacer commit.
+# Las escrituras bulk_create/bulk_update tampoco disparan señales: fuera de un save() de la
+# propiedad hay que llamar a bump_catalog_version() explícitamente.
+@receiver([post_save, post_delete], sender=Property)
+@receiver([post_save, post_delete], sender=Feature)
+@receiver(post_save, sender=PropertyImage)
+@receiver(post_save, sender=PropertyFeature)
+def invalidate_catalog_cache(sender, **kwargs):
+    # Al confirmar la transacción, para no volver a cachear datos previos al commit
+    transaction.on_commit(bump_catalog_version)
@@ -0,0 +1,53 @@
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from apps.properties.models import Property, PropertyImage
+
+User = get_user_model()
+
+
+def make_props():
+    owner = User.objects.create_user(username='u', password='p')
+    props = []
+    for i, status in enumerate(['published', 'published', 'draft']):
+        prop = Property.objects.create(
+            title=f'p{i}', description='d', address='a', city='c', state='s', zip_code='z',
+            property_type='temporal', bedrooms=1, bathrooms=1, square_feet=10, price=10,
+            created_by=owner, status=status,
+        )
+        PropertyImage.objects.create(property=prop, s3_key=f'properties/{i}.jpg', url=f'https://cdn/{i}.jpg')
+        props.append(prop)
+    return props
+
+
+def test_batch_preserves_order_and_marks_missing(db):
+    a, b, draft = make_props()
+    ids = f'{b.id},999,{a.id},{draft.id},{b.id}'
+    with CaptureQueriesContext(connection) as ctx:
+        resp = APIClient().get('/api/properties/batch/', {'ids': ids})
+    assert resp.status_code == 200
+    results = resp.json()['results']
+    assert [r['id'] for r in results] == [b.id, 999, a.id, draft.id]
+    assert results[0]['title'] == 'p1' and results[0]['images'][0]['url'] == 'https://cdn/1.jpg'
+    # Borradores invisibles para anónimos, igual que en el detalle
+    assert results[1] == {'id': 999, 'detail': 'Not found.'}
+    assert results[3] == {'id': draft.id, 'detail': 'Not found.'}
+    # propiedades + imágenes + features, sin importar cuántos IDs
+    assert len(ctx.captured_queries) == 3
+
+
+def test_batch_owner_sees_drafts_and_sparse_fields(db):
+    a, _, draft = make_props()
+    client = APIClient()
+    client.force_authenticate(User.objects.get(username='u'))
+    resp = client.get('/api/properties/batch/', {'ids': f'{draft.id},{a.id}', 'fields': 'title'})
+    assert resp.json()['results'] == [{'id': draft.id, 'title': 'p2'}, {'id': a.id, 'title': 'p0'}]
+
+
+def test_batch_validation(db):
+    client = APIClient()
+    assert client.get('/api/properties/batch/').status_code == 400
+    assert client.get('/api/properties/batch/', {'ids': '1,x'}).status_code == 400
+    too_many = ','.join(str(i) for i in range(1, 52))
+    assert client.get('/api/properties/batch/', {'ids': too_many}).status_code == 400
@@ -0,0 +1,53 @@
+import json
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from apps.properties.models import Property, PropertyImage, Feature, PropertyFeature
+from apps.properties.views import PropertyExportView
+
+User = get_user_model()
+
+
+def make_catalog(n):
+    admin = User.objects.create_user(username='admin', email='admin@x.com', password='p', is_staff=True)
+    props = Property.objects.bulk_create([
+        Property(
+            title=f't{i}', description='d', address='a', city='c', state='s', zip_code='z',
+            property_type='temporal', bedrooms=1, bathrooms=1, square_feet=10, price=10,
+            created_by=admin,
+        )
+        for i in range(n)
+    ])
+    PropertyImage.objects.bulk_create([
+        PropertyImage(property=p, s3_key=f'properties/{p.id}/a.jpg', url=f'https://b/{p.id}/a.jpg', order=0) for p in props
+    ])
+    pileta = Feature.objects.create(slug='pileta', name='pileta')
+    PropertyFeature.objects.bulk_create([PropertyFeature(property=p, feature=pileta, name='pileta') for p in props])
+    client = APIClient()
+    client.force_authenticate(admin)
+    return client, props
+
+
+def test_export_ndjson_with_relations_queries_per_chunk(db, monkeypatch, django_assert_num_queries):
+    monkeypatch.setattr(PropertyExportView, 'CHUNK_SIZE', 10)
+    client, props = make_catalog(25)
+
+    resp = client.get('/api/properties/export/', {'include': 'images,features'})
+    assert resp.status_code == 200
+    # 1 cursor + (imágenes + features) por cada uno de los 3 chunks
+    with django_assert_num_queries(7):
+        lines = b''.join(resp.streaming_content).decode().splitlines()
+    assert len(lines) == 25
+    first = json.loads(lines[0])
+    assert first['id'] == props[0].id
+    assert first['images'][0]['url'] == f'https://b/{props[0].id}/a.jpg'
+    assert first['features'] == ['pileta']
+
+
+def test_export_csv_is_admin_only(db):
+    client, props = make_catalog(3)
+    resp = client.get('/api/properties/export/', {'export': 'csv', 'include': 'features'})
+    lines = b''.join(resp.streaming_content).decode().strip().splitlines()
+    assert lines[0].endswith(',features')
+    assert len(lines) == 4
+
+    assert APIClient().get('/api/properties/export/').status_code in (401, 403)
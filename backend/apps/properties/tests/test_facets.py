@@ -0,0 +1,60 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from apps.properties.models import Property, Feature, PropertyFeature
+
+User = get_user_model()
+
+
+def make_property(owner, **kwargs):
+    data = dict(
+        title='t', description='d', address='a', city='Palermo', state='s', zip_code='z',
+        property_type='temporal', bedrooms=1, bathrooms=1, square_feet=10, price=10,
+        created_by=owner, status='published',
+    )
+    data.update(kwargs)
+    return Property.objects.create(**data)
+
+
+def catalog_queries(ctx):
+    # Las lecturas/escrituras del cache compartido (tabla django_cache, en un savepoint) no cuentan
+    return [q['sql'] for q in ctx.captured_queries if 'django_cache' not in q['sql'] and 'SAVEPOINT' not in q['sql']]
+
+
+def test_facets_single_query_and_cached(db, django_capture_on_commit_callbacks):
+    cache.clear()
+    owner = User.objects.create_user(username='u', password='p')
+    pileta = Feature.objects.create(slug='pileta', name='Pileta')
+    a = make_property(owner, bedrooms=1)
+    b = make_property(owner, bedrooms=5, city='Belgrano', property_type='vacacional')
+    make_property(owner, bedrooms=2, property_type='vacacional')
+    make_property(owner, status='draft')
+    for p in (a, b):
+        PropertyFeature.objects.create(property=p, feature=pileta, name='pileta')
+
+    client = APIClient()
+    with CaptureQueriesContext(connection) as ctx:
+        resp = client.get('/api/properties/facets/')
+    assert len(catalog_queries(ctx)) == 1
+    data = resp.json()
+    assert data['total'] == 3
+    assert data['property_type'] == [{'value': 'vacacional', 'count': 2}, {'value': 'temporal', 'count': 1}]
+    assert data['city'] == [{'value': 'Palermo', 'count': 2}, {'value': 'Belgrano', 'count': 1}]
+    assert data['bedrooms'] == [{'value': '1', 'count': 1}, {'value': '2', 'count': 1}, {'value': '4+', 'count': 1}]
+    assert data['features'] == [{'value': 'pileta', 'count': 2}]
+
+    # Caché caliente: versión del catálogo + datos en un solo get_many, nada más
+    with CaptureQueriesContext(connection) as ctx:
+        assert client.get('/api/properties/facets/').json() == data
+    assert len(ctx.captured_queries) == 1
+    assert 'django_cache' in ctx.captured_queries[0]['sql']
+
+    resp = client.get('/api/properties/facets/', {'propertyType': 'vacacional', 'features': 'piscina'})
+    assert resp.json()['total'] == 1
+
+    # Una escritura del catálogo invalida la caché
+    with django_capture_on_commit_callbacks(execute=True):
+        make_property(owner, property_type='house')
+    assert client.get('/api/properties/facets/').json()['total'] == 4
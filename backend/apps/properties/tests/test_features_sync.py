@@ -0,0 +1,71 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from apps.properties.models import Property, Feature, PropertyFeature
+from apps.properties.serializers import PropertySerializer
+
+User = get_user_model()
+
+PAYLOAD = {
+    'title': 't', 'description': 'd', 'address': 'a', 'city': 'c', 'state': 's', 'zip_code': 'z',
+    'property_type': 'temporal', 'bedrooms': 1, 'bathrooms': 1, 'square_feet': 10, 'price': 10,
+}
+
+
+def feature_queries(ctx):
+    return [q['sql'] for q in ctx.captured_queries if '"properties_propertyfeature"' in q['sql']]
+
+
+def features_of(prop):
+    return set(PropertyFeature.objects.filter(property=prop).values_list('name', flat=True))
+
+
+def test_create_inserts_features_in_one_query(db, settings):
+    settings.USE_GEOCODING = False
+    user = User.objects.create_user(username='u', password='p')
+    serializer = PropertySerializer(data={**PAYLOAD, 'feature_list': ['pileta', 'cochera', 'pileta', ' wifi ']})
+    assert serializer.is_valid(), serializer.errors
+    with CaptureQueriesContext(connection) as ctx:
+        prop = serializer.save(created_by=user)
+    assert len(feature_queries(ctx)) == 1
+    assert features_of(prop) == {'pileta', 'cochera', 'wifi'}
+
+
+def test_update_diffs_features_with_constant_queries(db, settings):
+    settings.USE_GEOCODING = False
+    user = User.objects.create_user(username='u', password='p')
+    prop = Property.objects.create(**PAYLOAD, created_by=user)
+    catalog = Feature.objects.bulk_create([Feature(slug=f'f{i}', name=f'f{i}') for i in range(30)])
+    PropertyFeature.objects.bulk_create([PropertyFeature(property=prop, feature=f, name=f.name) for f in catalog])
+
+    wanted = [f'f{i}' for i in range(15, 45)]
+    serializer = PropertySerializer(prop, data={'feature_list': wanted}, partial=True)
+    assert serializer.is_valid(), serializer.errors
+    with CaptureQueriesContext(connection) as ctx:
+        serializer.save()
+    # SELECT actuales + INSERT nuevas + DELETE sobrantes
+    assert len(feature_queries(ctx)) == 3
+    assert features_of(prop) == set(wanted)
+
+    # Sin feature_list no se tocan
+    serializer = PropertySerializer(prop, data={'title': 'otro'}, partial=True)
+    assert serializer.is_valid()
+    serializer.save()
+    assert features_of(prop) == set(wanted)
+
+
+def test_variants_share_catalog_entry_and_filter_requires_all(db, settings):
+    settings.USE_GEOCODING = False
+    user = User.objects.create_user(username='u', password='p')
+    props = []
+    for features in (['Piscina', 'Garage'], ['pileta', 'wifi'], ['PILETA', 'cochera', 'Wi-Fi']):
+        serializer = PropertySerializer(data={**PAYLOAD, 'status': 'published', 'feature_list': features})
+        assert serializer.is_valid(), serializer.errors
+        props.append(serializer.save(created_by=user))
+
+    assert set(Feature.objects.values_list('slug', flat=True)) == {'pileta', 'cochera', 'wifi'}
+
+    resp = APIClient().get('/api/properties/', {'features': 'pileta, Cochera'})
+    ids = {p['id'] for p in resp.json()['results']}
+    assert ids == {props[0].id, props[2].id}
@@ -0,0 +1,91 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from apps.properties.models import Property
+
+User = get_user_model()
+
+# Obelisco, Palermo Soho, Tigre, Mar del Plata
+POINTS = {
+    'obelisco': (-34.603722, -58.381592),
+    'palermo': (-34.588400, -58.430300),
+    'tigre': (-34.425900, -58.579600),
+    'mdp': (-38.005477, -57.542610),
+}
+
+
+def make_catalog():
+    owner = User.objects.create_user(username='u', password='p')
+    props = {}
+    for name, (lat, lng) in POINTS.items():
+        props[name] = Property.objects.create(
+            title=name, description='d', address='a', city='c', state='s', zip_code='z',
+            property_type='temporal', bedrooms=1, bathrooms=1, square_feet=10, price=10,
+            created_by=owner, status='published', latitude=lat, longitude=lng,
+        )
+    Property.objects.create(
+        title='sin coords', description='d', address='a', city='c', state='s', zip_code='z',
+        property_type='temporal', bedrooms=1, bathrooms=1, square_feet=10, price=10,
+        created_by=owner, status='published',
+    )
+    return props
+
+
+def titles(resp):
+    return [p['title'] for p in resp.json()['results']]
+
+
+def test_bbox_filter(db):
+    make_catalog()
+    resp = APIClient().get('/api/properties/', {'bbox': '-58.6,-34.7,-58.3,-34.4'})
+    assert sorted(titles(resp)) == ['obelisco', 'palermo', 'tigre']
+
+
+def test_near_orders_by_distance_within_radius(db):
+    make_catalog()
+    resp = APIClient().get('/api/properties/', {'near': '-34.6037,-58.3816', 'radius_km': '10'})
+    assert titles(resp) == ['obelisco', 'palermo']
+    results = resp.json()['results']
+    assert results[0]['distance_km'] < 0.1
+    assert 4 < results[1]['distance_km'] < 6
+
+
+def test_invalid_geo_params_are_ignored(db):
+    make_catalog()
+    resp = APIClient().get('/api/properties/', {'bbox': 'a,b,c', 'near': '200,0'})
+    assert len(titles(resp)) == 5
+
+
+def test_clusters_group_by_zoom_grid(db):
+    from django.core.cache import cache
+    cache.clear()
+    make_catalog()
+    client = APIClient()
+
+    with CaptureQueriesContext(connection) as ctx:
+        resp = client.get('/api/properties/clusters/', {'zoom': '6', 'bbox': '-60,-39,-56,-33'})
+    # Sin contar el cache compartido (tabla django_cache, en un savepoint): una sola agregación
+    assert len([q for q in ctx.captured_queries if 'django_cache' not in q['sql'] and 'SAVEPOINT' not in q['sql']]) == 1
+    clusters = resp.json()['clusters']
+    # A zoom 6 (celdas de ~1.4°) el AMBA es un solo cluster; Mar del Plata queda aparte
+    assert [c['count'] for c in clusters] == [3, 1]
+    assert clusters[1]['id'] is not None and 'id' not in clusters[0]
+
+    with CaptureQueriesContext(connection) as ctx:
+        assert client.get('/api/properties/clusters/', {'zoom': '6', 'bbox': '-60,-39,-56,-33'}).json()['clusters'] == clusters
+    assert len(ctx.captured_queries) == 1   # caché caliente: un get_many
+
+    resp = client.get('/api/properties/clusters/', {'zoom': '14', 'bbox': '-58.6,-34.7,-58.3,-34.4'})
+    assert sorted(c['count'] for c in resp.json()['clusters']) == [1, 1, 1]
+
+
+def test_clusters_require_bbox_and_bound_cell_count(db):
+    make_catalog()
+    client = APIClient()
+    assert client.get('/api/properties/clusters/', {'zoom': '18'}).status_code == 400
+    assert client.get('/api/properties/clusters/', {'zoom': '18', 'bbox': 'x'}).status_code == 400
+    # Mundo entero a zoom 22: la celda se agranda hasta bbox / CLUSTER_MAX_CELLS_PER_AXIS
+    resp = client.get('/api/properties/clusters/', {'zoom': '22', 'bbox': '-180,-90,180,90'})
+    assert resp.status_code == 200
+    assert resp.json()['cell_size'] == 360 / 64
@@ -0,0 +1,100 @@
+import asyncio
+import pytest
+from adrf.views import APIView as AsyncAPIView
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from apps.properties import serializers as property_serializers
+from apps.properties import views as property_views
+from apps.properties.views import PropertyGeocodingWriteViewSet, PropertyViewSet
+from apps.properties.models import Property
+from core.views import db_health
+
+User = get_user_model()
+
+PAYLOAD = {
+    'title': 'Casa', 'description': 'd', 'address': 'Av. Corrientes 1000', 'city': 'CABA',
+    'state': 'BA', 'zip_code': '1043', 'property_type': 'temporal', 'bedrooms': 1,
+    'bathrooms': 1, 'square_feet': 40, 'price': 100,
+}
+
+
+@pytest.fixture(params=['wsgi', 'asgi'])
+def server_mode(request, settings, monkeypatch):
+    """Geocoding fakes; under asgi the writes must go through the async client only."""
+    settings.USE_GEOCODING = True
+    settings.ASYNC_WRITES_URLCONF = 'config.urls_async_writes' if request.param == 'asgi' else None
+    queries = []
+
+    def fake_geocode(query):
+        if request.param == 'asgi':
+            raise AssertionError('the async view must resolve geocoding before the sync path')
+        queries.append(query)
+        return (-34.6037, -58.3816)
+
+    async def fake_ageocode(query):
+        queries.append(query)
+        return (-34.6037, -58.3816)
+
+    monkeypatch.setattr(property_serializers, 'geocode', fake_geocode)
+    monkeypatch.setattr(property_views, 'ageocode', fake_ageocode)
+    expected_view = PropertyGeocodingWriteViewSet if request.param == 'asgi' else PropertyViewSet
+    return queries, expected_view
+
+
+def test_create_geocodes_the_address(db, server_mode):
+    queries, expected_view = server_mode
+    client = APIClient()
+    client.force_authenticate(User.objects.create_user(username='u', password='p'))
+
+    resp = client.post('/api/properties/', PAYLOAD, format='json')
+    assert resp.status_code == 201, resp.content
+    assert resp.wsgi_request.resolver_match.func.cls is expected_view
+    assert queries == ['Av. Corrientes 1000, CABA, BA, 1043, Argentina']
+    prop = Property.objects.get(pk=resp.json()['id'])
+    assert (float(prop.latitude), float(prop.longitude)) == (-34.6037, -58.3816)
+
+
+def test_update_geocodes_only_when_address_changes(db, server_mode):
+    queries, expected_view = server_mode
+    user = User.objects.create_user(username='u', password='p')
+    prop = Property.objects.create(created_by=user, status='published', **PAYLOAD)
+    client = APIClient()
+    client.force_authenticate(user)
+
+    assert client.patch(f'/api/properties/{prop.id}/', {'title': 'Otra'}, format='json').status_code == 200
+    assert queries == []
+
+    resp = client.patch(f'/api/properties/{prop.id}/', {'city': 'Tigre'}, format='json')
+    assert resp.status_code == 200
+    assert resp.wsgi_request.resolver_match.func.cls is expected_view
+    assert queries == ['Av. Corrientes 1000, Tigre, BA, 1043, Argentina']
+    prop.refresh_from_db()
+    assert prop.city == 'Tigre' and float(prop.latitude) == -34.6037
+
+
+def test_reads_and_other_writes_stay_sync_under_asgi(db, settings):
+    settings.ASYNC_WRITES_URLCONF = 'config.urls_async_writes'
+    user = User.objects.create_user(username='u', password='p')
+    prop = Property.objects.create(created_by=user, status='published', **PAYLOAD)
+    client = APIClient()
+    client.force_authenticate(user)
+
+    # Sin adrf: list/retrieve no pasan por async_to_sync + sync_to_async en cada GET
+    assert not issubclass(PropertyViewSet, AsyncAPIView)
+    assert PropertyGeocodingWriteViewSet.view_is_async
+    resp = client.get(f'/api/properties/{prop.id}/')
+    assert resp.status_code == 200
+    assert resp.wsgi_request.resolver_match.func.cls is PropertyViewSet
+    # Rutas que no están en el URLconf de escrituras caen al principal
+    resp = client.post(f'/api/properties/{prop.id}/pricing/', {
+        'start_date': '2025-01-10', 'end_date': '2025-01-20', 'price': '100.00',
+    }, format='json')
+    assert resp.status_code == 201
+    assert client.delete(f'/api/properties/{prop.id}/').status_code == 204
+
+
+def test_health_endpoints_are_async(db):
+    assert asyncio.iscoroutinefunction(db_health)
+    client = APIClient()
+    assert client.get('/health/').json() == {'status': 'ok'}
+    assert client.get('/db/health/').json() == {'db': 'ok'}
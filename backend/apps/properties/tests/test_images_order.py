@@ -0,0 +1,39 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth import get_user_model
+from apps.properties.models import Property, PropertyImage
+from apps.properties.serializers import PropertySerializer
+
+User = get_user_model()
+
+
+def make_gallery(n):
+    user = User.objects.create_user(username='u', password='p')
+    prop = Property.objects.create(
+        title='t', description='d', address='a', city='c', state='s', zip_code='z',
+        property_type='temporal', bedrooms=1, bathrooms=1, square_feet=10, price=10,
+        created_by=user,
+    )
+    images = PropertyImage.objects.bulk_create([
+        PropertyImage(property=prop, s3_key=f'properties/{i}.jpg', order=7, is_primary=(i == 15)) for i in range(n)
+    ])
+    return prop, [img.id for img in images]
+
+
+def test_reorder_gallery_is_a_single_update(db, settings):
+    settings.USE_GEOCODING = False
+    prop, ids = make_gallery(40)
+    new_order = list(reversed(ids[10:]))  # las 10 primeras quedan fuera del orden
+
+    serializer = PropertySerializer(prop, data={'images_order': new_order}, partial=True)
+    assert serializer.is_valid(), serializer.errors
+    with CaptureQueriesContext(connection) as ctx:
+        serializer.save()
+
+    image_updates = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('UPDATE "properties_propertyimage"')]
+    assert len(image_updates) == 1
+
+    rows = list(PropertyImage.objects.filter(property=prop).values_list('id', 'order', 'is_primary'))
+    assert [r[0] for r in rows] == new_order + ids[:10]
+    assert [r[1] for r in rows] == list(range(40))
+    assert [r[0] for r in rows if r[2]] == [new_order[0]]
@@ -0,0 +1,104 @@
+import datetime
+from decimal import Decimal
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from apps.properties.models import Property, Maintenance
+from apps.properties.views import MaintenanceReportView
+
+User = get_user_model()
+
+
+def make_property(owner, title):
+    return Property.objects.create(
+        title=title, description='d', address='a', city='c', state='s', zip_code='z',
+        property_type='temporal', bedrooms=1, bathrooms=1, square_feet=10, price=10,
+        created_by=owner,
+    )
+
+
+def setup_portfolio():
+    host = User.objects.create_user(username='host', email='host@x.com', password='p')
+    other = User.objects.create_user(username='other', email='other@x.com', password='p')
+    a, b = make_property(host, 'A'), make_property(host, 'B')
+    foreign = make_property(other, 'C')
+    for prop, day, cost, resolved in [
+        (a, datetime.date(2025, 1, 3), 100, True),
+        (a, datetime.date(2025, 1, 20), 50, False),
+        (a, datetime.date(2025, 2, 1), 25, True),
+        (b, datetime.date(2025, 2, 10), 10, False),
+        (foreign, datetime.date(2025, 1, 5), 999, True),
+    ]:
+        Maintenance.objects.create(property=prop, date=day, description='x', cost=cost, resolved=resolved)
+    return host, a, b
+
+
+def test_report_rolls_up_host_costs(db, django_assert_num_queries):
+    host, a, b = setup_portfolio()
+    client = APIClient()
+    client.force_authenticate(host)
+
+    with django_assert_num_queries(4):
+        resp = client.get('/api/properties/maintenance/report/', {'start': '2025-01-01', 'end': '2025-12-31'})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert Decimal(str(data['totals']['total_cost'])) == Decimal('185')
+    assert Decimal(str(data['totals']['unresolved_cost'])) == Decimal('60')
+    assert [r['property_id'] for r in data['by_property']] == [a.id, b.id]
+    assert [(r['month'], Decimal(str(r['total_cost']))) for r in data['by_month']] == [
+        ('2025-01', Decimal('150')), ('2025-02', Decimal('35')),
+    ]
+    a_rows = [r for r in data['rows'] if r['property_id'] == a.id]
+    assert [Decimal(str(r['cumulative_cost'])) for r in a_rows] == [Decimal('50'), Decimal('150'), Decimal('175')]
+    assert data['rows_truncated'] is False
+
+
+def test_report_caps_json_rows(db, monkeypatch):
+    host, a, _ = setup_portfolio()
+    monkeypatch.setattr(MaintenanceReportView, 'MAX_JSON_ROWS', 2)
+    client = APIClient()
+    client.force_authenticate(host)
+
+    data = client.get('/api/properties/maintenance/report/').json()
+    assert len(data['rows']) == 2 and data['rows_truncated'] is True
+    # Los acumulados se calculan sobre todo el historial, no sólo sobre las filas devueltas
+    assert [Decimal(str(r['cumulative_cost'])) for r in data['rows']] == [Decimal('50'), Decimal('150')]
+    # Los totales no se recortan
+    assert Decimal(str(data['totals']['total_cost'])) == Decimal('185')
+
+
+def test_report_streams_csv(db):
+    host, a, _ = setup_portfolio()
+    client = APIClient()
+    client.force_authenticate(host)
+
+    resp = client.get('/api/properties/maintenance/report/', {'export': 'csv', 'end': '2025-01-31'})
+    assert resp.status_code == 200
+    lines = b''.join(resp.streaming_content).decode().strip().splitlines()
+    assert lines[0].startswith('property_id,property_title,month')
+    assert len(lines) == 3
+    assert lines[1].startswith(f'{a.id},A,2025-01,False,1,')
+
+
+def test_report_rejects_invalid_dates(db):
+    host, _, _ = setup_portfolio()
+    client = APIClient()
+    client.force_authenticate(host)
+    assert client.get('/api/properties/maintenance/report/', {'start': 'enero'}).status_code == 400
+
+
+def test_report_rejects_non_numeric_host(db):
+    setup_portfolio()
+    staff = User.objects.create_user(username='staff', email='staff@x.com', password='p', is_staff=True)
+    client = APIClient()
+    client.force_authenticate(staff)
+    resp = client.get('/api/properties/maintenance/report/', {'host': 'abc'})
+    assert resp.status_code == 400
+    assert 'host' in resp.json()
+
+
+def test_maintenance_rows_cannot_be_created_through_the_api(db):
+    host, a, _ = setup_portfolio()
+    client = APIClient()
+    client.force_authenticate(host)
+    resp = client.post(f'/api/properties/{a.id}/maintenance/', {'date': '2025-03-01', 'description': 'x', 'cost': 1})
+    assert resp.status_code == 405
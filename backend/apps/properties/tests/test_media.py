@@ -0,0 +1,64 @@
+from django.test.utils import override_settings
+from apps.properties import media
+from apps.properties.models import PropertyImage
+from apps.properties.serializers import PropertyImageSerializer
+
+
+@override_settings(AWS_STORAGE_BUCKET_NAME='bkt')
+def test_image_urls_batch():
+    images = [
+        PropertyImage(id=1, s3_key='properties/original/7/a.jpg', url=''),
+        PropertyImage(id=2, s3_key='', url='https://old.s3.amazonaws.com/properties/original/7/b.png'),
+        PropertyImage(id=3, s3_key='properties/legacy.jpg', url=''),
+    ]
+    urls = media.image_urls(images)
+    assert urls[0] == {
+        'url': 'https://bkt.s3.amazonaws.com/properties/original/7/a.jpg',
+        'originalUrl': 'https://bkt.s3.amazonaws.com/properties/original/7/a.jpg',
+        'derived480Url': 'https://bkt.s3.amazonaws.com/properties/derived/480/7/a.webp',
+        'derived768Url': 'https://bkt.s3.amazonaws.com/properties/derived/768/7/a.webp',
+    }
+    # sin s3_key la clave se obtiene de la url guardada y se resuelve con la base actual
+    assert urls[1]['url'] == 'https://bkt.s3.amazonaws.com/properties/original/7/b.png'
+    assert urls[1]['derived768Url'] == 'https://bkt.s3.amazonaws.com/properties/derived/768/7/b.webp'
+    # fuera de properties/original/ no hay derivadas
+    assert urls[2]['derived480Url'] is None
+
+    data = PropertyImageSerializer(images, many=True).data
+    assert [row['url'] for row in data] == [u['url'] for u in urls]
+
+
+def test_bucket_change_clears_caches():
+    with override_settings(AWS_STORAGE_BUCKET_NAME='uno'):
+        assert media.public_url('k.jpg') == 'https://uno.s3.amazonaws.com/k.jpg'
+    with override_settings(AWS_STORAGE_BUCKET_NAME='dos'):
+        assert media.public_url('k.jpg') == 'https://dos.s3.amazonaws.com/k.jpg'
+
+
+@override_settings(AWS_STORAGE_BUCKET_NAME='bkt', MEDIA_CDN_HOST='media.example.com', MEDIA_URL_VERSION='3')
+def test_cdn_host_and_version():
+    image = PropertyImage(s3_key='', url='https://bkt.s3.amazonaws.com/properties/original/1/x.jpg')
+    urls = media.image_urls([image])[0]
+    assert urls['url'] == 'https://media.example.com/properties/original/1/x.jpg?v=3'
+    assert urls['derived480Url'] == 'https://media.example.com/properties/derived/480/1/x.webp?v=3'
+    # URLs ya resueltas (con ?v=) vuelven a dar la misma clave
+    assert media.key_from_url(urls['url']) == 'properties/original/1/x.jpg'
+    # URLs externas (sin clave) se devuelven tal cual
+    assert media.image_urls([PropertyImage(s3_key='', url='https://otro.cdn/foto.jpg')])[0]['url'] == 'https://otro.cdn/foto.jpg'
+
+
+def test_storage_url_uses_resolver():
+    from core.storage_backends import PublicMediaS3Storage
+    with override_settings(AWS_STORAGE_BUCKET_NAME='bkt', MEDIA_CDN_HOST='https://media.example.com'):
+        assert PublicMediaS3Storage(bucket_name='bkt').url('properties/a.jpg') == 'https://media.example.com/properties/a.jpg'
+
+
+def test_s3_signed_urls_are_stable_within_window(monkeypatch):
+    monkeypatch.setenv('AWS_ACCESS_KEY_ID', 'AKIDEXAMPLE')
+    monkeypatch.setenv('AWS_SECRET_ACCESS_KEY', 'secret')
+    with override_settings(AWS_STORAGE_BUCKET_NAME='bkt', AWS_S3_REGION_NAME='us-east-1',
+                           MEDIA_URL_SIGNING='s3', MEDIA_SIGNED_URL_TTL=600):
+        first = media.media_url('properties/original/1/x.jpg')
+        assert first.startswith('https://bkt.s3.amazonaws.com/properties/original/1/x.jpg?')
+        assert 'X-Amz-Signature=' in first
+        assert media.media_url('properties/original/1/x.jpg') == first
@@ -0,0 +1,65 @@
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from apps.properties.models import Property, PropertyImage, Feature, PropertyFeature
+
+User = get_user_model()
+
+
+def make_property():
+    owner = User.objects.create_user(username='u', password='p')
+    prop = Property.objects.create(
+        title='Casa', description='larga descripción', address='Calle 1', city='CABA', state='BA',
+        zip_code='1000', property_type='temporal', bedrooms=2, bathrooms=1, square_feet=50, price=100,
+        created_by=owner, status='published',
+    )
+    PropertyImage.objects.create(property=prop, s3_key='properties/a.jpg', url='https://cdn/a.jpg', is_primary=True)
+    pileta = Feature.objects.create(slug='pileta', name='Pileta')
+    PropertyFeature.objects.create(property=prop, feature=pileta, name='Pileta')
+    return prop
+
+
+def get(path, params):
+    with CaptureQueriesContext(connection) as ctx:
+        resp = APIClient().get(path, params)
+    assert resp.status_code == 200
+    return resp.json(), [q['sql'] for q in ctx.captured_queries]
+
+
+def test_list_fields_projection(db):
+    make_property()
+    data, queries = get('/api/properties/', {'fields': 'title,price,bogus'})
+    assert data['results'] == [{'id': data['results'][0]['id'], 'title': 'Casa', 'price': '100.00'}]
+    # COUNT + página, sin prefetch de imágenes ni features
+    assert len(queries) == 2
+    assert 'description' not in queries[1]
+
+
+def test_list_default_skips_features_prefetch(db):
+    make_property()
+    data, queries = get('/api/properties/', {})
+    item = data['results'][0]
+    assert item['cover']['originalUrl'] == 'https://cdn/a.jpg'
+    assert 'images' not in item and 'features' not in item
+    assert len(queries) == 3  # COUNT + página + imágenes
+
+
+def test_list_include_relations(db):
+    make_property()
+    data, queries = get('/api/properties/', {'fields': 'title', 'include': 'images,features'})
+    item = data['results'][0]
+    assert set(item) == {'id', 'title', 'images', 'features'}
+    assert item['images'][0]['url'] == 'https://cdn/a.jpg'
+    assert item['features'][0]['name'] == 'Pileta'
+    assert len(queries) == 4
+
+
+def test_retrieve_sparse(db):
+    prop = make_property()
+    data, queries = get(f'/api/properties/{prop.id}/', {'fields': 'title,full_address'})
+    assert data == {'id': prop.id, 'title': 'Casa', 'full_address': 'Calle 1, CABA, BA, 1000'}
+    assert len(queries) == 1
+
+    data, _ = get(f'/api/properties/{prop.id}/', {})
+    assert {'images', 'features', 'description'} <= set(data)
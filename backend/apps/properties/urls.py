@@ -1,11 +1,13 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import PropertyViewSet,  PropertyPricingView, PropertyMaintenanceView, presign_property_images, attach_property_images
+from .views import PropertyViewSet,  PropertyPricingView, PropertyMaintenanceView, MaintenanceReportView, PropertyExportView, presign_property_images, attach_property_images
 
 router = DefaultRouter()
 router.register('', PropertyViewSet)
 
 urlpatterns = [
+    path('export/', PropertyExportView.as_view(), name='property-export'),
+    path('maintenance/report/', MaintenanceReportView.as_view(), name='maintenance-report'),
     path('', include(router.urls)),
     path('presign_images/', presign_property_images),
     path('<int:pk>/attach_images/', attach_property_images),
@@ -1,47 +1,159 @@
-import os
-from django.conf import settings
+import csv
+import hashlib
+import math
+import re
+import unicodedata
+from django.core.cache import cache
+from django.db.models import FloatField
+from django.db.models.functions import ASin, Cast, Cos, Least, Power, Radians, Sin, Sqrt
+from django.utils.text import slugify
 
-def extract_s3_key(image_obj):
+# Variantes frecuentes -> clave canónica (ya normalizadas: minúsculas, sin acentos)
+FEATURE_ALIASES = {
+    'piscina': 'pileta',
+    'pileta de natacion': 'pileta',
+    'garage': 'cochera',
+    'garaje': 'cochera',
+    'estacionamiento': 'cochera',
+    'wi fi': 'wifi',
+    'internet': 'wifi',
+    'a a': 'aire acondicionado',
+    'aire': 'aire acondicionado',
+    'ac': 'aire acondicionado',
+    'asador': 'parrilla',
+    'quincho': 'parrilla',
+    'lavadora': 'lavarropas',
+    'mascotas': 'apto mascotas',
+    'pet friendly': 'apto mascotas',
+}
+
+class _Echo:
+    """File-like object whose write() returns the value, for csv.writer + streaming responses."""
+    def write(self, value):
+        return value
+
+
+def csv_stream(header, rows):
     """
-    Extracts the S3 key from a PropertyImage object.
-    Prioritizes image_obj.s3_key.
-    If missing, tries to parse it from image_obj.url.
+    Yields CSV lines (header first) for an iterable of row sequences.
+    Meant for StreamingHttpResponse so rows are encoded as the DB cursor advances.
     """
-    # 1. Try s3_key
-    s3_key = getattr(image_obj, 's3_key', None)
-    if s3_key:
-        return s3_key
-    
-    # 2. Try parsing url
-    url = getattr(image_obj, 'url', None)
-    if url:
-        # Expected format: https://<bucket>.s3.amazonaws.com/<KEY>
-        # We can just split by amazonaws.com/
-        if 'amazonaws.com/' in url:
-            return url.split('amazonaws.com/', 1)[1]
-            
-    return None
-
-def build_derived_url(s3_key, size):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def feature_slug(name):
     """
-    Constructs a derived WebP URL for a given S3 key and size (480 or 768).
-    Input key expected: properties/original/<property_id>/<filename>.<ext>
-    Output key: properties/derived/<size>/<property_id>/<filename>.webp
+    Normalized catalog key for a feature name: lowercase, accents and punctuation removed,
+    known variants folded (FEATURE_ALIASES). "Piscina", "PILETA " and "pileta" -> "pileta".
     """
-    if not s3_key or 'properties/original/' not in s3_key:
-        return None
-        
+    text = unicodedata.normalize('NFKD', str(name or '')).encode('ascii', 'ignore').decode('ascii')
+    text = re.sub(r'[^a-z0-9]+', ' ', text.lower()).strip()
+    text = FEATURE_ALIASES.get(text, text)
+    return slugify(text)[:100]
+
+
+# Versión del catálogo: cualquier alta/baja/modificación de propiedades o features la incrementa
+# (ver signals.py) y todas las entradas derivadas quedan obsoletas sin tener que borrarlas una a una.
+# Cada entrada guarda la versión con la que se calculó, así versión + datos se leen en un solo
+# get_many (una query con el cache en la DB, un round-trip con Redis).
+CATALOG_VERSION_KEY = 'properties:catalog:version'
+CATALOG_CACHE_TIMEOUT = 300
+
+
+def catalog_version():
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOG_VERSION_KEY, 1, timeout=None)
+        version = cache.get(CATALOG_VERSION_KEY, 1)
+    return version
+
+
+def bump_catalog_version():
+    try:
+        cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        cache.set(CATALOG_VERSION_KEY, 1, timeout=None)
+
+
+def catalog_cache_key(prefix, params):
+    """Cache key for catalog-derived data; params is a dict of the inputs that shape the result."""
+    raw = '&'.join(f'{k}={params[k]}' for k in sorted(params) if params[k] not in (None, ''))
+    digest = hashlib.sha1(raw.encode('utf-8')).hexdigest()
+    return f'properties:{prefix}:{digest}'
+
+
+def catalog_cache_get(key):
+    """
+    (data, version) for `key` in one cache round-trip. data is None when the entry is missing or
+    was computed for an older catalog version; pass `version` back to catalog_cache_set.
+    """
+    values = cache.get_many([CATALOG_VERSION_KEY, key])
+    version = values.get(CATALOG_VERSION_KEY)
+    if version is None:
+        version = catalog_version()
+    entry = values.get(key)
+    if entry is not None and entry[0] == version:
+        return entry[1], version
+    return None, version
+
+
+def catalog_cache_set(key, version, data):
+    # Si el catálogo cambió mientras se calculaba, la entrada nace obsoleta y se recalcula
+    cache.set(key, (version, data), CATALOG_CACHE_TIMEOUT)
+
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = 111.045
+MAX_RADIUS_KM = 500
+
+
+def _floats(raw, count):
     try:
-        # Extract relative path: properties/original/123/abc.jpg -> 123/abc.jpg
-        relative_path = s3_key.split('properties/original/', 1)[1]
-        # Remove extension: 123/abc.jpg -> 123/abc
-        base_name = relative_path.rsplit('.', 1)[0]
-        
-        bucket = getattr(settings, 'AWS_STORAGE_BUCKET_NAME', '') or os.environ.get('S3_MEDIA_BUCKET', '')
-        if bucket:
-            base_url = f"https://{bucket}.s3.amazonaws.com/properties/derived"
-            return f"{base_url}/{size}/{base_name}.webp"
-    except IndexError:
-        pass
-        
-    return None
+        values = [float(v) for v in (raw or '').split(',')]
+    except ValueError:
+        return None
+    if len(values) != count or not all(math.isfinite(v) for v in values):
+        return None
+    return values
+
+
+def parse_bbox(raw):
+    """'minLng,minLat,maxLng,maxLat' -> (min_lng, min_lat, max_lng, max_lat) or None if invalid."""
+    values = _floats(raw, 4)
+    if not values:
+        return None
+    min_lng, min_lat, max_lng, max_lat = values
+    if not (-90 <= min_lat <= max_lat <= 90 and -180 <= min_lng <= 180 and -180 <= max_lng <= 180):
+        return None
+    return min_lng, min_lat, max_lng, max_lat
+
+
+def parse_point(raw):
+    """'lat,lng' -> (lat, lng) or None if invalid."""
+    values = _floats(raw, 2)
+    if not values or not (-90 <= values[0] <= 90 and -180 <= values[1] <= 180):
+        return None
+    return values[0], values[1]
+
+
+def radius_bbox(lat, lng, radius_km):
+    """Bounding box (min_lat, max_lat, min_lng, max_lng) enclosing a circle; lets the B-tree prefilter."""
+    dlat = radius_km / KM_PER_DEGREE_LAT
+    cos_lat = math.cos(math.radians(lat))
+    dlng = 180.0 if cos_lat < 1e-6 else min(180.0, radius_km / (KM_PER_DEGREE_LAT * cos_lat))
+    return lat - dlat, lat + dlat, lng - dlng, lng + dlng
+
+
+def distance_km_expression(lat, lng):
+    """Haversine great-circle distance (km) from (lat, lng) to each row, as an ORM expression."""
+    row_lat = Radians(Cast('latitude', FloatField()))
+    row_lng = Radians(Cast('longitude', FloatField()))
+    lat0, lng0 = math.radians(lat), math.radians(lng)
+    a = (
+        Power(Sin((row_lat - lat0) / 2), 2)
+        + math.cos(lat0) * Cos(row_lat) * Power(Sin((row_lng - lng0) / 2), 2)
+    )
+    return 2 * EARTH_RADIUS_KM * ASin(Least(Sqrt(a), 1.0, output_field=FloatField()), output_field=FloatField())
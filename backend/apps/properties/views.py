@@ -1,21 +1,41 @@
+from adrf.decorators import api_view as async_api_view
+from adrf.viewsets import GenericViewSet as AsyncGenericViewSet
+from asgiref.sync import sync_to_async
 from rest_framework import viewsets, status, parsers, serializers, filters
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny, IsAuthenticatedOrReadOnly
-from django.db.models import Q
-from .models import Property, PropertyImage, Pricing, Maintenance
+from django.db.models import Q, Sum, Count, Min, Avg, F, Func, Window, Value, Case, When, CharField, DecimalField, FloatField, IntegerField
+from django.db.models.functions import Cast, Floor, TruncMonth
+from django.http import StreamingHttpResponse
+from django.utils.dateparse import parse_date
+from core.aws import presign_put_urls
+from core.db_router import ReplicaReadMixin, use_read_alias
+from apps.users.authentication import ClaimsJWTAuthentication
+from .models import Property, PropertyImage, PropertyFeature, Pricing, Maintenance
 from .serializers import PropertySerializer, PropertyListItemSerializer, PropertyImageSerializer, PricingSerializer, MaintenanceSerializer
 from .permissions import IsOwnerOrAdmin
+from .media import public_url
+from .geocoding import ADDRESS_FIELDS, address_query, ageocode, geocoding_enabled
+from .utils import (
+    csv_stream, feature_slug, catalog_cache_key, catalog_cache_get, catalog_cache_set, bump_catalog_version,
+    parse_bbox, parse_point, radius_bbox, distance_km_expression, MAX_RADIUS_KM,
+)
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.permissions import IsAdminUser
+import json
 from django.contrib import admin
 from rest_framework.views import APIView
 from django.conf import settings
 import uuid, mimetypes
-import boto3
 import logging
 import os
 
 
-class PropertyViewSet(viewsets.ModelViewSet):
+class PropertyViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
+    # Viewset sync: las lecturas del catálogo no pagan saltos async_to_sync/sync_to_async. Bajo
+    # SERVER_MODE=asgi las escrituras con geocoding van a PropertyGeocodingWriteViewSet; acá el
+    # geocoding lo resuelve el serializer (sesión HTTP reutilizada por proceso).
     queryset = (
         Property.objects.all()
         .select_related('created_by')
@@ -23,6 +43,8 @@ class PropertyViewSet(viewsets.ModelViewSet):
         .order_by('-created_at')
     )
     serializer_class = PropertySerializer
+    # Lecturas del catálogo sin query del usuario (claims del token); las escrituras lo cargan entero
+    authentication_classes = [ClaimsJWTAuthentication]
     permission_classes = [IsAuthenticatedOrReadOnly]
     parser_classes = [parsers.JSONParser, parsers.MultiPartParser, parsers.FormParser]
     filter_backends = [filters.SearchFilter]
@@ -31,7 +53,7 @@ class PropertyViewSet(viewsets.ModelViewSet):
     def get_permissions(self):
         # Public read for list/retrieve; auth required for create/update/delete and media mutations
         action = getattr(self, 'action', None)
-        if action in ['list', 'retrieve']:
+        if action in ['list', 'retrieve', 'batch', 'facets', 'clusters']:
             return [AllowAny()]
         if action in ['create', 'update', 'partial_update', 'destroy', 'upload_images', 'delete_image', 'images']:
             return [IsAuthenticated()]
@@ -83,8 +105,111 @@ class PropertyViewSet(viewsets.ModelViewSet):
         if property_type and property_type != 'all':
             queryset = queryset.filter(property_type=property_type)
 
+        # Filtro por amenities (?features=pileta,cochera): deben estar TODAS.
+        # Un solo GROUP BY property_id HAVING COUNT = n sobre el índice (feature_id, property_id)
+        features = self.request.query_params.get('features')
+        if features:
+            slugs = {feature_slug(f) for f in features.split(',')} - {''}
+            if slugs:
+                matching = (
+                    PropertyFeature.objects.filter(feature__slug__in=slugs)
+                    .values('property_id')
+                    .annotate(matched=Count('feature_id'))
+                    .filter(matched=len(slugs))
+                    .values('property_id')
+                )
+                queryset = queryset.filter(pk__in=matching)
+
+        # Filtros geográficos (sin PostGIS). Parámetros inválidos se ignoran, como 'adults'.
+        # ?bbox=minLng,minLat,maxLng,maxLat -> rangos sobre el índice (latitude, longitude)
+        bbox = parse_bbox(self.request.query_params.get('bbox'))
+        if bbox:
+            min_lng, min_lat, max_lng, max_lat = bbox
+            queryset = queryset.filter(latitude__range=(min_lat, max_lat))
+            if min_lng <= max_lng:
+                queryset = queryset.filter(longitude__range=(min_lng, max_lng))
+            else:  # cruza el antimeridiano
+                queryset = queryset.filter(Q(longitude__gte=min_lng) | Q(longitude__lte=max_lng))
+
+        # ?near=lat,lng&radius_km=N -> prefiltro por bbox del círculo + distancia exacta (haversine)
+        ordering = ['-created_at']
+        near = parse_point(self.request.query_params.get('near'))
+        if near:
+            try:
+                radius = float(self.request.query_params.get('radius_km') or 5)
+            except ValueError:
+                radius = 5.0
+            radius = min(max(radius, 0.01), MAX_RADIUS_KM)
+            min_lat, max_lat, min_lng, max_lng = radius_bbox(near[0], near[1], radius)
+            queryset = (
+                queryset.filter(latitude__range=(min_lat, max_lat), longitude__range=(min_lng, max_lng))
+                .annotate(distance=distance_km_expression(*near))
+                .filter(distance__lte=radius)
+            )
+            ordering = ['distance', '-created_at']
+
         # Mantener relaciones y orden para eficiencia y consistencia
-        return queryset.select_related('created_by').prefetch_related('images', 'features').order_by('-created_at')
+        return self._shape_queryset(queryset).order_by(*ordering)
+
+    # Columnas que necesita cada campo calculado del serializer
+    SPARSE_FIELD_COLUMNS = {
+        'full_address': ('address', 'city', 'state', 'zip_code'),
+        'cover': (),
+        'images': (),
+        'features': (),
+    }
+    SPARSE_INCLUDES = ('images', 'features')
+    SPARSE_ACTIONS = ('list', 'retrieve', 'batch')
+
+    def _sparse_serializer_class(self):
+        return PropertyListItemSerializer if self.action == 'list' else PropertySerializer
+
+    def get_sparse_fields(self):
+        """
+        Fields to render for list/retrieve/batch from ?fields=a,b and ?include=images,features.
+        Returns None when neither is given (serializer defaults). Unknown names are ignored.
+        """
+        if hasattr(self, '_sparse_fields'):
+            return self._sparse_fields
+        self._sparse_fields = None
+        params = self.request.query_params
+        fields_param, include_param = params.get('fields'), params.get('include')
+        if self.action in self.SPARSE_ACTIONS and (fields_param or include_param):
+            serializer_class = self._sparse_serializer_class()
+            available = set(serializer_class.Meta.fields)
+            if fields_param:
+                requested = {f.strip() for f in fields_param.split(',')} & available
+            else:
+                requested = serializer_class.default_fields()
+            if include_param:
+                requested |= {f.strip() for f in include_param.split(',')} & set(self.SPARSE_INCLUDES) & available
+            self._sparse_fields = requested | {'id'}
+        return self._sparse_fields
+
+    def _shape_queryset(self, queryset):
+        """
+        list/retrieve/batch: SELECT sólo de las columnas que se serializan y prefetch sólo de las
+        relaciones pedidas. El resto de acciones (escrituras, permisos por dueño) usa el queryset completo.
+        """
+        if self.action not in self.SPARSE_ACTIONS:
+            return queryset.select_related('created_by').prefetch_related('images', 'features')
+
+        fields = self.get_sparse_fields() or self._sparse_serializer_class().default_fields()
+        model_fields = {f.name for f in Property._meta.concrete_fields}
+        columns = {'id'}
+        for name in fields:
+            columns.update(self.SPARSE_FIELD_COLUMNS.get(name, (name,) if name in model_fields else ()))
+        prefetch = []
+        if fields & {'images', 'cover'}:
+            prefetch.append('images')
+        if 'features' in fields:
+            prefetch.append('features')
+        return queryset.select_related(None).prefetch_related(None).only(*columns).prefetch_related(*prefetch)
+
+    def get_serializer(self, *args, **kwargs):
+        if self.action in ('retrieve', 'batch'):
+            kwargs.setdefault('fields', self.get_sparse_fields())
+        return super().get_serializer(*args, **kwargs)
 
     def list(self, request, *args, **kwargs):
         # DRF-standard list: operate on QuerySet, let DRF paginate/serialize
@@ -93,10 +218,14 @@ class PropertyViewSet(viewsets.ModelViewSet):
 
             page = self.paginate_queryset(queryset)
             if page is not None:
-                serializer = PropertyListItemSerializer(page, many=True, context=self.get_serializer_context())
+                serializer = PropertyListItemSerializer(
+                    page, many=True, fields=self.get_sparse_fields(), context=self.get_serializer_context()
+                )
                 return self.get_paginated_response(serializer.data)
 
-            serializer = PropertyListItemSerializer(queryset, many=True, context=self.get_serializer_context())
+            serializer = PropertyListItemSerializer(
+                queryset, many=True, fields=self.get_sparse_fields(), context=self.get_serializer_context()
+            )
             return Response(serializer.data)
         except Exception as e:
             logging.getLogger(__name__).exception("[properties.list] Unhandled error: %s", e)
@@ -129,6 +258,164 @@ class PropertyViewSet(viewsets.ModelViewSet):
             logging.getLogger(__name__).exception("[properties.create] Unhandled exception: %s", e)
             return Response({"detail": "Server error", "error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    MAX_BATCH_IDS = 50
+
+    @action(detail=False, methods=['get'])
+    def batch(self, request):
+        """
+        GET /api/properties/batch/?ids=3,1,2 -> {"results": [...]} en el orden pedido.
+        Una sola consulta filtrada + prefetches compartidos, con la misma visibilidad que el detalle;
+        los IDs inexistentes o no visibles devuelven {"id": N, "detail": "Not found."}.
+        Acepta también ?fields= / ?include=.
+        """
+        ids = []
+        for part in (request.query_params.get('ids') or '').split(','):
+            part = part.strip()
+            if not part:
+                continue
+            try:
+                ids.append(int(part))
+            except ValueError:
+                return Response({'ids': [f'Invalid id: {part}']}, status=status.HTTP_400_BAD_REQUEST)
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            return Response({'ids': ['This parameter is required.']}, status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > self.MAX_BATCH_IDS:
+            return Response(
+                {'ids': [f'At most {self.MAX_BATCH_IDS} ids per request.']},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        found = {obj.pk: obj for obj in self.get_queryset().filter(pk__in=ids)}
+        data = dict(zip(found, self.get_serializer(list(found.values()), many=True).data))
+        results = [data[pk] if pk in data else {'id': pk, 'detail': 'Not found.'} for pk in ids]
+        return Response({'results': results})
+
+    FACET_PARAMS = (
+        'search', 'zone', 'propertyType', 'property_type', 'adults', 'features', 'status',
+        'bbox', 'near', 'radius_km',
+    )
+
+    @staticmethod
+    def _facet(qs, name, key):
+        return (
+            qs.annotate(facet=Value(name, output_field=CharField()), key=key)
+            .values('facet', 'key')
+            .annotate(count=Count('id'))
+            .order_by()
+        )
+
+    @action(detail=False, methods=['get'])
+    def facets(self, request):
+        """
+        GET /api/properties/facets/?search=&zone=&propertyType=&adults=&features=
+        Counts per property_type, city (zona), bedroom bucket and feature for the current filters,
+        computed in one SQL statement (UNION ALL of grouped aggregates) and cached per catalog version.
+        """
+        params = {p: request.query_params.get(p) for p in self.FACET_PARAMS}
+        params['auth'] = request.user.is_authenticated
+        key = catalog_cache_key('facets', params)
+        data, version = catalog_cache_get(key)
+        if data is None:
+            # Lo que se cachea para todos sale del primario: una réplica atrasada lo dejaría viejo
+            with use_read_alias(None):
+                base = self.filter_queryset(self.get_queryset()).select_related(None).prefetch_related(None).order_by()
+                bedrooms = Case(
+                    When(bedrooms__gte=4, then=Value('4+')),
+                    default=Cast('bedrooms', CharField()),
+                    output_field=CharField(),
+                )
+                features = (
+                    PropertyFeature.objects.filter(property__in=base.values('pk'))
+                    .annotate(facet=Value('features', output_field=CharField()), key=F('feature__slug'))
+                    .values('facet', 'key')
+                    .annotate(count=Count('property_id'))
+                    .order_by()
+                )
+                rows = self._facet(base, 'property_type', Cast('property_type', CharField())).union(
+                    self._facet(base, 'city', Cast('city', CharField())),
+                    self._facet(base, 'bedrooms', bedrooms),
+                    features,
+                    all=True,
+                )
+                data = {'property_type': [], 'city': [], 'bedrooms': [], 'features': []}
+                for row in rows:
+                    data[row['facet']].append({'value': row['key'], 'count': row['count']})
+                for name, buckets in data.items():
+                    buckets.sort(key=(lambda b: b['value']) if name == 'bedrooms' else (lambda b: (-b['count'], b['value'])))
+                data['total'] = sum(b['count'] for b in data['property_type'])
+            catalog_cache_set(key, version, data)
+        return Response(data)
+
+    # Celdas de ~64px sobre tiles de 256px: 4 celdas por tile y por eje
+    CLUSTER_CELLS_PER_TILE = 4
+    # Tope de celdas por eje del bbox: aunque zoom y bbox no concuerden, la respuesta queda acotada
+    CLUSTER_MAX_CELLS_PER_AXIS = 64
+
+    @action(detail=False, methods=['get'])
+    def clusters(self, request):
+        """
+        GET /api/properties/clusters/?bbox=minLng,minLat,maxLng,maxLat&zoom=N
+        Groups published properties into a lat/lng grid whose cell size follows the map zoom.
+        Each cell returns count, centroid and min price (plus the id when it holds a single
+        property). Computed with one GROUP BY over FLOOR(coord / cell), so the payload depends
+        on the viewport, not on the catalog size. bbox is required (400 without a valid one) and
+        the cell never gets smaller than bbox / CLUSTER_MAX_CELLS_PER_AXIS. Other list filters
+        (propertyType, zone...) apply.
+        """
+        bbox = parse_bbox(request.query_params.get('bbox'))
+        if bbox is None:
+            return Response({'bbox': ['Required: minLng,minLat,maxLng,maxLat.']}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            zoom = min(max(int(request.query_params.get('zoom', 10)), 0), 22)
+        except ValueError:
+            zoom = 10
+        params = {p: request.query_params.get(p) for p in self.FACET_PARAMS}
+        params['zoom'] = zoom
+        key = catalog_cache_key('clusters', params)
+        data, version = catalog_cache_get(key)
+        if data is None:
+            # Primario: ver facets
+            with use_read_alias(None):
+                min_lng, min_lat, max_lng, max_lat = bbox
+                width = max_lng - min_lng if min_lng <= max_lng else 360 - (min_lng - max_lng)
+                extent = max(width, max_lat - min_lat)
+                cell = max(360.0 / (2 ** zoom * self.CLUSTER_CELLS_PER_TILE), extent / self.CLUSTER_MAX_CELLS_PER_AXIS)
+                qs = (
+                    self.filter_queryset(self.get_queryset())
+                    .filter(status='published', latitude__isnull=False, longitude__isnull=False)
+                    .select_related(None).prefetch_related(None).order_by()
+                )
+                rows = (
+                    qs.annotate(
+                        cell_y=Floor(Cast('latitude', FloatField()) / cell, output_field=IntegerField()),
+                        cell_x=Floor(Cast('longitude', FloatField()) / cell, output_field=IntegerField()),
+                    )
+                    .values('cell_y', 'cell_x')
+                    .annotate(
+                        count=Count('id'),
+                        lat=Avg(Cast('latitude', FloatField())),
+                        lng=Avg(Cast('longitude', FloatField())),
+                        min_price=Min('price'),
+                        rep_id=Min('id'),
+                    )
+                    .order_by('-count', 'cell_y', 'cell_x')
+                )
+                clusters = []
+                for r in rows:
+                    item = {
+                        'count': r['count'],
+                        'latitude': round(r['lat'], 6),
+                        'longitude': round(r['lng'], 6),
+                        'min_price': r['min_price'],
+                    }
+                    if r['count'] == 1:
+                        item['id'] = r['rep_id']
+                    clusters.append(item)
+                data = {'zoom': zoom, 'cell_size': cell, 'clusters': clusters}
+            catalog_cache_set(key, version, data)
+        return Response(data)
+
     @action(detail=True, methods=['post'])
     def upload_images(self, request, pk=None):
         property = self.get_object()
@@ -160,6 +447,7 @@ class PropertyViewSet(viewsets.ModelViewSet):
         try:
             image = property.images.get(id=image_id)
             image.delete()
+            bump_catalog_version()
             return Response(status=status.HTTP_204_NO_CONTENT)
         except PropertyImage.DoesNotExist:
             return Response(
@@ -217,92 +505,72 @@ class PropertyViewSet(viewsets.ModelViewSet):
         return context
 
 
-@api_view(['POST'])
+class PropertyGeocodingWriteViewSet(AsyncGenericViewSet, PropertyViewSet):
+    """
+    POST /api/properties/ and PUT/PATCH /api/properties/<id>/ on adrf's async dispatch: the Google
+    geocoding call is awaited (httpx) without holding a worker thread, then validation and the ORM
+    run in PropertyViewSet's sync path with the coordinates in context['geocoded']. Only mapped
+    for write requests under SERVER_MODE=asgi (config/urls_async_writes.py); reads never get here.
+    """
+
+    async def _ageocode_request(self, instance=None):
+        data = self.request.data
+        if not geocoding_enabled():
+            return
+        if instance is not None and not any(field in data for field in ADDRESS_FIELDS):
+            return
+        query = address_query(data, instance)
+        self.geocoded = await ageocode(query) if query else None
+
+    def get_object(self):
+        # Memoizado: update() lo usa para el geocoding y de nuevo en el path sync
+        if not hasattr(self, '_object'):
+            self._object = super().get_object()
+        return self._object
+
+    async def create(self, request, *args, **kwargs):
+        await self._ageocode_request()
+        return await sync_to_async(super().create)(request, *args, **kwargs)
+
+    async def update(self, request, *args, **kwargs):
+        if geocoding_enabled() and any(field in request.data for field in ADDRESS_FIELDS):
+            await self._ageocode_request(await sync_to_async(self.get_object)())
+        return await sync_to_async(super().update)(request, *args, **kwargs)
+
+    async def partial_update(self, request, *args, **kwargs):
+        kwargs['partial'] = True
+        return await self.update(request, *args, **kwargs)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if hasattr(self, 'geocoded'):
+            context['geocoded'] = self.geocoded
+        return context
+
+
+@async_api_view(['POST'])
 @permission_classes([IsAuthenticated])
-def presign_property_images(request):
+async def presign_property_images(request):
     """
     Body: { "files": [ {"name":"foto1.jpg","type":"image/jpeg"}, ... ] }
     """
-    s3 = boto3.client('s3', region_name=settings.AWS_S3_REGION_NAME)
     bucket = settings.AWS_STORAGE_BUCKET_NAME
-    out = []
+    uploads, params_list = [], []
     for f in request.data.get('files', []):
         ext = (f.get("name") or "").split(".")[-1].lower() or "jpg"
         key = f"properties/{uuid.uuid4()}.{ext}"
         content_type = f.get("type") or mimetypes.guess_type(f.get("name"))[0] or "application/octet-stream"
-        url = s3.generate_presigned_url(
-            ClientMethod='put_object',
-            Params={
-                'Bucket': bucket,
-                'Key': key,
-                'ContentType': content_type,
-                'ACL': 'public-read',
-            },
-            ExpiresIn=300,
-        )
-        out.append({"key": key, "uploadUrl": url, "contentType": content_type})
-    return Response({"uploads": out})
-
-
-@api_view(['POST'])
-@permission_classes([IsAuthenticated])
-def presign_upload(request):
-    """
-    POST /api/uploads/presign/
-    Body: { "property_id": 123, "filename": "foto.jpg", "content_type": "image/jpeg" }
-    Returns: { upload_url, s3_key, headers }
-    """
-    try:
-        prop_id = request.data.get('property_id')
-        filename = (request.data.get('filename') or '').strip()
-        content_type = (request.data.get('content_type') or '').strip()
-
-        # Validate inputs
-        try:
-            prop = Property.objects.get(pk=prop_id)
-        except Property.DoesNotExist:
-            return Response({"property_id": ["Invalid property."]}, status=status.HTTP_400_BAD_REQUEST)
-
-        if content_type not in ("image/jpeg", "image/png", "image/webp"):
-            return Response({"content_type": ["Unsupported type. Use image/jpeg, image/png or image/webp."]}, status=status.HTTP_400_BAD_REQUEST)
-
-        # Build S3 key: properties/<property_id>/foto-<uuid>.<ext>
-        ext = (filename.rsplit('.', 1)[-1] if '.' in filename else 'jpg').lower()
-        if ext not in ("jpg", "jpeg", "png", "webp"):
-            # Normalize extension to match content_type
-            ext = {"image/jpeg": "jpg", "image/png": "png", "image/webp": "webp"}[content_type]
-        
-        # Store originals in properties/original/ to trigger Lambda resize
-        s3_key = f"properties/original/{prop.id}/foto-{uuid.uuid4()}.{ext}"
-
-        s3 = boto3.client('s3', region_name=settings.AWS_S3_REGION_NAME)
-        params = {
-            'Bucket': settings.AWS_STORAGE_BUCKET_NAME,
-            'Key': s3_key,
+        params_list.append({
+            'Bucket': bucket,
+            'Key': key,
             'ContentType': content_type,
-            # No ACL here if bucket policy handles public access
-        }
-        upload_url = s3.generate_presigned_url(
-            ClientMethod='put_object',
-            Params=params,
-            ExpiresIn=300,
-        )
-
-        headers = {
-            'Content-Type': content_type,
-            'Cache-Control': 'public, max-age=31536000, immutable',
-        }
-        return Response({
-            'upload_url': upload_url,
-            's3_key': s3_key,
-            'headers': headers,
-        })
-    except Exception as e:
-        logging.getLogger(__name__).exception("[uploads.presign] Failed to presign", extra={
-            "property_id": request.data.get('property_id'),
-            "filename": request.data.get('filename'),
+            'ACL': 'public-read',
         })
-        return Response({"detail": "Failed to presign upload", "error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        uploads.append({"key": key, "contentType": content_type})
+    # Firma local con el cliente compartido; fuera del event loop
+    urls = await sync_to_async(presign_put_urls, thread_sensitive=False)(params_list)
+    out = [{"key": u["key"], "uploadUrl": url, "contentType": u["contentType"]} for u, url in zip(uploads, urls)]
+    return Response({"uploads": out})
 
 
 @api_view(['POST'])
@@ -314,13 +582,99 @@ def attach_property_images(request, pk):
     from django.shortcuts import get_object_or_404
     prop = get_object_or_404(Property, pk=pk, created_by=request.user)
     keys = request.data.get("keys", [])
-    domain = f"https://{settings.AWS_STORAGE_BUCKET_NAME}.s3.amazonaws.com"
-    imgs = [PropertyImage(property=prop, s3_key=k, url=f"{domain}/{k}") for k in keys]
+    imgs = [PropertyImage(property=prop, s3_key=k, url=public_url(k) or "") for k in keys]
     PropertyImage.objects.bulk_create(imgs)
+    bump_catalog_version()
     return Response({"added": len(imgs)}, status=status.HTTP_201_CREATED)
 
 
-class PropertyPricingView(APIView):
+class PropertyExportView(APIView):
+    """
+    GET /api/properties/export/?export=ndjson|csv[&include=images,features]
+
+    Admin-only full catalog dump. Rows come from flat values() over a server-side cursor
+    (iterator(chunk_size=...)); images/features are fetched per chunk with one query each,
+    so memory stays constant whatever the catalog size.
+    """
+    permission_classes = [IsAdminUser]
+    CHUNK_SIZE = 1000
+    FIELDS = [
+        'id', 'title', 'description', 'address', 'city', 'state', 'zip_code', 'property_type',
+        'bedrooms', 'bathrooms', 'square_feet', 'year_built', 'price', 'is_featured', 'status',
+        'created_by_id', 'created_at', 'updated_at', 'latitude', 'longitude',
+    ]
+    IMAGE_FIELDS = ['property_id', 'id', 's3_key', 'url', 'is_primary', 'order']
+
+    def _chunks(self, include):
+        rows = Property.objects.order_by('id').values(*self.FIELDS).iterator(chunk_size=self.CHUNK_SIZE)
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.CHUNK_SIZE:
+                yield self._attach(batch, include)
+                batch = []
+        if batch:
+            yield self._attach(batch, include)
+
+    def _attach(self, batch, include):
+        ids = [r['id'] for r in batch]
+        if 'images' in include:
+            images = {}
+            for img in (
+                PropertyImage.objects.filter(property_id__in=ids)
+                .order_by('property_id', 'order', 'id').values(*self.IMAGE_FIELDS)
+            ):
+                images.setdefault(img.pop('property_id'), []).append(img)
+            for r in batch:
+                r['images'] = images.get(r['id'], [])
+        if 'features' in include:
+            features = {}
+            for prop_id, name in (
+                PropertyFeature.objects.filter(property_id__in=ids)
+                .order_by('property_id', 'name').values_list('property_id', 'name')
+            ):
+                features.setdefault(prop_id, []).append(name)
+            for r in batch:
+                r['features'] = features.get(r['id'], [])
+        return batch
+
+    def _ndjson(self, include):
+        for batch in self._chunks(include):
+            yield ''.join(json.dumps(r, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n' for r in batch)
+
+    def _csv_rows(self, include):
+        for batch in self._chunks(include):
+            for r in batch:
+                row = [r[f] for f in self.FIELDS]
+                if 'images' in include:
+                    row.append('|'.join(i['url'] or i['s3_key'] for i in r['images']))
+                if 'features' in include:
+                    row.append('|'.join(r['features']))
+                yield row
+
+    def get(self, request):
+        include = {p.strip() for p in (request.query_params.get('include') or '').split(',') if p.strip()}
+        unknown = include - {'images', 'features'}
+        if unknown:
+            return Response({'include': [f'Unknown value(s): {", ".join(sorted(unknown))}']}, status=status.HTTP_400_BAD_REQUEST)
+
+        output = request.query_params.get('export', 'ndjson')
+        if output == 'csv':
+            header = self.FIELDS + [f for f in ('images', 'features') if f in include]
+            response = StreamingHttpResponse(csv_stream(header, self._csv_rows(include)), content_type='text/csv')
+            response['Content-Disposition'] = 'attachment; filename="properties.csv"'
+        elif output == 'ndjson':
+            response = StreamingHttpResponse(self._ndjson(include), content_type='application/x-ndjson')
+            response['Content-Disposition'] = 'attachment; filename="properties.ndjson"'
+        else:
+            return Response({'export': ['Use ndjson or csv.']}, status=status.HTTP_400_BAD_REQUEST)
+        response['Cache-Control'] = 'no-store'
+        return response
+
+
+class PropertyPricingView(ReplicaReadMixin, APIView):
+    authentication_classes = [ClaimsJWTAuthentication]
+
     def get(self, request, property_id):
         pricings = Pricing.objects.filter(property_id=property_id)
         serializer = PricingSerializer(pricings, many=True)
@@ -336,8 +690,142 @@ class PropertyPricingView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class PropertyMaintenanceView(APIView):
+class PropertyMaintenanceView(ReplicaReadMixin, APIView):
+    authentication_classes = [ClaimsJWTAuthentication]
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
     def get(self, request, property_id):
         maintenances = Maintenance.objects.filter(property_id=property_id)
         serializer = MaintenanceSerializer(maintenances, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        return Response(serializer.data)
+
+
+class _WindowSum(Func):
+    # SUM(...) usable inside OVER (...) on top of an aggregate: SUM(SUM(cost)) OVER (PARTITION BY ...)
+    function = 'SUM'
+    window_compatible = True
+
+
+class MaintenanceReportView(APIView):
+    """
+    GET /api/properties/maintenance/report/?start=YYYY-MM-DD&end=YYYY-MM-DD[&host=<user_id>][&export=csv]
+
+    Maintenance cost rollups across all properties of a host (the current user; staff may pass
+    ?host= or omit it for the whole portfolio). Totals per property, per month and per resolved
+    state are computed in SQL with GROUP BY, plus a running total per property via a window
+    function. ?export=csv streams the detailed rows without loading them in memory; the JSON
+    response carries at most MAX_JSON_ROWS of them (rows_truncated tells when there are more).
+    """
+    permission_classes = [IsAuthenticated]
+    MAX_JSON_ROWS = 500
+    CSV_HEADER = ['property_id', 'property_title', 'month', 'resolved', 'count', 'total_cost', 'cumulative_cost']
+
+    def _base_queryset(self, request):
+        qs = Maintenance.objects.all()
+        user = request.user
+        host = request.query_params.get('host')
+        if user.is_staff:
+            if host:
+                try:
+                    host_id = int(host)
+                except ValueError:
+                    raise serializers.ValidationError({'host': ['Must be a user id.']})
+                qs = qs.filter(property__created_by_id=host_id)
+        else:
+            qs = qs.filter(property__created_by=user)
+
+        for param, lookup in (('start', 'date__gte'), ('end', 'date__lte')):
+            raw = request.query_params.get(param)
+            if raw:
+                value = parse_date(raw)
+                if value is None:
+                    raise serializers.ValidationError({param: ['Invalid date. Use YYYY-MM-DD.']})
+                qs = qs.filter(**{lookup: value})
+        return qs.order_by()
+
+    def _detail_rows(self, qs):
+        return (
+            qs.annotate(month=TruncMonth('date'))
+            .values('property_id', 'property__title', 'month', 'resolved')
+            .annotate(count=Count('id'), total_cost=Sum('cost'))
+            .annotate(
+                cumulative_cost=Window(
+                    _WindowSum(Sum('cost'), output_field=DecimalField(max_digits=14, decimal_places=2)),
+                    partition_by=[F('property_id')],
+                    order_by=[F('month').asc(), F('resolved').asc()],
+                ),
+            )
+            .order_by('property_id', 'month', 'resolved')
+        )
+
+    def get(self, request):
+        try:
+            qs = self._base_queryset(request)
+        except serializers.ValidationError as ve:
+            return Response(ve.detail, status=status.HTTP_400_BAD_REQUEST)
+
+        rows = self._detail_rows(qs)
+        if request.query_params.get('export') == 'csv':
+            data = (
+                [r['property_id'], r['property__title'], r['month'].strftime('%Y-%m'), r['resolved'],
+                 r['count'], r['total_cost'] or 0, r['cumulative_cost'] or 0]
+                for r in rows.iterator(chunk_size=2000)
+            )
+            response = StreamingHttpResponse(csv_stream(self.CSV_HEADER, data), content_type='text/csv')
+            response['Content-Disposition'] = 'attachment; filename="maintenance-report.csv"'
+            return response
+
+        by_property = (
+            qs.values('property_id', 'property__title')
+            .annotate(
+                count=Count('id'),
+                total_cost=Sum('cost'),
+                unresolved_cost=Sum('cost', filter=Q(resolved=False)),
+            )
+            .order_by('-total_cost', 'property_id')
+        )
+        by_month = (
+            qs.annotate(month=TruncMonth('date'))
+            .values('month')
+            .annotate(count=Count('id'), total_cost=Sum('cost'))
+            .order_by('month')
+        )
+        totals = qs.aggregate(
+            count=Count('id'),
+            total_cost=Sum('cost'),
+            resolved_cost=Sum('cost', filter=Q(resolved=True)),
+            unresolved_cost=Sum('cost', filter=Q(resolved=False)),
+        )
+        # Un registro de más para saber si se cortó (el detalle completo va por ?export=csv)
+        rows = list(rows[:self.MAX_JSON_ROWS + 1])
+        rows_truncated = len(rows) > self.MAX_JSON_ROWS
+
+        return Response({
+            'totals': totals,
+            'by_property': [
+                {
+                    'property_id': r['property_id'],
+                    'property_title': r['property__title'],
+                    'count': r['count'],
+                    'total_cost': r['total_cost'],
+                    'unresolved_cost': r['unresolved_cost'],
+                }
+                for r in by_property
+            ],
+            'by_month': [
+                {'month': r['month'].strftime('%Y-%m'), 'count': r['count'], 'total_cost': r['total_cost']}
+                for r in by_month
+            ],
+            'rows': [
+                {
+                    'property_id': r['property_id'],
+                    'month': r['month'].strftime('%Y-%m'),
+                    'resolved': r['resolved'],
+                    'count': r['count'],
+                    'total_cost': r['total_cost'],
+                    'cumulative_cost': r['cumulative_cost'],
+                }
+                for r in rows[:self.MAX_JSON_ROWS]
+            ],
+            'rows_truncated': rows_truncated,
+        })
\ No newline at end of file
@@ -0,0 +1,63 @@
+from urllib.parse import parse_qs, urlparse
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from apps.properties.models import Property
+
+User = get_user_model()
+
+
+@pytest.fixture
+def owner_client(db, settings, monkeypatch):
+    monkeypatch.setenv('AWS_ACCESS_KEY_ID', 'AKIDEXAMPLE')
+    monkeypatch.setenv('AWS_SECRET_ACCESS_KEY', 'secret')
+    settings.AWS_STORAGE_BUCKET_NAME = 'bkt'
+    settings.AWS_S3_REGION_NAME = 'us-east-1'
+    user = User.objects.create_user(username='owner', password='p')
+    prop = Property.objects.create(
+        title='t', description='d', address='a', city='c', state='s', zip_code='z',
+        property_type='temporal', bedrooms=1, bathrooms=1, square_feet=10, price=10,
+        created_by=user,
+    )
+    client = APIClient()
+    client.force_authenticate(user)
+    return client, prop
+
+
+def test_presign_returns_signed_put_url(owner_client):
+    client, prop = owner_client
+    resp = client.post('/api/uploads/presign/', {
+        'property_id': prop.id, 'filename': 'foto.PNG', 'content_type': 'image/png',
+    }, format='json')
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data['s3_key'].startswith(f'properties/original/{prop.id}/foto-')
+    assert data['s3_key'].endswith('.png')
+    url = urlparse(data['upload_url'])
+    assert url.netloc == 'bkt.s3.amazonaws.com'
+    assert url.path == f"/{data['s3_key']}"
+    query = parse_qs(url.query)
+    assert query['X-Amz-Algorithm'] == ['AWS4-HMAC-SHA256']
+    assert query['X-Amz-Expires'] == ['300']
+    assert data['headers']['Content-Type'] == 'image/png'
+
+
+def test_presign_rejects_unsupported_type_and_unknown_property(owner_client):
+    client, prop = owner_client
+    resp = client.post('/api/uploads/presign/', {
+        'property_id': prop.id, 'filename': 'doc.pdf', 'content_type': 'application/pdf',
+    }, format='json')
+    assert resp.status_code == 400
+    assert 'content_type' in resp.json()
+
+    resp = client.post('/api/uploads/presign/', {
+        'property_id': prop.id + 1000, 'filename': 'a.jpg', 'content_type': 'image/jpeg',
+    }, format='json')
+    assert resp.status_code == 400
+    assert 'property_id' in resp.json()
+
+
+def test_presign_requires_authentication(db):
+    resp = APIClient().post('/api/uploads/presign/', {}, format='json')
+    assert resp.status_code == 401
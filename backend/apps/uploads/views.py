@@ -0,0 +1,73 @@
+import logging
+import uuid
+from adrf.views import APIView as AsyncAPIView
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from apps.properties.models import Property
+from core.aws import presign_put_urls
+
+logger = logging.getLogger(__name__)
+
+ALLOWED_CONTENT_TYPES = {"image/jpeg": "jpg", "image/png": "png", "image/webp": "webp"}
+
+
+class PresignUploadView(AsyncAPIView):
+    """
+    POST /api/uploads/presign/
+    Body: { "property_id": 123, "filename": "foto.jpg", "content_type": "image/jpeg" }
+    Returns: { upload_url, s3_key, headers }
+    """
+    permission_classes = [IsAuthenticated]
+
+    async def post(self, request):
+        try:
+            prop_id = request.data.get('property_id')
+            filename = (request.data.get('filename') or '').strip()
+            content_type = (request.data.get('content_type') or '').strip()
+
+            # Validate inputs
+            try:
+                prop = await Property.objects.only('id').aget(pk=prop_id)
+            except Property.DoesNotExist:
+                return Response({"property_id": ["Invalid property."]}, status=status.HTTP_400_BAD_REQUEST)
+
+            if content_type not in ALLOWED_CONTENT_TYPES:
+                return Response({"content_type": ["Unsupported type. Use image/jpeg, image/png or image/webp."]}, status=status.HTTP_400_BAD_REQUEST)
+
+            # Build S3 key: properties/original/<property_id>/foto-<uuid>.<ext>
+            ext = (filename.rsplit('.', 1)[-1] if '.' in filename else 'jpg').lower()
+            if ext not in ("jpg", "jpeg", "png", "webp"):
+                # Normalize extension to match content_type
+                ext = ALLOWED_CONTENT_TYPES[content_type]
+
+            # Store originals in properties/original/ to trigger Lambda resize
+            s3_key = f"properties/original/{prop.id}/foto-{uuid.uuid4()}.{ext}"
+
+            params = {
+                'Bucket': settings.AWS_STORAGE_BUCKET_NAME,
+                'Key': s3_key,
+                'ContentType': content_type,
+                # No ACL here if bucket policy handles public access
+            }
+            # Firma local con el cliente S3 compartido del proceso; fuera del event loop
+            [upload_url] = await sync_to_async(presign_put_urls, thread_sensitive=False)([params])
+
+            headers = {
+                'Content-Type': content_type,
+                'Cache-Control': 'public, max-age=31536000, immutable',
+            }
+            return Response({
+                'upload_url': upload_url,
+                's3_key': s3_key,
+                'headers': headers,
+            })
+        except Exception as e:
+            # 'filename' es un atributo reservado de LogRecord: no puede ir en `extra`
+            logger.exception("[uploads.presign] Failed to presign", extra={
+                "property_id": request.data.get('property_id'),
+                "upload_filename": request.data.get('filename'),
+            })
+            return Response({"detail": "Failed to presign upload", "error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
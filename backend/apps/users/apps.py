@@ -1,4 +1,7 @@
 from django.apps import AppConfig
 
 class UsersConfig(AppConfig):
-    name = 'apps.users'
\ No newline at end of file
+    name = 'apps.users'
+
+    def ready(self):
+        from . import signals  # noqa: F401
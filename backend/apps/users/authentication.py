@@ -0,0 +1,82 @@
+"""
+JWT authentication without a per-request user lookup for reads.
+
+Access tokens carry the user's role, is_staff and is_superuser (embedded at login and on refresh,
+see `embed_user_claims`). For safe methods `ClaimsJWTAuthentication` builds a `ClaimsUser` from
+those signed claims instead of loading the User row; writes, and tokens without the claims, go
+through the regular simplejwt lookup and get the full model instance.
+
+Revocation: every save/delete of a user stores a marker in the shared cache (settings.CACHES)
+for one access-token lifetime (`revoke_user_tokens`). Tokens issued before the marker stop taking
+the fast path and are checked against the database (inactive users are rejected there, changed
+privileges are read fresh) until they expire or are refreshed. The fast path needs a cache
+outside the database (Redis, `cache_is_external`): with a per-process cache the marker would only
+reach one worker, and with DatabaseCache the marker lookup is itself a query, so in both cases
+every request takes the regular user lookup.
+"""
+import time
+from django.core.cache import cache
+from django.utils.functional import cached_property
+from core.cache import cache_is_external
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+USER_CLAIMS = ('role', 'is_staff', 'is_superuser')
+
+
+def embed_user_claims(token, user):
+    for claim in USER_CLAIMS:
+        token[claim] = getattr(user, claim)
+    return token
+
+
+def _revoked_key(user_id):
+    return f'auth:revoked:{user_id}'
+
+
+def revoke_user_tokens(user_id):
+    """Tokens of this user issued up to now stop using the stateless path."""
+    timeout = int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds())
+    cache.set(_revoked_key(user_id), time.time(), timeout)
+
+
+def tokens_revoked(validated_token):
+    # iat tiene resolución de segundos: un token del mismo segundo cuenta como revocado (sólo
+    # significa una consulta a la DB)
+    revoked_at = cache.get(_revoked_key(validated_token[api_settings.USER_ID_CLAIM]))
+    return revoked_at is not None and validated_token.get('iat', 0) < revoked_at
+
+
+class ClaimsUser(TokenUser):
+    """Lightweight request.user built from token claims; no DB row behind it (read-only use)."""
+
+    @cached_property
+    def role(self):
+        return self.token.get('role', 'user')
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    Stateless user for GET/HEAD/OPTIONS when the token carries USER_CLAIMS and was not revoked;
+    full User instance otherwise. Use it on views whose reads only need id/role/is_staff.
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+
+        if request.method in SAFE_METHODS and cache_is_external() and self.has_user_claims(validated_token) \
+                and not tokens_revoked(validated_token):
+            return ClaimsUser(validated_token), validated_token
+        return self.get_user(validated_token), validated_token
+
+    @staticmethod
+    def has_user_claims(validated_token):
+        return api_settings.USER_ID_CLAIM in validated_token and all(c in validated_token for c in USER_CLAIMS)
@@ -1,6 +1,9 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from .authentication import embed_user_claims
 
 User = get_user_model()
 
@@ -11,11 +14,33 @@ class UserSerializer(serializers.ModelSerializer):
         read_only_fields = ('id', 'role')
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        # Claims que ClaimsJWTAuthentication usa para no leer el usuario en cada GET
+        return embed_user_claims(super().get_token(user), user)
+
     def validate(self, attrs):
         data = super().validate(attrs)
         data['user'] = UserSerializer(self.user).data
         return data
 
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    """Re-issues the access token with the user's current claims (and a fresh iat)."""
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        refresh = self.token_class(attrs['refresh'])
+        user = User.objects.filter(
+            **{api_settings.USER_ID_FIELD: refresh[api_settings.USER_ID_CLAIM]}, is_active=True,
+        ).first()
+        if user is None:
+            raise AuthenticationFailed('User not found or inactive', code='user_inactive')
+        access = refresh.access_token
+        # access_token copia el iat del refresh: sin esto seguiría siendo anterior a una revocación
+        access.set_iat()
+        data['access'] = str(embed_user_claims(access, user))
+        return data
+
 class RegisterSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True)
 
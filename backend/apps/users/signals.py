@@ -0,0 +1,15 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .authentication import revoke_user_tokens
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def revoke_stateless_tokens(sender, instance, created=False, update_fields=None, **kwargs):
+    # Cambios de rol/is_active/password: los tokens ya emitidos vuelven a validar contra la DB
+    if created or (update_fields and set(update_fields) <= {'last_login'}):
+        return
+    revoke_user_tokens(instance.pk)
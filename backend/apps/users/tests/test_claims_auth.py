@@ -0,0 +1,110 @@
+import time
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from apps.users import authentication
+from apps.users.authentication import ClaimsUser
+from apps.properties.models import Property
+
+User = get_user_model()
+
+
+@pytest.fixture
+def login(db):
+    cache.clear()
+    user = User.objects.create_user(email='staff@example.com', username='staff', password='p', is_staff=True)
+
+    def _login():
+        resp = APIClient().post('/api/users/login/', {'email': 'staff@example.com', 'password': 'p'}, format='json')
+        assert resp.status_code == 200
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {resp.json()['access']}")
+        return client, resp.json()['refresh']
+    return user, _login
+
+
+@pytest.fixture
+def external_cache(settings, monkeypatch):
+    # Redis no está en los tests: LocMem hace de cache externo (un solo proceso)
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+    monkeypatch.setattr(authentication, 'cache_is_external', lambda: True)
+
+
+def user_queries(ctx):
+    return [q['sql'] for q in ctx.captured_queries if 'users_user' in q['sql']]
+
+
+def test_reads_use_token_claims_without_any_query(login, external_cache):
+    user, _login = login
+    client, _ = _login()
+    with CaptureQueriesContext(connection) as ctx:
+        resp = client.get('/api/users/role/')
+    assert resp.status_code == 200
+    assert resp.json() == {'role': 'admin'}
+    assert ctx.captured_queries == []
+    assert isinstance(resp.wsgi_request.user, ClaimsUser)
+    assert resp.wsgi_request.user.pk == user.pk
+
+
+@pytest.mark.parametrize('backend', [
+    'django.core.cache.backends.db.DatabaseCache',
+    'django.core.cache.backends.locmem.LocMemCache',
+])
+def test_cache_in_db_or_per_process_disables_the_stateless_path(login, settings, backend):
+    user, _login = login
+    client, _ = _login()
+    # DatabaseCache: leer la marca ya es una query; LocMem: la marca sólo la vería un worker
+    settings.CACHES = {'default': {'BACKEND': backend, 'LOCATION': 'django_cache'}}
+    with CaptureQueriesContext(connection) as ctx:
+        resp = client.get('/api/users/role/')
+    assert resp.json() == {'role': 'admin'}
+    assert len(ctx.captured_queries) == 1 and user_queries(ctx)
+    assert isinstance(resp.wsgi_request.user, User)
+
+
+def test_writes_load_the_full_user(login):
+    user, _login = login
+    client, _ = _login()
+    resp = client.post('/api/properties/', {
+        'title': 't', 'description': 'd', 'address': 'a', 'city': 'c', 'state': 's', 'zip_code': 'z',
+        'property_type': 'temporal', 'bedrooms': 1, 'bathrooms': 1, 'square_feet': 10, 'price': 10,
+    }, format='json')
+    assert resp.status_code == 201, resp.content
+    assert isinstance(resp.wsgi_request.user, User)
+    assert Property.objects.get(pk=resp.json()['id']).created_by == user
+
+
+def test_user_change_revokes_stateless_path(login, external_cache):
+    user, _login = login
+    client, refresh = _login()
+    user.is_staff = False
+    user.save()
+
+    # El token viejo dice is_staff=True, pero ahora se valida contra la DB
+    with CaptureQueriesContext(connection) as ctx:
+        resp = client.get('/api/users/role/')
+    assert resp.json() == {'role': 'user'}
+    assert user_queries(ctx)
+
+    # El refresh emite un access token con los claims actuales, que vuelve al camino sin DB
+    # (iat tiene resolución de segundos: tiene que emitirse en un segundo posterior a la revocación)
+    time.sleep(1.05)
+    resp = APIClient().post('/api/users/token/refresh/', {'refresh': refresh}, format='json')
+    assert resp.status_code == 200
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {resp.json()['access']}")
+    with CaptureQueriesContext(connection) as ctx:
+        resp = client.get('/api/users/role/')
+    assert resp.json() == {'role': 'user'}
+    assert ctx.captured_queries == []
+
+
+def test_deactivated_user_is_rejected(login):
+    user, _login = login
+    client, refresh = _login()
+    user.is_active = False
+    user.save()
+    assert client.get('/api/users/role/').status_code == 401
+    assert APIClient().post('/api/users/token/refresh/', {'refresh': refresh}, format='json').status_code == 401
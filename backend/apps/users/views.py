@@ -1,9 +1,10 @@
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from django.contrib.auth import get_user_model
-from .serializers import UserSerializer, CustomTokenObtainPairSerializer, RegisterSerializer
+from .authentication import ClaimsJWTAuthentication
+from .serializers import UserSerializer, CustomTokenObtainPairSerializer, CustomTokenRefreshSerializer, RegisterSerializer
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 
@@ -12,6 +13,9 @@ User = get_user_model()
 class CustomTokenObtainPairView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
 
+class CustomTokenRefreshView(TokenRefreshView):
+    serializer_class = CustomTokenRefreshSerializer
+
 class UserViewSet(viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
@@ -49,6 +53,8 @@ class MeView(APIView):
         return Response(serializer.data)
 
 class UserRoleView(APIView):
+    # Sólo lee is_staff/is_superuser: salen de los claims del token, sin query
+    authentication_classes = [ClaimsJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
@@ -0,0 +1,10 @@
+import os
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+# Escrituras con geocoding en vistas async (settings.ASYNC_WRITES_URLCONF)
+os.environ.setdefault('SERVER_MODE', 'asgi')
+
+# Servir con: gunicorn config.asgi:application -k uvicorn.workers.UvicornWorker
+# (o SERVER_MODE=asgi en entrypoint.sh)
+application = get_asgi_application()
@@ -1,4 +1,5 @@
 import os
+import dj_database_url
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -39,21 +40,29 @@ INSTALLED_APPS = [
     'apps.bookings',
     'apps.uploads',
     'storages',
+    'core',
 ]
 
 MIDDLEWARE = [
+    # Primero: liveness sin tocar el resto del stack (ver core.health)
+    'core.middleware.HealthCheckMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
-    'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.ReadYourWritesMiddleware',
+    'core.middleware.AsyncWriteRoutesMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
+# SERVER_MODE=asgi (entrypoint.sh): POST/PUT/PATCH se resuelven antes contra este URLconf, donde
+# las escrituras con geocoding son vistas async (core.middleware.AsyncWriteRoutesMiddleware).
+# Con WSGI no se usa: una vista async ahí sólo sumaría un event loop por request.
+ASYNC_WRITES_URLCONF = 'config.urls_async_writes' if os.getenv('SERVER_MODE', 'wsgi') == 'asgi' else None
 
 TEMPLATES = [
     {
@@ -73,6 +82,21 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'config.wsgi.application'
 
+# --- Pool de conexiones (psycopg 3, OPTIONS["pool"]) ---
+# Un pool por proceso: cada worker de gunicorn abre el suyo la primera vez que usa la DB, así que
+# el total de conexiones a RDS es workers x DB_POOL_MAX_SIZE. max_size >= threads por worker:
+# gunicorn.conf.py exporta DB_POOL_MAX_SIZE = threads si no está definido (y si lo está, recorta threads).
+# Con pool CONN_MAX_AGE debe ser 0 (la conexión vuelve al pool al terminar el request) y
+# CONN_HEALTH_CHECKS hace que el pool verifique cada conexión antes de prestarla.
+DB_POOL_ENABLED = os.getenv('DB_POOL_ENABLED', 'true').lower() == 'true'
+DB_POOL_OPTIONS = {
+    'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+    'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '4')),
+    'timeout': float(os.getenv('DB_POOL_TIMEOUT', '10')),          # espera máx. por una conexión libre
+    'max_idle': float(os.getenv('DB_POOL_MAX_IDLE', '300')),       # cierra conexiones ociosas (> min_size)
+    'max_lifetime': float(os.getenv('DB_POOL_MAX_LIFETIME', '1800')),  # recicla conexiones viejas
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -81,9 +105,51 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD'),
         'HOST': os.getenv('DB_HOST', 'localhost'),
         'PORT': os.getenv('DB_PORT', '5432'),
+        'CONN_MAX_AGE': 0,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {'pool': DB_POOL_OPTIONS} if DB_POOL_ENABLED else {},
     }
 }
 
+# --- Cache compartido ---
+# Tiene que valer para todos los workers y tareas: versión del catálogo (facets/clusters),
+# read-your-writes de las réplicas y revocación de tokens. Redis si hay REDIS_URL; si no, la tabla
+# django_cache en la DB principal (la crea `manage.py release`). Nunca LocMem: es por proceso.
+REDIS_URL = os.getenv('REDIS_URL', '')
+if REDIS_URL:
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': REDIS_URL}}
+else:
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'django_cache'}}
+
+# --- Réplicas de lectura (core/db_router.py) ---
+# DATABASE_REPLICA_URLS="postgres://u:p@replica-1:5432/db?sslmode=require,postgres://..." -> alias
+# replica_1, replica_2... Las lecturas seguras de las vistas con ReplicaReadMixin van a una réplica;
+# un usuario que escribió lee del primario durante READ_YOUR_WRITES_SECONDS (la marca va en el
+# cache de arriba y exige REDIS_URL: en la tabla django_cache cada lectura de réplica pagaría una
+# query al primario; core.apps lo valida al arrancar). En tests las réplicas
+# apuntan a la DB de test de 'default' (TEST.MIRROR).
+DATABASE_REPLICAS = []
+for _i, _url in enumerate(filter(None, (u.strip() for u in os.getenv('DATABASE_REPLICA_URLS', '').split(','))), 1):
+    _replica = dj_database_url.parse(_url, conn_max_age=0 if DB_POOL_ENABLED else 60, conn_health_checks=True)
+    if DB_POOL_ENABLED and _replica['ENGINE'] == 'django.db.backends.postgresql':
+        _replica.setdefault('OPTIONS', {})['pool'] = DB_POOL_OPTIONS
+    _replica['TEST'] = {'MIRROR': 'default'}
+    DATABASES[f'replica_{_i}'] = _replica
+    DATABASE_REPLICAS.append(f'replica_{_i}')
+DATABASE_ROUTERS = ['core.db_router.ReplicaRouter']
+READ_YOUR_WRITES_SECONDS = int(os.getenv('READ_YOUR_WRITES_SECONDS', '5'))
+
+# Métricas internas (/internal/db/pool/, detalle de /ready): header X-Internal-Token; sin token, desactivadas
+INTERNAL_METRICS_TOKEN = os.getenv('INTERNAL_METRICS_TOKEN', '')
+
+# Dominio de los UID de eventos del feed iCal (estable: los channel managers deduplican por UID)
+ICAL_UID_DOMAIN = os.getenv('ICAL_UID_DOMAIN', 'bairengroup.com')
+
+# Readiness (/ready): probes de DB (y S3 si se activa) cacheados por proceso; ver core.health
+READINESS_CACHE_SECONDS = float(os.getenv('READINESS_CACHE_SECONDS', '5'))
+READINESS_CHECK_S3 = os.getenv('READINESS_CHECK_S3', 'false').lower() == 'true'
+HEALTH_LATENCY_WINDOW = int(os.getenv('HEALTH_LATENCY_WINDOW', '1024'))
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
@@ -110,10 +176,29 @@ if AWS_STORAGE_BUCKET_NAME:
     AWS_S3_SIGNATURE_VERSION = os.getenv('AWS_S3_SIGNATURE_VERSION', 's3v4')
     AWS_S3_FILE_OVERWRITE = False
     AWS_DEFAULT_ACL = None  # el backend controla ACL
-    AWS_S3_OBJECT_PARAMETERS = {"CacheControl": "public, max-age=31536000"}
+    # Las claves son únicas por subida (uuid / id): los objetos no cambian y pueden cachearse para siempre
+    AWS_S3_OBJECT_PARAMETERS = {"CacheControl": "public, max-age=31536000, immutable"}
     DEFAULT_FILE_STORAGE = 'core.storage_backends.PublicMediaS3Storage'
-    # Dominio público (sin CloudFront aún). Cambiar a CDN si se agrega.
-    MEDIA_URL = f"https://{AWS_STORAGE_BUCKET_NAME}.s3.amazonaws.com/"
+
+# Cliente S3 compartido por proceso (core/aws.py): pool de conexiones entre threads y reintentos
+AWS_S3_MAX_POOL_CONNECTIONS = int(os.getenv('AWS_S3_MAX_POOL_CONNECTIONS', '32'))
+AWS_RETRY_MODE = os.getenv('AWS_RETRY_MODE', 'standard')
+AWS_MAX_ATTEMPTS = int(os.getenv('AWS_MAX_ATTEMPTS', '3'))
+
+# --- MEDIA URLs (resolver único: apps/properties/media.py) ---
+# Host del CDN delante del bucket (ej: media.example.com). Vacío = URLs directas al bucket S3.
+MEDIA_CDN_HOST = os.getenv('MEDIA_CDN_HOST', '')
+# Token ?v= agregado a todas las URLs; cambiarlo invalida cachés de borde y navegador.
+MEDIA_URL_VERSION = os.getenv('MEDIA_URL_VERSION', '')
+# URLs firmadas para buckets/distribuciones privadas: '' (públicas), 's3' o 'cloudfront'
+MEDIA_URL_SIGNING = os.getenv('MEDIA_URL_SIGNING', '')
+MEDIA_SIGNED_URL_TTL = int(os.getenv('MEDIA_SIGNED_URL_TTL', '3600'))
+# Sólo para 'cloudfront' (requiere el paquete cryptography)
+MEDIA_CLOUDFRONT_KEY_ID = os.getenv('MEDIA_CLOUDFRONT_KEY_ID', '')
+MEDIA_CLOUDFRONT_PRIVATE_KEY = os.getenv('MEDIA_CLOUDFRONT_PRIVATE_KEY', '').replace('\\n', '\n')
+if AWS_STORAGE_BUCKET_NAME:
+    _media_host = MEDIA_CDN_HOST.rstrip('/') or f"https://{AWS_STORAGE_BUCKET_NAME}.s3.amazonaws.com"
+    MEDIA_URL = (_media_host if '://' in _media_host else f"https://{_media_host}") + '/'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -151,7 +236,7 @@ _csrf = os.getenv("CSRF_TRUSTED_ORIGINS", "")
 CSRF_TRUSTED_ORIGINS = [u.strip() for u in _csrf.split(",") if u.strip()]
 
 # Exempt health endpoints from HTTPS redirect (used by ALB health checks before TLS termination)
-SECURE_REDIRECT_EXEMPT = [r"^health/?$"]
+SECURE_REDIRECT_EXEMPT = [r"^health/?$", r"^ready/?$"]
 
 # Proxy support (so Django builds absolute URLs correctly behind ELB/ALB)
 
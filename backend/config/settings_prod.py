@@ -15,7 +15,7 @@ SECURE_BROWSER_XSS_FILTER = True
 SECURE_CONTENT_TYPE_NOSNIFF = True
 
 # Evitar 301/302 en health (HTTP / HTTPS)
-SECURE_REDIRECT_EXEMPT = [r"^health/?$"]
+SECURE_REDIRECT_EXEMPT = [r"^health/?$", r"^ready/?$"]
 
 # Hosts (public + API). Admin subdomain no longer exposed directly; ALB/EB internal host kept optional if needed.
 ALLOWED_HOSTS = os.getenv("ALLOWED_HOSTS", "").split(",") if os.getenv("ALLOWED_HOSTS") else [
@@ -37,14 +37,20 @@ CSRF_TRUSTED_ORIGINS = [
 USE_X_FORWARDED_HOST = True
 SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
 
-# DB (RDS) con SSL y keep-alive razonable
+# DB (RDS) con SSL. Con pool (DB_POOL_ENABLED, ver settings.py) las conexiones se reutilizan
+# desde el pool del worker; sin pool, keep-alive razonable.
 DATABASES = {
     "default": dj_database_url.config(
         env="DATABASE_URL",
-        conn_max_age=60,
+        conn_max_age=0 if DB_POOL_ENABLED else 60,
+        conn_health_checks=True,
         ssl_require=True,
-    )
+    ),
+    # Réplicas de lectura (DATABASE_REPLICA_URLS, ver settings.py)
+    **{alias: DATABASES[alias] for alias in DATABASE_REPLICAS},
 }
+if DB_POOL_ENABLED:
+    DATABASES["default"].setdefault("OPTIONS", {})["pool"] = DB_POOL_OPTIONS
 
 # Apps requeridas
 INSTALLED_APPS = list(INSTALLED_APPS)
@@ -52,23 +58,28 @@ for app in ["corsheaders", "rest_framework"]:
     if app not in INSTALLED_APPS:
         INSTALLED_APPS.append(app)
 
-# Middlewares (orden: Security -> WhiteNoise -> HealthNoSSLRedirect -> CORS -> resto)
-MIDDLEWARE = list(MIDDLEWARE)
+# Middlewares (orden: HealthCheck -> Security -> WhiteNoise -> CORS -> resto)
+# HealthCheck responde /health antes del redirect a HTTPS y de la validación de Host.
+MIDDLEWARE = [m for m in MIDDLEWARE if m != "core.middleware.HealthCheckMiddleware"]
+MIDDLEWARE.insert(0, "core.middleware.HealthCheckMiddleware")
 if "django.middleware.security.SecurityMiddleware" not in MIDDLEWARE:
-    MIDDLEWARE.insert(0, "django.middleware.security.SecurityMiddleware")
+    MIDDLEWARE.insert(1, "django.middleware.security.SecurityMiddleware")
 if "whitenoise.middleware.WhiteNoiseMiddleware" not in MIDDLEWARE:
     sec_idx = MIDDLEWARE.index("django.middleware.security.SecurityMiddleware")
     MIDDLEWARE.insert(sec_idx + 1, "whitenoise.middleware.WhiteNoiseMiddleware")
 wn_idx = MIDDLEWARE.index("whitenoise.middleware.WhiteNoiseMiddleware")
-if "core.middleware.HealthNoSSLRedirectMiddleware" not in MIDDLEWARE:
-    MIDDLEWARE.insert(wn_idx + 1, "core.middleware.HealthNoSSLRedirectMiddleware")
 if "corsheaders.middleware.CorsMiddleware" not in MIDDLEWARE:
-    MIDDLEWARE.insert(wn_idx + 2, "corsheaders.middleware.CorsMiddleware")
+    MIDDLEWARE.insert(wn_idx + 1, "corsheaders.middleware.CorsMiddleware")
 
 # Static
 STATIC_URL = "/static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"
-STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
+# Django 5.1 ya no lee STATICFILES_STORAGE: el storage va en STORAGES. El manifest se genera en el
+# build de la imagen (`manage.py release --skip-migrate`, ver Dockerfile), no al arrancar.
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"},
+}
 
 # CORS (frontends permitidos). Para modificar sin cambiar código, usar env var:
 # CORS_ALLOWED_ORIGINS="https://www.bairengroup.com,https://bairengroup.com"
@@ -4,7 +4,7 @@ from django.views.static import serve as static_serve
 from django.conf import settings
 from django.conf.urls.static import static
 
-from core.views import db_health
+from core.views import db_health, db_pool_stats, readiness
 from health import health
 from .views import home
 from apps.uploads.views import PresignUploadView
@@ -13,11 +13,15 @@ urlpatterns = [
     # Home / root
     path("", home, name="home"),
 
-    # Health & DB health
+    # Health & DB health. /health y /health/ los responde antes core.middleware.HealthCheckMiddleware;
+    # las rutas quedan por si el middleware no está en la cadena.
     path("health", health, name="health"),
     path("health/", health, name="health-slash"),
+    path("ready", readiness, name="readiness"),
+    path("ready/", readiness, name="readiness-slash"),
     path("db/health", db_health, name="db-health"),
     path("db/health/", db_health, name="db-health-slash"),
+    path("internal/db/pool/", db_pool_stats, name="db-pool-stats"),
 
     # Admin
     path("admin/", admin.site.urls),
@@ -0,0 +1,23 @@
+"""
+URLconf for write requests under SERVER_MODE=asgi (see core.middleware.AsyncWriteRoutesMiddleware).
+
+Django decides sync vs async per view, so the property list/detail URLs cannot serve sync reads
+and async writes from one URLconf. POST/PUT/PATCH resolve here first: the geocoding-dependent
+property writes map to the async viewset and everything else falls through to config.urls.
+"""
+from django.urls import path
+from apps.properties.views import PropertyGeocodingWriteViewSet
+from config.urls import urlpatterns as root_urlpatterns
+
+urlpatterns = [
+    path(
+        "api/properties/",
+        PropertyGeocodingWriteViewSet.as_view({"post": "create"}),
+        name="property-create-async",
+    ),
+    path(
+        "api/properties/<int:pk>/",
+        PropertyGeocodingWriteViewSet.as_view({"put": "update", "patch": "partial_update"}),
+        name="property-update-async",
+    ),
+] + root_urlpatterns
@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+class CoreConfig(AppConfig):
+    name = 'core'
+
+    def ready(self):
+        from .db_router import check_replica_settings
+        check_replica_settings()
@@ -0,0 +1,91 @@
+"""
+Process-wide boto3 S3 client.
+
+Creating a client is slow (endpoint resolution, JSON service models, credential chain) and the
+default boto3 session is not safe to share between threads while clients are being created.
+`s3_client()` builds one client per process under a lock and every S3 call site reuses it (boto3
+clients are thread-safe once created). Settings:
+
+  AWS_S3_REGION_NAME, AWS_S3_SIGNATURE_VERSION
+  AWS_S3_MAX_POOL_CONNECTIONS   connection pool shared by all threads of the process (default 32)
+  AWS_RETRY_MODE, AWS_MAX_ATTEMPTS   botocore retries (default 'standard', 3 attempts in total)
+
+The client is dropped in forked children (its pooled sockets belong to the parent) and when an
+AWS_* setting changes.
+"""
+import os
+import threading
+from django.conf import settings
+from django.core.signals import setting_changed
+
+_lock = threading.Lock()
+_client = None
+_session = None
+
+
+def s3_client_config():
+    """botocore Config for S3 (pool size, retries, signature version) from settings."""
+    from botocore.config import Config
+    return Config(
+        signature_version=getattr(settings, 'AWS_S3_SIGNATURE_VERSION', 's3v4'),
+        max_pool_connections=int(getattr(settings, 'AWS_S3_MAX_POOL_CONNECTIONS', 32)),
+        retries={
+            'mode': getattr(settings, 'AWS_RETRY_MODE', 'standard'),
+            # Intentos totales (incluye el primero), igual que la variable AWS_MAX_ATTEMPTS de boto
+            'total_max_attempts': int(getattr(settings, 'AWS_MAX_ATTEMPTS', 3)),
+        },
+    )
+
+
+def s3_client():
+    """Shared S3 client for this process (created on first use; boto3 is only imported here)."""
+    global _client, _session
+    client = _client
+    if client is not None:
+        return client
+    with _lock:
+        if _client is None:
+            import boto3
+            # Sesión propia: la sesión default de boto3 no es thread-safe al crear clientes
+            _session = boto3.session.Session()
+            _client = _session.client(
+                's3',
+                region_name=getattr(settings, 'AWS_S3_REGION_NAME', None),
+                config=s3_client_config(),
+            )
+        return _client
+
+
+def s3_credentials():
+    """Credentials object (static or refreshable) of the shared client's session, or None."""
+    s3_client()
+    session = _session
+    return session.get_credentials() if session is not None else None
+
+
+def presign_put_urls(params_list, expires_in=300):
+    """Presigned PUT URLs for a list of put_object params (local SigV4, see core.s3_presign)."""
+    from core.s3_presign import presign_urls
+    return presign_urls('put_object', params_list, expires_in)
+
+
+def reset_clients():
+    global _client, _session
+    with _lock:
+        _client = _session = None
+
+
+def _after_fork_in_child():
+    # El lock pudo quedar tomado por otro thread del padre en el momento del fork
+    global _lock, _client, _session
+    _lock = threading.Lock()
+    _client = _session = None
+
+
+def _on_setting_changed(setting, **kwargs):
+    if setting.startswith('AWS_'):
+        reset_clients()
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
+setting_changed.connect(_on_setting_changed)
@@ -0,0 +1,24 @@
+"""
+Shared cache checks.
+
+The catalog version, the read-your-writes marks of the replica router and the token revocation
+markers must be seen by every worker and instance. Per-process backends (LocMem, Dummy) break
+them silently, so code that depends on them asks `cache_is_shared` first. Code that reads the
+cache to *avoid* a database query (claims auth, replica routing) asks `cache_is_external`: with
+DatabaseCache the lookup is itself a query on the primary.
+"""
+from django.conf import settings
+
+PER_PROCESS_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+DATABASE_BACKEND = 'django.core.cache.backends.db.DatabaseCache'
+
+
+def cache_is_shared(alias='default'):
+    return settings.CACHES[alias]['BACKEND'] not in PER_PROCESS_BACKENDS
+
+
+def cache_is_external(alias='default'):
+    return cache_is_shared(alias) and settings.CACHES[alias]['BACKEND'] != DATABASE_BACKEND
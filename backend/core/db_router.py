@@ -0,0 +1,113 @@
+"""
+Read-replica routing.
+
+Reads go to the primary ('default') unless the current request opted in through
+ReplicaReadMixin, which picks a replica for safe requests. A user who wrote something in the
+last READ_YOUR_WRITES_SECONDS keeps reading from the primary (ReadYourWritesMiddleware records
+the writes), so replica lag never hides their own changes. Those marks are checked on every
+authenticated read, so they must live in a cache outside the database (Redis): with replicas
+configured, any other backend is refused at startup (check_replica_settings). Writes and
+migrations always use 'default'.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from core.cache import cache_is_external
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_read_alias = ContextVar('read_alias', default=None)
+
+
+def check_replica_settings():
+    # LocMem: la marca sólo la vería el worker que atendió la escritura. DatabaseCache: cada
+    # lectura "de réplica" pagaría antes una query al primario para leer la marca.
+    if getattr(settings, 'DATABASE_REPLICAS', []) and not cache_is_external():
+        raise ImproperlyConfigured(
+            'DATABASE_REPLICAS needs REDIS_URL: the read-your-writes marks are read on every '
+            f"request and cannot live in {settings.CACHES['default']['BACKEND']}."
+        )
+
+
+def _recent_write_key(user_id):
+    return f'db:recent_write:{user_id}'
+
+
+def mark_recent_write(user_id):
+    cache.set(_recent_write_key(user_id), 1, getattr(settings, 'READ_YOUR_WRITES_SECONDS', 5))
+
+
+def wrote_recently(user_id):
+    return cache.get(_recent_write_key(user_id)) is not None
+
+
+def _request_user_id(request):
+    # Antes de la autenticación de DRF: user id del access token (sin ir a la DB)
+    header = request.META.get('HTTP_AUTHORIZATION', '')
+    if not header.startswith('Bearer '):
+        return None
+    from rest_framework_simplejwt.exceptions import TokenError
+    from rest_framework_simplejwt.settings import api_settings
+    from rest_framework_simplejwt.tokens import AccessToken
+    try:
+        return AccessToken(header[len('Bearer '):]).get(api_settings.USER_ID_CLAIM)
+    except TokenError:
+        return None
+
+
+def read_alias_for(request):
+    """Replica alias for this request, or None to read from the primary."""
+    replicas = getattr(settings, 'DATABASE_REPLICAS', [])
+    if not replicas or request.method not in SAFE_METHODS:
+        return None
+    user_id = _request_user_id(request)
+    if user_id is not None and wrote_recently(user_id):
+        return None
+    return random.choice(replicas)
+
+
+@contextmanager
+def use_read_alias(alias):
+    token = _read_alias.set(alias)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Réplicas y primario tienen los mismos datos
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in getattr(settings, 'DATABASE_REPLICAS', []):
+            return False
+        return None
+
+
+class ReplicaReadMixin:
+    """
+    DRF views: safe requests read from a replica (see read_alias_for). The alias is bound around
+    the whole dispatch, sync or async (adrf), and always released, even if the view raises.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        alias = read_alias_for(request)
+        if getattr(self, 'view_is_async', False):
+            return self._async_dispatch_with_alias(alias, request, *args, **kwargs)
+        with use_read_alias(alias):
+            return super().dispatch(request, *args, **kwargs)
+
+    async def _async_dispatch_with_alias(self, alias, request, *args, **kwargs):
+        with use_read_alias(alias):
+            return await super().dispatch(request, *args, **kwargs)
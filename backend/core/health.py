@@ -0,0 +1,159 @@
+"""
+Health checks in two tiers.
+
+  liveness   /health   answered by HealthCheckMiddleware before any other middleware: no DB, no
+                       host validation, no SSL redirect. Only says the worker is serving requests.
+  readiness  /ready    dependency probes (DB `SELECT 1`, optionally S3 `HeadBucket`) whose result is
+                       cached per process for READINESS_CACHE_SECONDS, so frequent probes from the
+                       ALB/ECS do not open connections; plus DB pool saturation and the latency
+                       percentiles of the last requests served by this worker.
+
+Settings: READINESS_CACHE_SECONDS (default 5), READINESS_CHECK_S3 (default False),
+HEALTH_LATENCY_WINDOW (requests kept for the percentiles, default 1024).
+"""
+import os
+import threading
+import time
+from collections import deque
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import connections
+
+LIVENESS_PATHS = frozenset(('/health', '/health/'))
+
+
+class LatencyWindow:
+    """Last N request durations (ms) of this process; deque.append is atomic, no lock needed."""
+
+    def __init__(self, size):
+        self.samples = deque(maxlen=size)
+
+    def record(self, ms):
+        self.samples.append(ms)
+
+    def percentiles(self, points=(50, 95, 99)):
+        samples = sorted(self.samples)
+        if not samples:
+            return {'count': 0}
+        result = {'count': len(samples)}
+        for p in points:
+            # nearest-rank
+            result[f'p{p}'] = round(samples[max(int(len(samples) * p / 100 + 0.5) - 1, 0)], 1)
+        return result
+
+
+request_latencies = LatencyWindow(int(getattr(settings, 'HEALTH_LATENCY_WINDOW', 1024)))
+
+
+class CachedProbe:
+    """
+    Runs `check` at most once per READINESS_CACHE_SECONDS per process. While one thread probes,
+    the others get the previous result instead of piling onto the dependency.
+    """
+
+    def __init__(self, name, check):
+        self.name = name
+        self.check = check
+        self._lock = threading.Lock()
+        self._result = None
+        self._expires_at = 0.0
+
+    def cached(self):
+        """Last result while it is still fresh, else None; never probes nor blocks."""
+        if self._result is not None and time.monotonic() < self._expires_at:
+            return self._result
+        return None
+
+    def result(self):
+        cached = self.cached()
+        if cached is not None:
+            return cached
+        if not self._lock.acquire(blocking=self._result is None):
+            return self._result
+        try:
+            if self._result is None or time.monotonic() >= self._expires_at:
+                started = time.perf_counter()
+                try:
+                    self.check()
+                    result = {'ok': True}
+                except Exception as exc:
+                    result = {'ok': False, 'error': exc.__class__.__name__}
+                result['ms'] = round((time.perf_counter() - started) * 1000, 1)
+                result['checked_at'] = round(time.time(), 3)
+                self._result = result
+                self._expires_at = time.monotonic() + float(getattr(settings, 'READINESS_CACHE_SECONDS', 5))
+            return self._result
+        finally:
+            self._lock.release()
+
+    def reset(self):
+        self._lock = threading.Lock()
+        self._result = None
+        self._expires_at = 0.0
+
+
+def _check_db():
+    with connections['default'].cursor() as cur:
+        cur.execute("SELECT 1")
+
+
+def _check_s3():
+    from core.aws import s3_client
+    s3_client().head_bucket(Bucket=settings.AWS_STORAGE_BUCKET_NAME)
+
+
+db_probe = CachedProbe('db', _check_db)
+s3_probe = CachedProbe('s3', _check_s3)
+
+
+def pool_saturation():
+    """{alias: {...}} busy/max connections of each psycopg pool of this worker (None without pool)."""
+    result = {}
+    for alias in connections:
+        pool = getattr(connections[alias], 'pool', None)
+        if pool is None:
+            result[alias] = None
+            continue
+        stats = pool.get_stats()
+        size = stats.get('pool_size', 0)
+        busy = size - stats.get('pool_available', 0)
+        result[alias] = {
+            'busy': busy,
+            'size': size,
+            'max_size': pool.max_size,
+            'saturation': round(busy / pool.max_size, 2) if pool.max_size else None,
+            'requests_waiting': stats.get('requests_waiting', 0),
+        }
+    return result
+
+
+def readiness():
+    """(ready, payload) for /ready."""
+    checks = {'db': db_probe.result()}
+    if getattr(settings, 'READINESS_CHECK_S3', False) and getattr(settings, 'AWS_STORAGE_BUCKET_NAME', None):
+        checks['s3'] = s3_probe.result()
+    ready = all(check['ok'] for check in checks.values())
+    return ready, {
+        'status': 'ready' if ready else 'unavailable',
+        'pid': os.getpid(),
+        'checks': checks,
+        'db_pool': pool_saturation(),
+        'latency_ms': request_latencies.percentiles(),
+    }
+
+
+def reset():
+    global request_latencies
+    db_probe.reset()
+    s3_probe.reset()
+    request_latencies = LatencyWindow(int(getattr(settings, 'HEALTH_LATENCY_WINDOW', 1024)))
+
+
+def _on_setting_changed(setting, **kwargs):
+    if setting.startswith('READINESS_') or setting == 'HEALTH_LATENCY_WINDOW':
+        reset()
+
+
+# Resultados y latencias del master no valen para los workers
+os.register_at_fork(after_in_child=reset)
+setting_changed.connect(_on_setting_changed)
@@ -0,0 +1,50 @@
+import os
+import time
+import uuid
+from django.core.management.base import BaseCommand
+from core import aws, s3_presign
+
+
+class Command(BaseCommand):
+    help = ("Benchmark presigned PUT URLs: botocore generate_presigned_url vs the local SigV4 "
+            "presigner (per URL and batched). No network calls; dummy credentials unless "
+            "--real-credentials.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--urls", type=int, default=10000, help="URLs per run (default: 10000)")
+        parser.add_argument("--bucket", default="bench-bucket")
+        parser.add_argument("--real-credentials", action="store_true", default=False,
+                            help="Use the normal credential chain instead of dummy static keys")
+
+    def handle(self, *args, **options):
+        if not options["real_credentials"]:
+            os.environ["AWS_ACCESS_KEY_ID"] = "AKIDBENCHMARK"
+            os.environ["AWS_SECRET_ACCESS_KEY"] = "benchmark-secret"
+            os.environ.pop("AWS_SESSION_TOKEN", None)
+        aws.reset_clients()
+        s3_presign.reset()
+
+        params_list = [
+            {"Bucket": options["bucket"], "Key": f"properties/original/1/foto-{uuid.uuid4()}.jpg",
+             "ContentType": "image/jpeg"}
+            for _ in range(options["urls"])
+        ]
+        client = aws.s3_client()
+        s3_presign.presign_urls("put_object", params_list[:1], 300)   # calentar perfil y credenciales
+
+        runs = [
+            ("botocore", lambda: [client.generate_presigned_url("put_object", Params=p, ExpiresIn=300)
+                                  for p in params_list]),
+            ("local, per URL", lambda: [s3_presign.presign_url("put_object", p, 300) for p in params_list]),
+            ("local, batch", lambda: s3_presign.presign_urls("put_object", params_list, 300)),
+        ]
+        baseline = None
+        for label, run in runs:
+            started = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - started
+            baseline = baseline or elapsed
+            self.stdout.write(
+                f"[bench_presign] {label:<15} {len(params_list)} URLs in {elapsed * 1000:8.1f} ms "
+                f"({elapsed / len(params_list) * 1e6:6.1f} us/URL, x{baseline / elapsed:.1f})"
+            )
@@ -0,0 +1,58 @@
+import time
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+from core.release import pending_migrations, static_current, write_static_fingerprint
+
+
+class Command(BaseCommand):
+    help = ("One-shot release step: apply migrations and collect static files. Run once per deploy "
+            "(or at image build with --skip-migrate), not on every container boot.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--check", action="store_true", default=False,
+                            help="Fast path: skip each step that is already current "
+                                 "(no unapplied migrations / static fingerprint unchanged)")
+        parser.add_argument("--skip-migrate", action="store_true", default=False,
+                            help="Do not touch the database (e.g. collectstatic during docker build)")
+        parser.add_argument("--skip-static", action="store_true", default=False,
+                            help="Do not run collectstatic")
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS,
+                            help="Database to migrate (default: default)")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        child_verbosity = max(options["verbosity"] - 1, 0)
+
+        if not options["skip_migrate"]:
+            step = time.perf_counter()
+            pending = pending_migrations(options["database"]) if options["check"] else None
+            if pending == []:
+                self._report("migrate", "up to date, skipped", step)
+            else:
+                call_command("migrate", interactive=False, database=options["database"],
+                             verbosity=child_verbosity)
+                detail = f"applied {len(pending)} migrations" if pending else "done"
+                self._report("migrate", detail, step)
+            if settings.CACHES["default"]["BACKEND"].endswith("DatabaseCache"):
+                # Idempotente: sólo crea la tabla del cache compartido si falta
+                step = time.perf_counter()
+                call_command("createcachetable", database=options["database"], verbosity=child_verbosity)
+                self._report("createcachetable", "done", step)
+
+        if not options["skip_static"]:
+            step = time.perf_counter()
+            if options["check"] and static_current():
+                self._report("collectstatic", "manifest current, skipped", step)
+            else:
+                call_command("collectstatic", interactive=False, verbosity=child_verbosity)
+                write_static_fingerprint()
+                self._report("collectstatic", "done", step)
+
+        self._report("total", "", started)
+
+    def _report(self, phase, detail, since):
+        elapsed_ms = (time.perf_counter() - since) * 1000
+        label = f"{phase}: {detail}" if detail else phase
+        self.stdout.write(f"[release] {label} ({elapsed_ms:.0f} ms)")
@@ -1,21 +1,86 @@
+import time
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
 from django.conf import settings
-from django.http import HttpResponse, HttpResponsePermanentRedirect
+from django.http import HttpResponse
+from core import health
+from core.db_router import mark_recent_write
 
-class HealthNoSSLRedirectMiddleware:
+class HealthCheckMiddleware:
     """
-    Evita que /health y /health/ terminen en 301/302 cuando SECURE_SSL_REDIRECT=True.
-    Debe ubicarse después de WhiteNoise y antes del resto de middlewares de vista.
+    Primer middleware de la cadena. Responde la liveness (/health, /health/) sin pasar por el resto
+    del stack: sin validación de Host (el ALB usa la IP del target), sin redirect a HTTPS, sin
+    sesión ni CORS. Para el resto de los requests mide la duración total y la registra en
+    core.health.request_latencies (percentiles en /ready).
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if request.path_info in health.LIVENESS_PATHS:
+            return _liveness_response()
+        started = time.perf_counter()
+        response = self.get_response(request)
+        health.request_latencies.record((time.perf_counter() - started) * 1000)
+        return response
+
+    async def __acall__(self, request):
+        if request.path_info in health.LIVENESS_PATHS:
+            return _liveness_response()
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        health.request_latencies.record((time.perf_counter() - started) * 1000)
+        return response
+
+
+def _liveness_response():
+    return HttpResponse(b'{"status": "ok"}', content_type="application/json")
+
+
+class ReadYourWritesMiddleware:
+    """
+    Registra las escrituras exitosas (POST/PUT/PATCH/DELETE < 400) de usuarios autenticados para
+    que sus lecturas de los próximos READ_YOUR_WRITES_SECONDS vayan al primario y no a una réplica
+    (ver core.db_router). Debe ir después de AuthenticationMiddleware.
     """
     def __init__(self, get_response):
         self.get_response = get_response
-        self.exempt_paths = {"/health", "/health/"}
 
     def __call__(self, request):
         response = self.get_response(request)
         if (
-            isinstance(response, HttpResponsePermanentRedirect)
-            and request.path in self.exempt_paths
-            and getattr(settings, "SECURE_SSL_REDIRECT", False)
+            getattr(settings, "DATABASE_REPLICAS", None)
+            and request.method not in ("GET", "HEAD", "OPTIONS")
+            and response.status_code < 400
         ):
-            return HttpResponse("ok", content_type="text/plain", status=200)
+            # DRF deja el usuario autenticado (JWT) en el HttpRequest subyacente
+            user = getattr(request, "user", None)
+            if user is not None and user.is_authenticated:
+                mark_recent_write(user.pk)
         return response
+
+
+class AsyncWriteRoutesMiddleware:
+    """
+    Con ASYNC_WRITES_URLCONF definido (SERVER_MODE=asgi), los POST/PUT/PATCH se resuelven contra
+    ese URLconf: las escrituras que esperan al geocoding van a vistas async y las lecturas siguen
+    en vistas sync, sin saltos async_to_sync/sync_to_async (Django decide sync/async por vista,
+    no por método). Las rutas que no están ahí caen al ROOT_URLCONF.
+    """
+    WRITE_METHODS = ("POST", "PUT", "PATCH")
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        urlconf = getattr(settings, "ASYNC_WRITES_URLCONF", None)
+        if urlconf and request.method in self.WRITE_METHODS:
+            request.urlconf = urlconf
+        return self.get_response(request)
@@ -0,0 +1,60 @@
+"""
+Release checks: is there anything for the one-shot release step to do?
+
+`pending_migrations` lists unapplied migrations; the static fingerprint (path, size, mtime of
+every file the staticfiles finders see, plus the storage and STATIC_URL) is written next to the
+collected files so a later `release --check` can skip collectstatic when nothing changed.
+"""
+import hashlib
+import os
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+FINGERPRINT_NAME = '.release-fingerprint'
+_IGNORE_PATTERNS = ['CVS', '.*', '*~']
+
+
+def pending_migrations(database=DEFAULT_DB_ALIAS):
+    """Unapplied (migration, backwards) pairs for `database`, in the order migrate would run them."""
+    from django.db.migrations.executor import MigrationExecutor
+    executor = MigrationExecutor(connections[database])
+    return executor.migration_plan(executor.loader.graph.leaf_nodes())
+
+
+def static_fingerprint():
+    from django.contrib.staticfiles.finders import get_finders
+    entries = []
+    for finder in get_finders():
+        for path, storage in finder.list(_IGNORE_PATTERNS):
+            stat = os.stat(storage.path(path))
+            prefix = getattr(storage, 'prefix', None) or ''
+            entries.append(f"{prefix}/{path}\0{stat.st_size}\0{stat.st_mtime_ns}")
+    digest = hashlib.sha256()
+    digest.update(f"{settings.STORAGES['staticfiles']['BACKEND']}\0{settings.STATIC_URL}\n".encode())
+    for entry in sorted(entries):
+        digest.update(entry.encode())
+        digest.update(b'\n')
+    return digest.hexdigest()
+
+
+def _fingerprint_path():
+    return os.path.join(settings.STATIC_ROOT, FINGERPRINT_NAME)
+
+
+def static_current():
+    """True when STATIC_ROOT was collected from the current sources (and has its manifest, if any)."""
+    from django.contrib.staticfiles.storage import staticfiles_storage
+    try:
+        with open(_fingerprint_path()) as fh:
+            recorded = fh.read().strip()
+    except OSError:
+        return False
+    manifest = getattr(staticfiles_storage, 'manifest_name', None)
+    if manifest and not os.path.exists(os.path.join(settings.STATIC_ROOT, manifest)):
+        return False
+    return recorded == static_fingerprint()
+
+
+def write_static_fingerprint():
+    with open(_fingerprint_path(), 'w') as fh:
+        fh.write(static_fingerprint() + '\n')
@@ -0,0 +1,195 @@
+"""
+Local SigV4 presigner for S3 (query-string auth).
+
+A presigned URL is pure computation: canonical request -> string to sign -> HMAC with a key
+derived from the secret, the day and the region. botocore runs its whole request pipeline (and
+the key derivation) for every URL; here:
+
+  - credentials are frozen once and read again shortly before they expire (refreshable role
+    credentials on ECS/EC2), never resolved per request;
+  - the signing key is cached per (secret, day, region);
+  - `presign_urls` signs a whole batch with a single timestamp/credentials/key lookup.
+
+Host and signing region are taken once per client from a botocore-generated probe URL, so the
+output is byte-for-byte what `generate_presigned_url` returns (core/tests/test_s3_presign.py).
+Anything this signer does not cover (other operations or parameters, bucket names that need
+path-style addressing, non-SigV4 configuration) falls back to the shared client.
+"""
+import hashlib
+import hmac
+import math
+import os
+import re
+import threading
+import time
+from functools import lru_cache
+from typing import NamedTuple
+from urllib.parse import parse_qs, quote, urlsplit
+from django.core.signals import setting_changed
+from core.aws import s3_client, s3_credentials
+
+ALGORITHM = 'AWS4-HMAC-SHA256'
+UNSIGNED_PAYLOAD = 'UNSIGNED-PAYLOAD'
+# Volver a leer la credencial 15 min antes de que venza (la ventana en la que botocore la renueva)
+CREDENTIAL_REFRESH_MARGIN = 15 * 60
+_METHODS = {'put_object': 'PUT', 'get_object': 'GET'}
+# Parámetros de la operación que viajan como headers firmados
+_HEADER_PARAMS = {
+    'ContentType': 'content-type',
+    'ACL': 'x-amz-acl',
+    'CacheControl': 'cache-control',
+    'ContentDisposition': 'content-disposition',
+}
+_LOCAL_PARAMS = frozenset(('Bucket', 'Key', *_HEADER_PARAMS))
+_VIRTUAL_HOST_BUCKET = re.compile(r'^[a-z0-9][a-z0-9-]{1,61}[a-z0-9]$')
+_PROBE_BUCKET = 'presign-probe'
+
+
+class _Profile(NamedTuple):
+    scheme: str
+    host_suffix: str    # '.s3.amazonaws.com' -> <bucket>.s3.amazonaws.com
+    region: str
+
+
+class _CredentialCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._frozen = None
+        self._refresh_at = 0.0
+
+    def get(self):
+        frozen, now = self._frozen, time.time()
+        if frozen is not None and now < self._refresh_at:
+            return frozen
+        with self._lock:
+            if self._frozen is None or time.time() >= self._refresh_at:
+                source = s3_credentials()
+                if source is None:
+                    from botocore.exceptions import NoCredentialsError
+                    raise NoCredentialsError()
+                # Con RefreshableCredentials esto dispara la renovación si está por vencer
+                self._frozen = source.get_frozen_credentials()
+                self._refresh_at = _refresh_deadline(source, time.time())
+            return self._frozen
+
+
+def _refresh_deadline(credentials, now):
+    expiry = getattr(credentials, '_expiry_time', None)  # sólo RefreshableCredentials
+    if expiry is None:
+        return math.inf
+    remaining = expiry.timestamp() - now
+    return now + max(remaining - CREDENTIAL_REFRESH_MARGIN, remaining / 2, 0)
+
+
+_credentials = _CredentialCache()
+
+
+def _hmac(key, msg):
+    return hmac.new(key, msg.encode('utf-8'), hashlib.sha256).digest()
+
+
+@lru_cache(maxsize=32)
+def _signing_key(secret_key, datestamp, region):
+    k_date = _hmac(f"AWS4{secret_key}".encode('utf-8'), datestamp)
+    return _hmac(_hmac(_hmac(k_date, region), 's3'), 'aws4_request')
+
+
+@lru_cache(maxsize=4)
+def _profile(client):
+    """Host/region botocore uses for presigned URLs with this client, or None to always fall back."""
+    url = client.generate_presigned_url('get_object', Params={'Bucket': _PROBE_BUCKET, 'Key': 'k'}, ExpiresIn=60)
+    parts = urlsplit(url)
+    query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+    if query.get('X-Amz-Algorithm') != ALGORITHM or query.get('X-Amz-SignedHeaders') != 'host':
+        return None
+    if not parts.netloc.startswith(_PROBE_BUCKET + '.') or parts.path != '/k':
+        return None
+    scope = query['X-Amz-Credential'].split('/')
+    return _Profile(parts.scheme, parts.netloc[len(_PROBE_BUCKET):], scope[2])
+
+
+def _signable(params):
+    if not params.keys() <= _LOCAL_PARAMS or not params.get('Key'):
+        return False
+    if not _VIRTUAL_HOST_BUCKET.match(params.get('Bucket') or ''):
+        return False
+    return all(params[p] for p in _HEADER_PARAMS if p in params)
+
+
+def _sign(profile, credentials, amz_date, signing_key, method, params, expires_in):
+    host = params['Bucket'] + profile.host_suffix
+    path = '/' + quote(params['Key'], safe='/~')
+    headers = sorted(
+        [('host', host)]
+        + [(header, ' '.join(str(params[param]).split())) for param, header in _HEADER_PARAMS.items() if param in params]
+    )
+    signed_headers = ';'.join(name for name, _ in headers)
+    scope = f"{amz_date[:8]}/{profile.region}/s3/aws4_request"
+
+    auth = [
+        ('X-Amz-Algorithm', ALGORITHM),
+        ('X-Amz-Credential', f"{credentials.access_key}/{scope}"),
+        ('X-Amz-Date', amz_date),
+        ('X-Amz-Expires', str(expires_in)),
+        ('X-Amz-SignedHeaders', signed_headers),
+    ]
+    if credentials.token is not None:
+        auth.append(('X-Amz-Security-Token', credentials.token))
+    encoded = [(name, quote(value, safe='-_.~')) for name, value in auth]
+    query = '&'.join(f"{name}={value}" for name, value in encoded)
+
+    canonical_request = '\n'.join((
+        method,
+        path,
+        '&'.join(f"{name}={value}" for name, value in sorted(encoded)),
+        ''.join(f"{name}:{value}\n" for name, value in headers),
+        signed_headers,
+        UNSIGNED_PAYLOAD,
+    ))
+    string_to_sign = '\n'.join((
+        ALGORITHM, amz_date, scope, hashlib.sha256(canonical_request.encode('utf-8')).hexdigest(),
+    ))
+    signature = hmac.new(signing_key, string_to_sign.encode('utf-8'), hashlib.sha256).hexdigest()
+    return f"{profile.scheme}://{host}{path}?{query}&X-Amz-Signature={signature}"
+
+
+def presign_urls(client_method, params_list, expires_in=3600, now=None):
+    """
+    Presigned URLs for a batch of `client_method` ('put_object' | 'get_object') params, in order.
+    Same contract as client.generate_presigned_url; `now` (epoch seconds) is only for tests.
+    """
+    client = s3_client()
+    expires_in = int(expires_in)
+    method = _METHODS.get(client_method)
+    profile = _profile(client) if method else None
+    if profile is not None:
+        credentials = _credentials.get()
+        amz_date = time.strftime('%Y%m%dT%H%M%SZ', time.gmtime(time.time() if now is None else now))
+        signing_key = _signing_key(credentials.secret_key, amz_date[:8], profile.region)
+
+    urls = []
+    for params in params_list:
+        if profile is not None and _signable(params):
+            urls.append(_sign(profile, credentials, amz_date, signing_key, method, params, expires_in))
+        else:
+            urls.append(client.generate_presigned_url(client_method, Params=params, ExpiresIn=expires_in))
+    return urls
+
+
+def presign_url(client_method, params, expires_in=3600, now=None):
+    return presign_urls(client_method, [params], expires_in, now)[0]
+
+
+def reset():
+    global _credentials
+    _credentials = _CredentialCache()
+    _profile.cache_clear()
+
+
+def _on_setting_changed(setting, **kwargs):
+    if setting.startswith('AWS_'):
+        reset()
+
+
+os.register_at_fork(after_in_child=reset)
+setting_changed.connect(_on_setting_changed)
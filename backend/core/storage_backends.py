@@ -1,21 +1,23 @@
-from django.conf import settings
 from storages.backends.s3boto3 import S3Boto3Storage
+from storages.utils import clean_name
 
 
 class PublicMediaS3Storage(S3Boto3Storage):
     """S3 storage for public media files.
 
-    Uses bucket ACL/object ACL public-read (served directly via S3 URL).
+    Uses bucket ACL/object ACL public-read. URLs come from the media resolver
+    (apps.properties.media), so they follow MEDIA_CDN_HOST / MEDIA_URL_VERSION / MEDIA_URL_SIGNING.
     No overwrite to preserve original uploads; allows version-like behavior by changing filename.
     """
     default_acl = 'public-read'
     file_overwrite = False
-    custom_domain = f"{getattr(settings, 'AWS_STORAGE_BUCKET_NAME', '')}.s3.amazonaws.com"
+
+    def get_default_settings(self):
+        # Mismo pool de conexiones / reintentos / firma que el cliente compartido (core.aws);
+        # el storage mantiene sus propias conexiones (resource por thread).
+        from core.aws import s3_client_config
+        return {**super().get_default_settings(), 'client_config': s3_client_config()}
 
     def url(self, name, parameters=None, expire=None, http_method=None):  # type: ignore[override]
-        # Ensure we return a clean HTTPS URL without query params (public objects)
-        base = super().url(name, parameters=parameters, expire=expire, http_method=http_method)
-        # boto may return with params if signing forced; keep simplest form
-        if '?' in base:
-            base = base.split('?', 1)[0]
-        return base
\ No newline at end of file
+        from apps.properties.media import media_url
+        return media_url(self._normalize_name(clean_name(name)))
@@ -0,0 +1,38 @@
+import threading
+from django.test.utils import override_settings
+from core import aws
+
+
+def test_s3_client_is_shared_across_threads():
+    aws.reset_clients()
+    clients, barrier = [], threading.Barrier(8)
+
+    def worker():
+        barrier.wait()
+        clients.append(aws.s3_client())
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(clients) == 8
+    assert len({id(c) for c in clients}) == 1
+
+
+def test_s3_client_config_from_settings():
+    with override_settings(AWS_S3_REGION_NAME='sa-east-1', AWS_S3_MAX_POOL_CONNECTIONS=7,
+                           AWS_RETRY_MODE='adaptive', AWS_MAX_ATTEMPTS=5):
+        client = aws.s3_client()
+        assert client.meta.region_name == 'sa-east-1'
+        assert client.meta.config.max_pool_connections == 7
+        assert client.meta.config.retries == {'mode': 'adaptive', 'total_max_attempts': 5}
+        assert client.meta.config.signature_version == 's3v4'
+    # Al cambiar settings AWS_* se recrea con la configuración nueva
+    assert aws.s3_client() is not client
+
+
+def test_client_dropped_after_fork():
+    client = aws.s3_client()
+    aws._after_fork_in_child()
+    assert aws.s3_client() is not client
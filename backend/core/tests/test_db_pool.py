@@ -0,0 +1,39 @@
+from django.db import connections
+from django.test import Client
+
+
+class FakePool:
+    name = 'pool-1'
+    min_size = 2
+    max_size = 4
+
+    def get_stats(self):
+        return {'pool_min': 2, 'pool_max': 4, 'pool_size': 3, 'pool_available': 1, 'requests_waiting': 0}
+
+
+def test_pool_stats_requires_token(db, settings, monkeypatch):
+    settings.INTERNAL_METRICS_TOKEN = 's3cret'
+    monkeypatch.setattr(connections['default'], 'pool', FakePool(), raising=False)
+    client = Client()
+
+    assert client.get('/internal/db/pool/').status_code == 404
+    resp = client.get('/internal/db/pool/', HTTP_X_INTERNAL_TOKEN='s3cret')
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data['databases']['default']['stats']['pool_size'] == 3
+    assert data['databases']['default']['max_size'] == 4
+    assert isinstance(data['pid'], int)
+
+
+def test_pool_stats_disabled_without_token(db, settings):
+    settings.INTERNAL_METRICS_TOKEN = ''
+    # Ni siquiera desde localhost (un proxy en el mismo host haría pasar a cualquiera)
+    assert Client(REMOTE_ADDR='127.0.0.1').get('/internal/db/pool/').status_code == 404
+    assert Client(REMOTE_ADDR='10.0.0.8').get('/internal/db/pool/').status_code == 404
+
+
+def test_pool_stats_without_pool(db, settings):
+    settings.INTERNAL_METRICS_TOKEN = 's3cret'
+    # SQLite en tests: sin pool
+    resp = Client().get('/internal/db/pool/', HTTP_X_INTERNAL_TOKEN='s3cret')
+    assert resp.json()['databases']['default'] == {'pool': False}
@@ -0,0 +1,98 @@
+import pytest
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from apps.properties.models import Property
+from core import db_router
+from core.db_router import ReplicaRouter, check_replica_settings, mark_recent_write, read_alias_for, use_read_alias
+
+User = get_user_model()
+
+
+@override_settings(DATABASE_REPLICAS=['replica_x'])
+def test_read_alias_for_safe_requests_and_stickiness(db):
+    cache.clear()
+    rf = RequestFactory()
+    assert read_alias_for(rf.get('/api/properties/')) == 'replica_x'
+    assert read_alias_for(rf.post('/api/properties/')) is None
+
+    token = str(AccessToken.for_user(User(id=42)))
+    authed = rf.get('/api/properties/', HTTP_AUTHORIZATION=f'Bearer {token}')
+    assert read_alias_for(authed) == 'replica_x'
+    mark_recent_write(42)
+    assert read_alias_for(authed) is None
+    # Otros usuarios no se ven afectados
+    other = str(AccessToken.for_user(User(id=7)))
+    assert read_alias_for(rf.get('/api/properties/', HTTP_AUTHORIZATION=f'Bearer {other}')) == 'replica_x'
+
+
+def test_router_uses_bound_alias_for_reads_only():
+    router = ReplicaRouter()
+    assert router.db_for_read(Property) is None
+    with use_read_alias('replica_x'):
+        assert router.db_for_read(Property) == 'replica_x'
+        assert router.db_for_write(Property) == 'default'
+    assert router.db_for_read(Property) is None
+
+
+def test_replicas_require_a_cache_outside_the_db(settings):
+    settings.DATABASE_REPLICAS = ['replica_x']
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+    with pytest.raises(ImproperlyConfigured):
+        check_replica_settings()
+    # La DB tampoco: cada lectura de réplica leería la marca con una query al primario
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'django_cache'}}
+    with pytest.raises(ImproperlyConfigured):
+        check_replica_settings()
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://cache:6379'}}
+    check_replica_settings()
+    settings.DATABASE_REPLICAS = []
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+    check_replica_settings()
+
+
+def test_cached_aggregates_read_from_primary(db, settings, monkeypatch):
+    # Con réplicas el cache es Redis (ver check_replica_settings); LocMem hace de Redis aquí
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+    # Un alias inexistente haría fallar cualquier lectura que vaya a la réplica
+    monkeypatch.setattr(db_router, 'read_alias_for', lambda request: 'replica_missing')
+    client = APIClient()
+    assert client.get('/api/properties/facets/').status_code == 200
+    assert client.get('/api/properties/clusters/', {'bbox': '-60,-39,-56,-33'}).status_code == 200
+
+
+# DATABASE_REPLICA_URLS=sqlite://:memory: REDIS_URL=redis://localhost:6379/15 \
+#     pytest core/tests/test_db_router.py (réplica = mirror de default)
+@pytest.mark.skipif(not settings.DATABASE_REPLICAS, reason='needs a replica alias (DATABASE_REPLICA_URLS)')
+@pytest.mark.django_db(databases='__all__', transaction=True)
+def test_reads_hit_replica_until_user_writes():
+    cache.clear()
+    replica = settings.DATABASE_REPLICAS[0]
+    owner = User.objects.create_user(username='u', password='p')
+    prop = Property.objects.create(
+        title='t', description='d', address='a', city='c', state='s', zip_code='z',
+        property_type='temporal', bedrooms=1, bathrooms=1, square_feet=10, price=10,
+        created_by=owner, status='published',
+    )
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(owner)}')
+
+    with CaptureQueriesContext(connections[replica]) as on_replica:
+        assert client.get(f'/api/properties/{prop.id}/pricing/').status_code == 200
+    assert on_replica.captured_queries
+
+    assert client.post(f'/api/properties/{prop.id}/pricing/', {
+        'start_date': '2025-01-10', 'end_date': '2025-01-20', 'price': '100.00',
+    }, format='json').status_code == 201
+
+    with CaptureQueriesContext(connections[replica]) as on_replica, \
+            CaptureQueriesContext(connections['default']) as on_default:
+        resp = client.get(f'/api/properties/{prop.id}/pricing/')
+    assert resp.status_code == 200 and len(resp.json()) == 1
+    assert not on_replica.captured_queries and on_default.captured_queries
@@ -0,0 +1,80 @@
+import os
+import runpy
+from pathlib import Path
+import pytest
+
+CONF_PATH = Path(__file__).resolve().parents[2] / 'gunicorn.conf.py'
+
+
+@pytest.fixture
+def conf(monkeypatch):
+    # El conf exporta DB_POOL_MAX_SIZE: que no quede en el entorno del resto de los tests
+    monkeypatch.setattr(os, 'environ', os.environ.copy())
+    monkeypatch.delenv('DB_POOL_MAX_SIZE', raising=False)
+    return runpy.run_path(str(CONF_PATH))
+
+
+def _cgroup(tmp_path, files):
+    for name, content in files.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    return str(tmp_path)
+
+
+def test_cpu_limit_reads_cgroup_v2_quota(conf, tmp_path, monkeypatch):
+    monkeypatch.setattr('os.sched_getaffinity', lambda pid: set(range(8)))
+    assert conf['_cpu_limit'](_cgroup(tmp_path, {'cpu.max': '150000 100000'})) == 2
+    assert conf['_cpu_limit'](_cgroup(tmp_path, {'cpu.max': 'max 100000'})) == 8
+
+
+def test_cpu_limit_reads_cgroup_v1_quota(conf, tmp_path, monkeypatch):
+    monkeypatch.setattr('os.sched_getaffinity', lambda pid: set(range(8)))
+    root = _cgroup(tmp_path, {'cpu/cpu.cfs_quota_us': '100000', 'cpu/cpu.cfs_period_us': '100000'})
+    assert conf['_cpu_limit'](root) == 1
+
+
+def test_memory_limit_prefers_cgroup(conf, tmp_path):
+    assert conf['_memory_limit'](_cgroup(tmp_path, {'memory.max': str(512 * 1024 * 1024)})) == 512 * 1024 * 1024
+    v1_unlimited = _cgroup(tmp_path / 'v1', {'memory/memory.limit_in_bytes': str(2 ** 63 - 4096)})
+    assert conf['_memory_limit'](v1_unlimited) > 0  # cae a la memoria física
+
+
+def test_resolve_scales_with_cpu_and_caps_by_memory(conf):
+    resolve = conf['_resolve']
+    gib = 1024 ** 3
+    assert resolve(2, 8 * gib, env={}) == (5, 4)
+    # 1 GiB * 0.9 / 256 MiB -> 3 workers; los threads compensan hasta la concurrencia de 5 workers
+    assert resolve(2, gib, env={}) == (3, 7)
+    assert resolve(1, None, env={}) == (3, 4)
+
+
+def test_resolve_env_overrides(conf):
+    env = {'WEB_CONCURRENCY': '2', 'GUNICORN_THREADS': '8'}
+    assert conf['_resolve'](4, 1024 ** 3, env=env) == (2, 8)
+
+
+def test_threads_never_exceed_pool_size(conf, monkeypatch):
+    gib = 1024 ** 3
+    # 1 GiB -> 3 workers x 7 threads, pero el pool sólo tiene 4 conexiones por worker
+    assert conf['_resolve'](2, gib, env={'DB_POOL_MAX_SIZE': '4'}) == (3, 4)
+    assert conf['_resolve'](2, gib, env={'GUNICORN_THREADS': '8', 'DB_POOL_MAX_SIZE': '6'}) == (3, 6)
+
+    # Sin DB_POOL_MAX_SIZE el pool se dimensiona con los threads resueltos
+    monkeypatch.delenv('DB_POOL_MAX_SIZE')
+    monkeypatch.setenv('GUNICORN_THREADS', '12')
+    assert runpy.run_path(str(CONF_PATH))['threads'] == 12
+    assert os.environ['DB_POOL_MAX_SIZE'] == '12'
+
+
+def test_module_settings(conf, monkeypatch):
+    assert conf['preload_app'] is True
+    assert conf['max_requests'] > 0 and conf['max_requests_jitter'] > 0
+    assert conf['worker_class'] == 'gthread' and conf['threads'] >= 2
+
+    monkeypatch.setenv('SERVER_MODE', 'asgi')
+    monkeypatch.setenv('GUNICORN_MAX_REQUESTS', '0')
+    asgi = runpy.run_path(str(CONF_PATH))
+    assert asgi['worker_class'] == 'uvicorn.workers.UvicornWorker'
+    assert 'threads' not in asgi
+    assert asgi['max_requests_jitter'] == 0
@@ -0,0 +1,117 @@
+import asyncio
+import pytest
+from django.db import connections
+from django.http import HttpResponse
+from django.test import Client, RequestFactory
+from core import health
+from core.middleware import HealthCheckMiddleware
+
+
+@pytest.fixture(autouse=True)
+def fresh_probes():
+    health.reset()
+    yield
+    health.reset()
+
+
+class FakePool:
+    max_size = 4
+
+    def get_stats(self):
+        return {'pool_size': 4, 'pool_available': 1, 'requests_waiting': 2}
+
+
+def test_liveness_short_circuits_the_stack(settings):
+    settings.SECURE_SSL_REDIRECT = True
+    settings.ALLOWED_HOSTS = ['api.example.com']
+    # Host = IP del target (como el health check del ALB) y HTTP plano: ni 400 ni 301
+    for path in ('/health', '/health/'):
+        resp = Client(HTTP_HOST='10.0.3.17').get(path)
+        assert resp.status_code == 200
+        assert resp.json() == {'status': 'ok'}
+
+    def view(_request):
+        raise AssertionError('liveness must not reach the rest of the stack')
+    request = RequestFactory().get('/health')
+    assert HealthCheckMiddleware(view)(request).status_code == 200
+
+
+def test_async_chain_and_latency_recording():
+    async def view(_request):
+        return HttpResponse('x')
+
+    middleware = HealthCheckMiddleware(view)
+    assert asyncio.iscoroutinefunction(middleware)
+    assert asyncio.run(middleware(RequestFactory().get('/health/'))).content == b'{"status": "ok"}'
+    assert asyncio.run(middleware(RequestFactory().get('/api/properties/'))).content == b'x'
+    assert health.request_latencies.percentiles()['count'] == 1
+
+
+def test_readiness_caches_db_probe(db, settings, django_assert_num_queries):
+    settings.READINESS_CACHE_SECONDS = 60
+    settings.INTERNAL_METRICS_TOKEN = 's3cret'
+    client = Client(HTTP_X_INTERNAL_TOKEN='s3cret')
+    with django_assert_num_queries(1):
+        resp = client.get('/ready/')
+        client.get('/ready')
+        client.get('/db/health/')
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data['status'] == 'ready'
+    assert data['checks']['db']['ok'] is True
+    assert 's3' not in data['checks']
+    assert data['db_pool']['default'] is None   # SQLite en tests: sin pool
+    assert resp['Cache-Control'] == 'no-store'
+
+
+def test_readiness_reports_failures_pool_and_latency(db, monkeypatch):
+    def broken():
+        raise ConnectionError('no route to host')
+    monkeypatch.setattr(health.db_probe, 'check', broken)
+    monkeypatch.setattr(connections['default'], 'pool', FakePool(), raising=False)
+    for ms in range(1, 101):
+        health.request_latencies.record(float(ms))
+
+    ready, payload = health.readiness()
+    assert not ready
+    assert payload['checks']['db']['ok'] is False
+    assert payload['checks']['db']['error'] == 'ConnectionError'
+    assert payload['db_pool']['default'] == {
+        'busy': 3, 'size': 4, 'max_size': 4, 'saturation': 0.75, 'requests_waiting': 2,
+    }
+    assert payload['latency_ms'] == {'count': 100, 'p50': 50.0, 'p95': 95.0, 'p99': 99.0}
+    assert Client().get('/db/health').status_code == 500
+
+
+def test_readiness_detail_is_internal_only(db, settings, monkeypatch):
+    settings.INTERNAL_METRICS_TOKEN = 's3cret'
+    client = Client(REMOTE_ADDR='10.0.3.17')
+    resp = client.get('/ready/')
+    assert resp.status_code == 200
+    assert resp.json() == {'status': 'ready'}
+    assert 'pid' in client.get('/ready/', HTTP_X_INTERNAL_TOKEN='s3cret').json()
+    # Sin token configurado, localhost tampoco ve el detalle
+    settings.INTERNAL_METRICS_TOKEN = ''
+    assert Client(REMOTE_ADDR='127.0.0.1').get('/ready/').json() == {'status': 'ready'}
+
+    def broken():
+        raise ConnectionError('no route to host')
+    health.reset()
+    monkeypatch.setattr(health.db_probe, 'check', broken)
+    resp = client.get('/ready/')
+    assert resp.status_code == 503
+    assert resp.json() == {'status': 'unavailable'}
+
+
+def test_probe_single_flight_returns_previous_result(settings):
+    settings.READINESS_CACHE_SECONDS = 0
+    calls = []
+    probe = health.CachedProbe('x', lambda: calls.append(1))
+    assert probe.result()['ok']
+    # Otro thread está probando: se devuelve el último resultado sin esperar ni repetir el probe
+    probe._lock.acquire()
+    try:
+        assert probe.result()['ok']
+    finally:
+        probe._lock.release()
+    assert len(calls) == 1
@@ -0,0 +1,54 @@
+"""
+Import-time budget for a worker boot (django.setup + URLconf + middleware chain), measured in a
+fresh interpreter with `-X importtime`. Run with `-s` to see the summary of the slowest imports.
+SDKs used only by some endpoints (S3 presign/signing, async geocoding) must stay out of this path.
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+from django.conf import settings
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+IMPORT_TIME_BUDGET_MS = int(os.getenv('IMPORT_TIME_BUDGET_MS', '1200'))
+DEFERRED_MODULES = ('boto3', 'botocore', 's3transfer', 'httpx')
+BOOT_CODE = (
+    "import django; django.setup(); "
+    "from django.urls import get_resolver; get_resolver().url_patterns; "
+    "from django.core.handlers.wsgi import WSGIHandler; WSGIHandler()"
+)
+
+
+def import_profile():
+    """[(module, self_us, cumulative_us, depth)] for a fresh worker boot."""
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE)
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', BOOT_CODE],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def test_worker_boot_import_budget():
+    rows = import_profile()
+    top_level = sorted((r for r in rows if r[3] == 0), key=lambda r: r[2], reverse=True)
+    total_ms = sum(r[2] for r in top_level) / 1000
+
+    print(f"\nimport time for a worker boot: {total_ms:.0f} ms (budget {IMPORT_TIME_BUDGET_MS} ms)")
+    for name, _, cumulative_us, _ in top_level[:10]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+    loaded = {name.split('.')[0] for name, *_ in rows}
+    assert not loaded & set(DEFERRED_MODULES), f"imported at boot: {sorted(loaded & set(DEFERRED_MODULES))}"
+    assert total_ms <= IMPORT_TIME_BUDGET_MS
+
+
+def test_middleware_has_no_duplicates():
+    assert len(settings.MIDDLEWARE) == len(set(settings.MIDDLEWARE))
@@ -0,0 +1,44 @@
+from io import StringIO
+import os
+import pytest
+from django.core.management import call_command
+from core.release import pending_migrations, static_current
+
+
+def _release(*args):
+    out = StringIO()
+    call_command('release', *args, stdout=out)
+    return out.getvalue()
+
+
+@pytest.fixture
+def static_dirs(settings, tmp_path):
+    source = tmp_path / 'src'
+    source.mkdir()
+    (source / 'app.css').write_text('body { color: black; }')
+    settings.STATICFILES_DIRS = [str(source)]
+    settings.STATIC_ROOT = str(tmp_path / 'collected')
+    return source
+
+
+@pytest.mark.django_db
+def test_check_skips_migrate_when_up_to_date():
+    assert pending_migrations() == []
+    out = _release('--check', '--skip-static')
+    assert 'migrate: up to date, skipped' in out
+    assert 'createcachetable: done' in out
+    assert '[release] total' in out
+
+
+def test_check_skips_collectstatic_until_sources_change(static_dirs):
+    assert not static_current()
+    out = _release('--skip-migrate', '--check')
+    assert 'collectstatic: done' in out
+    assert os.path.exists(os.path.join(static_dirs.parent, 'collected', 'app.css'))
+    assert static_current()
+
+    assert 'manifest current, skipped' in _release('--skip-migrate', '--check')
+
+    (static_dirs / 'app.css').write_text('body { color: red; }')
+    assert not static_current()
+    assert 'collectstatic: done' in _release('--skip-migrate', '--check')
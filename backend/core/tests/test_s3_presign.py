@@ -0,0 +1,129 @@
+import datetime
+import types
+from unittest import mock
+import pytest
+from django.test.utils import override_settings
+from core import aws, s3_presign
+
+FIXED = datetime.datetime(2024, 3, 9, 23, 59, 58)
+FIXED_TS = FIXED.replace(tzinfo=datetime.timezone.utc).timestamp()
+
+
+class _FixedDatetime(datetime.datetime):
+    @classmethod
+    def utcnow(cls):
+        return FIXED
+
+
+@pytest.fixture
+def creds(monkeypatch):
+    monkeypatch.setenv('AWS_ACCESS_KEY_ID', 'AKIDEXAMPLE')
+    monkeypatch.setenv('AWS_SECRET_ACCESS_KEY', 'wJalrXUtnFEMI/K7MDENG+bPxRfiCYEXAMPLEKEY')
+    monkeypatch.delenv('AWS_SESSION_TOKEN', raising=False)
+    aws.reset_clients()
+    s3_presign.reset()
+    yield
+    aws.reset_clients()
+    s3_presign.reset()
+
+
+def fixed_botocore_clock():
+    # Misma marca de tiempo que la firma local
+    return mock.patch('botocore.auth.datetime', types.SimpleNamespace(datetime=_FixedDatetime))
+
+
+def botocore_url(client_method, params, expires_in):
+    with fixed_botocore_clock():
+        return aws.s3_client().generate_presigned_url(client_method, Params=params, ExpiresIn=expires_in)
+
+
+CASES = [
+    ('put_object', {'Bucket': 'bkt', 'Key': 'properties/original/7/foto-1.jpg', 'ContentType': 'image/jpeg'}),
+    ('put_object', {'Bucket': 'bkt', 'Key': 'a b/ñandú+(1)~x.png', 'ContentType': 'image/png', 'ACL': 'public-read'}),
+    ('put_object', {'Bucket': 'my-bucket-2', 'Key': 'k', 'CacheControl': 'public,  max-age=60',
+                    'ContentDisposition': 'inline'}),
+    ('get_object', {'Bucket': 'bkt', 'Key': 'properties/derived/480/7/a.webp'}),
+]
+
+
+@pytest.mark.parametrize('region', ['us-east-1', 'sa-east-1'])
+@pytest.mark.parametrize('client_method,params', CASES)
+def test_matches_botocore(creds, region, client_method, params):
+    with override_settings(AWS_S3_REGION_NAME=region):
+        expected = botocore_url(client_method, params, 300)
+        assert s3_presign.presign_url(client_method, params, 300, now=FIXED_TS) == expected
+
+
+def test_matches_botocore_with_session_token(creds, monkeypatch):
+    monkeypatch.setenv('AWS_SESSION_TOKEN', 'IQoJb3JpZ2luX2VjEJ//////////wEaCXVzLWVhc3QtMSJH+token=')
+    aws.reset_clients()
+    s3_presign.reset()
+    params = {'Bucket': 'bkt', 'Key': 'x.jpg', 'ContentType': 'image/jpeg'}
+    url = s3_presign.presign_url('put_object', params, 900, now=FIXED_TS)
+    assert 'X-Amz-Security-Token=' in url
+    assert url == botocore_url('put_object', params, 900)
+
+
+def test_batch_and_fallbacks(creds):
+    params_list = [
+        {'Bucket': 'bkt', 'Key': 'a.jpg'},
+        {'Bucket': 'my.dotted.bucket', 'Key': 'a.jpg'},     # path-style: lo firma botocore
+        {'Bucket': 'bkt', 'Key': 'a.jpg', 'VersionId': '3'},  # parámetro no soportado
+    ]
+    with fixed_botocore_clock():
+        urls = s3_presign.presign_urls('get_object', params_list, 60, now=FIXED_TS)
+    assert urls == [botocore_url('get_object', p, 60) for p in params_list]
+    assert urls[1].startswith('https://s3.amazonaws.com/my.dotted.bucket/a.jpg?')
+
+
+def test_signing_key_cached_per_day(creds):
+    s3_presign._signing_key.cache_clear()
+    s3_presign.presign_urls('get_object', [{'Bucket': 'bkt', 'Key': str(i)} for i in range(50)], now=FIXED_TS)
+    s3_presign.presign_url('get_object', {'Bucket': 'bkt', 'Key': 'x'}, now=FIXED_TS + 1)
+    assert s3_presign._signing_key.cache_info().misses == 1
+    # FIXED es 23:59:58 -> 2 s después cambia el día del scope
+    s3_presign.presign_url('get_object', {'Bucket': 'bkt', 'Key': 'x'}, now=FIXED_TS + 2)
+    assert s3_presign._signing_key.cache_info().misses == 2
+
+
+class FakeRefreshable:
+    """Lo mínimo de botocore RefreshableCredentials que usa el presigner."""
+
+    def __init__(self, now, lifetime):
+        self.now, self.lifetime, self.refreshes = now, lifetime, 0
+        self._rotate()
+
+    def _rotate(self):
+        self.refreshes += 1
+        self._expiry_time = datetime.datetime.fromtimestamp(self.now + self.lifetime, datetime.timezone.utc)
+        self.frozen = types.SimpleNamespace(access_key=f'ASIA{self.refreshes}', secret_key='s', token='t')
+
+    def get_frozen_credentials(self):
+        # botocore renueva dentro de los 15 min previos al vencimiento
+        if self._expiry_time.timestamp() - self.now < 15 * 60:
+            self._rotate()
+        return self.frozen
+
+
+def test_credentials_refreshed_before_expiry(monkeypatch):
+    clock = [1_700_000_000.0]
+    source = FakeRefreshable(clock[0], lifetime=3600)
+    monkeypatch.setattr(s3_presign, 's3_credentials', lambda: source)
+    monkeypatch.setattr(s3_presign.time, 'time', lambda: clock[0])
+    cache = s3_presign._CredentialCache()
+
+    assert cache.get().access_key == 'ASIA1'
+    clock[0] += 44 * 60
+    source.now = clock[0]
+    assert cache.get().access_key == 'ASIA1'   # todavía fuera del margen: ni siquiera se consulta
+    clock[0] += 2 * 60
+    source.now = clock[0]
+    assert cache.get().access_key == 'ASIA2'   # a 14 min del vencimiento: credencial nueva
+    assert source.refreshes == 2
+
+
+def test_static_credentials_are_read_once(creds):
+    with mock.patch.object(s3_presign, 's3_credentials', wraps=s3_presign.s3_credentials) as spy:
+        s3_presign.presign_urls('get_object', [{'Bucket': 'bkt', 'Key': 'a'}])
+        s3_presign.presign_urls('get_object', [{'Bucket': 'bkt', 'Key': 'b'}])
+    assert spy.call_count == 1
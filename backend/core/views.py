@@ -1,13 +1,60 @@
+import os
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.http import JsonResponse
-from django.db import connection
+from django.db import connections
+from django.utils.crypto import constant_time_compare
+from core.health import db_probe, readiness as readiness_status
 
-def health(_request):
+async def health(_request):
     return JsonResponse({"app": "ok"})
 
-def db_health(_request):
-    try:
-        with connection.cursor() as cur:
-            cur.execute("SELECT 1;")
+async def db_health(_request):
+    # Resultado cacheado READINESS_CACHE_SECONDS por proceso (ver core.health): sólo al vencer
+    # se hace el SELECT 1, en un thread; mientras tanto se responde sin salir del event loop
+    result = db_probe.cached() or await sync_to_async(db_probe.result)()
+    if result['ok']:
         return JsonResponse({"db": "ok"})
-    except Exception as exc:
-        return JsonResponse({"db": "error", "detail": str(exc)}, status=500)
+    return JsonResponse({"db": "error", "detail": result['error']}, status=500)
+
+def readiness(request):
+    """
+    GET /ready -> 200 {"status": "ready"} or 503 {"status": "unavailable"} when a dependency probe
+    fails. Internal callers (see _internal_request) also get pid, checks, db_pool and latency_ms.
+    Probes are cached per worker; see core.health.
+    """
+    ready, payload = readiness_status()
+    if not _internal_request(request):
+        # Endpoint público (ALB/ECS): sólo el estado, sin pool, latencias ni nombres de errores
+        payload = {'status': payload['status']}
+    response = JsonResponse(payload, status=200 if ready else 503)
+    response['Cache-Control'] = 'no-store'
+    return response
+
+def _internal_request(request):
+    # Sin token configurado nadie es interno: detrás de un proxy local todo llega desde 127.0.0.1
+    token = getattr(settings, 'INTERNAL_METRICS_TOKEN', '')
+    return bool(token) and constant_time_compare(request.headers.get('X-Internal-Token', ''), token)
+
+def db_pool_stats(request):
+    """
+    GET /internal/db/pool/ -> psycopg pool stats of the worker that serves the request
+    (pool_size, pool_available, requests_waiting, requests_wait_ms, connections_errors, ...).
+    Each gunicorn worker has its own pool, hence the pid.
+    """
+    if not _internal_request(request):
+        return JsonResponse({"detail": "Not found."}, status=404)
+    databases = {}
+    for alias in connections:
+        pool = getattr(connections[alias], 'pool', None)
+        if pool is None:
+            databases[alias] = {"pool": False}
+            continue
+        databases[alias] = {
+            "pool": True,
+            "name": pool.name,
+            "min_size": pool.min_size,
+            "max_size": pool.max_size,
+            "stats": pool.get_stats(),
+        }
+    return JsonResponse({"pid": os.getpid(), "databases": databases})
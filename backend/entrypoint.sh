@@ -1,23 +1,45 @@
 #!/usr/bin/env sh
-set -euo pipefail
+set -eu  # dash (python:3.12-slim) no soporta pipefail; el script no usa pipes
+
+# Uso:
+#   ./entrypoint.sh                  -> servidor web (gunicorn); no migra ni hace collectstatic
+#   ./entrypoint.sh release [args]   -> tarea one-shot de release: migrate (+ collectstatic si cambió)
+#                                       ej: ECS run-task / EB predeploy / `docker run <image> release`
+# Los estáticos se recolectan en el build de la imagen (ver Dockerfile).
+# RELEASE_ON_BOOT=1 ejecuta `release --check` antes de gunicorn (para despliegues sin paso de
+# release separado): con todo al día sólo cuesta el chequeo.
+
+now_ms() { date +%s%3N; }
+export BOOT_STARTED_AT_MS="${BOOT_STARTED_AT_MS:-$(now_ms)}"
+
+if [ "${1:-}" = "release" ]; then
+  shift
+  exec python manage.py release "$@"
+fi
 
 # Defaults (can be overridden via environment)
 export PORT="${PORT:-5000}"
-export WEB_CONCURRENCY="${WEB_CONCURRENCY:-3}"
-export GUNICORN_TIMEOUT="${GUNICORN_TIMEOUT:-120}"
+# Workers/threads/timeout: gunicorn.conf.py los deriva de CPU y memoria del contenedor
+# (WEB_CONCURRENCY, GUNICORN_THREADS, GUNICORN_TIMEOUT siguen sirviendo para fijarlos).
 
-echo "[entrypoint] Applying migrations..."
-python manage.py migrate --noinput
+if [ "${RELEASE_ON_BOOT:-0}" = "1" ]; then
+  echo "[entrypoint] RELEASE_ON_BOOT=1: running release --check..."
+  python manage.py release --check
+fi
+echo "[boot] entrypoint: $(( $(now_ms) - BOOT_STARTED_AT_MS )) ms before gunicorn"
 
-echo "[entrypoint] Collecting static files..."
-python manage.py collectstatic --noinput
+# SERVER_MODE=asgi -> config.asgi bajo workers uvicorn (vistas async: presign, health, db health y
+# las escrituras de propiedades con geocoding vía ASYNC_WRITES_URLCONF; las lecturas siguen sync)
+export SERVER_MODE="${SERVER_MODE:-wsgi}"
+if [ "${SERVER_MODE}" = "asgi" ]; then
+  APP_MODULE="config.asgi:application"
+else
+  APP_MODULE="config.wsgi:application"
+fi
 
-echo "[entrypoint] Starting gunicorn on 0.0.0.0:${PORT} (workers=${WEB_CONCURRENCY}, timeout=${GUNICORN_TIMEOUT})"
-exec gunicorn config.wsgi:application \
+echo "[entrypoint] Starting gunicorn ${APP_MODULE} on 0.0.0.0:${PORT} (mode=${SERVER_MODE}, settings: gunicorn.conf.py)"
+exec gunicorn "${APP_MODULE}" \
+  --config gunicorn.conf.py \
   --bind 0.0.0.0:${PORT} \
-  --workers ${WEB_CONCURRENCY} \
-  --timeout ${GUNICORN_TIMEOUT} \
-  --access-logfile - \
-  --error-logfile - \
   --forwarded-allow-ips="*" \
   --proxy-allow-from="*"
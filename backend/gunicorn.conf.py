@@ -1,10 +1,186 @@
 # bind provided via CLI in entrypoint (see entrypoint.sh)
 # bind = "0.0.0.0:8000"
-workers = 3
-worker_class = "gthread"
-threads = 4
-timeout = 120
+"""
+Gunicorn configuration (single source of truth; entrypoint.sh only passes bind/proxy flags).
+
+Workers and threads are derived from the CPUs and memory the container can actually use
+(cgroup v1/v2 limits, CPU affinity), so the same image behaves on a 1-vCPU task and on a
+large instance. Every value can be pinned through the environment:
+
+  WEB_CONCURRENCY              workers (default: min(2*cpus+1, usable memory / per-worker budget))
+  GUNICORN_THREADS             threads per gthread worker (default: keep ~4 threads per CPU worker),
+                               capped at DB_POOL_MAX_SIZE when that is set
+  GUNICORN_WORKER_MEMORY_MB    per-worker memory budget used for the cap (default: 256)
+  GUNICORN_TIMEOUT             worker timeout in seconds (default: 120)
+  GUNICORN_MAX_REQUESTS        recycle workers after N requests, 0 disables (default: 1000)
+  GUNICORN_MAX_REQUESTS_JITTER random extra requests so workers don't recycle together (default: 100)
+  GUNICORN_PRELOAD             load the app once in the master before forking (default: 1)
+  SERVER_MODE                  wsgi (gthread) | asgi (uvicorn workers, async geocoding writes),
+                               see entrypoint.sh
+
+Without DB_POOL_MAX_SIZE, the gthread config exports it as the resolved thread count, so each
+worker's psycopg pool (config/settings.py) has one connection per thread.
+
+Boot phases are logged as `[boot] ...` lines (entrypoint -> master ready -> each worker ready);
+BOOT_STARTED_AT_MS is exported by entrypoint.sh.
+"""
+import math
+import os
+import sys
+import time
+
+_CONF_LOADED_AT = time.time()
+
+_CGROUP_ROOT = "/sys/fs/cgroup"
+_UNLIMITED_MEMORY = 1 << 60  # cgroup v1 reporta ~2^63 cuando no hay límite
+
+
+def _env_int(name, default):
+    value = os.getenv(name, "").strip()
+    return int(value) if value else default
+
+
+def _read(path):
+    try:
+        with open(path) as fh:
+            return fh.read().strip()
+    except OSError:
+        return None
+
+
+def _cpu_limit(root=_CGROUP_ROOT):
+    """CPUs usable by this process: affinity, capped by the cgroup CPU quota (rounded up)."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    quota = period = None
+    cpu_max = _read(os.path.join(root, "cpu.max"))  # v2: "<quota|max> <period>"
+    if cpu_max:
+        q, _, p = cpu_max.partition(" ")
+        if q != "max" and p:
+            quota, period = int(q), int(p)
+    else:  # v1
+        q = _read(os.path.join(root, "cpu", "cpu.cfs_quota_us"))
+        p = _read(os.path.join(root, "cpu", "cpu.cfs_period_us"))
+        if q and p and int(q) > 0:
+            quota, period = int(q), int(p)
+    if quota and period:
+        cpus = min(cpus, max(1, math.ceil(quota / period)))
+    return max(1, cpus)
+
+
+def _memory_limit(root=_CGROUP_ROOT):
+    """Bytes usable by this process: cgroup memory limit, or physical memory (None if unknown)."""
+    for path in (os.path.join(root, "memory.max"), os.path.join(root, "memory", "memory.limit_in_bytes")):
+        value = _read(path)
+        if value and value != "max" and int(value) < _UNLIMITED_MEMORY:
+            return int(value)
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def _resolve(cpus, memory_bytes, env=os.environ):
+    """
+    (workers, threads) for the given resources; WEB_CONCURRENCY / GUNICORN_THREADS win, but threads
+    never exceed an explicit DB_POOL_MAX_SIZE.
+    """
+    cpu_workers = 2 * cpus + 1
+    workers = cpu_workers
+    per_worker = int(env.get("GUNICORN_WORKER_MEMORY_MB") or 256) * 1024 * 1024
+    if memory_bytes:
+        # ~10% para el master y el resto del contenedor
+        workers = min(workers, max(1, int(memory_bytes * 0.9) // per_worker))
+    if env.get("WEB_CONCURRENCY"):
+        workers = max(1, int(env["WEB_CONCURRENCY"]))
+    # Threads cubren la espera de I/O (DB, S3, geocoding); si la memoria recortó workers,
+    # se compensa con más threads por worker para mantener la concurrencia total.
+    threads = min(16, max(2, math.ceil(cpu_workers * 4 / workers)))
+    if env.get("GUNICORN_THREADS"):
+        threads = max(1, int(env["GUNICORN_THREADS"]))
+    if env.get("DB_POOL_MAX_SIZE"):
+        # Más threads que conexiones del pool sólo esperan (DB_POOL_TIMEOUT) por una conexión
+        threads = min(threads, max(1, int(env["DB_POOL_MAX_SIZE"])))
+    return workers, threads
+
+
+_cpus = _cpu_limit()
+_memory = _memory_limit()
+_server_mode = os.getenv("SERVER_MODE", "wsgi")
+_workers, _threads = _resolve(_cpus, _memory)
+
+workers = _workers
+# SERVER_MODE=asgi (ver entrypoint.sh): un event loop por worker en vez de threads
+if _server_mode == "asgi":
+    worker_class = "uvicorn.workers.UvicornWorker"
+else:
+    worker_class = "gthread"
+    threads = _threads
+    # settings.py se importa después (preload o en cada worker): pool = una conexión por thread
+    os.environ.setdefault("DB_POOL_MAX_SIZE", str(threads))
+timeout = _env_int("GUNICORN_TIMEOUT", 120)
 graceful_timeout = 30
+max_requests = _env_int("GUNICORN_MAX_REQUESTS", 1000)
+max_requests_jitter = _env_int("GUNICORN_MAX_REQUESTS_JITTER", 100) if max_requests else 0
+preload_app = os.getenv("GUNICORN_PRELOAD", "1").lower() not in ("0", "false", "no")
+if os.path.isdir("/dev/shm"):
+    # heartbeat de workers en tmpfs: evita bloqueos por disco lento en contenedores
+    worker_tmp_dir = "/dev/shm"
 accesslog = "-"
 errorlog = "-"
 loglevel = "info"
+
+
+def when_ready(server):
+    memory_mb = f"{_memory // (1024 * 1024)}MB" if _memory else "unknown"
+    server.log.info(
+        "[gunicorn] mode=%s worker_class=%s workers=%s threads=%s timeout=%ss max_requests=%s(+%s) "
+        "preload=%s | cpus=%s memory=%s",
+        _server_mode, server.cfg.worker_class_str, server.cfg.workers,
+        server.cfg.threads if _server_mode != "asgi" else "-", server.cfg.timeout,
+        server.cfg.max_requests, server.cfg.max_requests_jitter, server.cfg.preload_app,
+        _cpus, memory_mb,
+    )
+    server.log.info(
+        "[boot] master ready: config + app %s in %d ms (%s since entrypoint start)",
+        "preload" if server.cfg.preload_app else "bind", (time.time() - _CONF_LOADED_AT) * 1000,
+        _since_boot(),
+    )
+
+
+def _since_boot():
+    started = os.getenv("BOOT_STARTED_AT_MS", "")
+    if not started.isdigit():
+        return "n/a"
+    return f"{time.time() * 1000 - int(started):.0f} ms"
+
+
+def pre_fork(server, worker):
+    # Con preload la app vive en el master: nunca heredar conexiones/pools de DB abiertos
+    # (el socket y los threads del pool de psycopg no sobreviven al fork).
+    if "django.db" not in sys.modules:
+        return
+    from django.db import connections
+    for conn in connections.all(initialized_only=True):
+        conn.close()
+        if hasattr(conn, "close_pool"):
+            conn.close_pool()
+
+
+def post_fork(server, worker):
+    worker.boot_forked_at = time.monotonic()
+    # Clientes boto3 (sesión, pool de urllib3) no son fork-safe: cada worker crea los suyos.
+    if "boto3" in sys.modules:
+        sys.modules["boto3"].DEFAULT_SESSION = None
+    media = sys.modules.get("apps.properties.media")
+    if media is not None:
+        media.clear_caches()
+
+
+def post_worker_init(worker):
+    worker.log.info(
+        "[boot] worker %s ready %d ms after fork (%s since entrypoint start)",
+        worker.pid, (time.monotonic() - worker.boot_forked_at) * 1000, _since_boot(),
+    )
@@ -1,5 +1,5 @@
 from django.http import JsonResponse
 
 
-def health(_request):  # Simple health endpoint (no DB touch)
+async def health(_request):  # Simple health endpoint (no DB touch)
     return JsonResponse({"status": "ok"})
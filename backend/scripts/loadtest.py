@@ -0,0 +1,96 @@
+"""
+Small async load generator to compare the WSGI (gthread) and ASGI (uvicorn) deployments.
+
+Start the app in each mode and point the script at both:
+
+    SERVER_MODE=wsgi PORT=5000 ./entrypoint.sh
+    SERVER_MODE=asgi PORT=5001 ./entrypoint.sh
+
+    python scripts/loadtest.py --path /health/ --path /db/health/ \\
+        --target wsgi=http://127.0.0.1:5000 --target asgi=http://127.0.0.1:5001 \\
+        --concurrency 200 --requests 5000
+
+POST endpoints (presign, property writes) need a token:
+    --method POST --json '{"files": [{"name": "a.jpg", "type": "image/jpeg"}]}' --token <JWT>
+
+Reports throughput, latency percentiles and errors per target and path. Requires httpx.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import httpx
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+async def run(base_url, path, args):
+    headers = {'Authorization': f'Bearer {args.token}'} if args.token else {}
+    body = json.loads(args.json) if args.json else None
+    latencies, errors, statuses = [], 0, {}
+    remaining = args.requests
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, timeout=args.timeout, limits=limits) as client:
+        async def worker():
+            nonlocal remaining, errors
+            while remaining > 0:
+                remaining -= 1
+                start = time.perf_counter()
+                try:
+                    resp = await client.request(args.method, path, json=body)
+                    statuses[resp.status_code] = statuses.get(resp.status_code, 0) + 1
+                    if resp.status_code >= 500:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'rps': len(latencies) / elapsed if elapsed else 0.0,
+        'mean_ms': statistics.mean(latencies) * 1000 if latencies else 0.0,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'errors': errors,
+        'statuses': statuses,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--target', action='append', required=True, help='name=base_url (repeatable)')
+    parser.add_argument('--path', action='append', default=None, help='Path to hit (repeatable, default /health/)')
+    parser.add_argument('--method', default='GET')
+    parser.add_argument('--json', default=None, help='JSON body for POST/PUT')
+    parser.add_argument('--token', default=None, help='JWT access token')
+    parser.add_argument('--concurrency', type=int, default=100)
+    parser.add_argument('--requests', type=int, default=2000, help='Requests per target and path')
+    parser.add_argument('--timeout', type=float, default=30.0)
+    args = parser.parse_args()
+
+    print(f"{'target':<10} {'path':<28} {'req/s':>9} {'mean':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'errors':>7}  statuses")
+    for target in args.target:
+        name, _, base_url = target.partition('=')
+        for path in args.path or ['/health/']:
+            r = await run(base_url or name, path, args)
+            print(
+                f"{name:<10} {path:<28} {r['rps']:>9.1f} {r['mean_ms']:>6.1f}ms {r['p50_ms']:>6.1f}ms "
+                f"{r['p95_ms']:>6.1f}ms {r['p99_ms']:>6.1f}ms {r['errors']:>7}  {r['statuses']}"
+            )
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,66 @@
+"""
+Memory per gunicorn worker (Linux /proc), to compare deployments or code changes.
+
+    python scripts/worker_rss.py <master-pid>
+    python scripts/worker_rss.py --pidfile /tmp/gunicorn.pid
+
+RSS counts every page the worker maps, including pages shared with the master through fork
+(preload_app). PSS splits shared pages among the processes using them, so the PSS sum is the real
+footprint of the whole server. USS is memory private to each process.
+"""
+import argparse
+import os
+
+
+def children(pid):
+    pids = []
+    for task in os.listdir(f'/proc/{pid}/task'):
+        try:
+            with open(f'/proc/{pid}/task/{task}/children') as fh:
+                pids.extend(int(p) for p in fh.read().split())
+        except OSError:
+            pass
+    return pids
+
+
+def memory_kb(pid):
+    """{'rss', 'pss', 'uss'} in kB from /proc/<pid>/smaps_rollup."""
+    values = {}
+    with open(f'/proc/{pid}/smaps_rollup') as fh:
+        for line in fh:
+            name, _, rest = line.partition(':')
+            if name in ('Rss', 'Pss', 'Private_Clean', 'Private_Dirty'):
+                values[name] = int(rest.split()[0])
+    return {
+        'rss': values.get('Rss', 0),
+        'pss': values.get('Pss', 0),
+        'uss': values.get('Private_Clean', 0) + values.get('Private_Dirty', 0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('pid', nargs='?', type=int, help='gunicorn master pid')
+    parser.add_argument('--pidfile', help='read the master pid from this file (gunicorn --pid)')
+    args = parser.parse_args()
+    if args.pidfile:
+        with open(args.pidfile) as fh:
+            args.pid = int(fh.read().strip())
+    if not args.pid:
+        parser.error('master pid or --pidfile required')
+
+    rows = [('master', args.pid, memory_kb(args.pid))]
+    rows += [('worker', pid, memory_kb(pid)) for pid in sorted(children(args.pid))]
+    print(f"{'role':<8}{'pid':>8}{'RSS MB':>10}{'PSS MB':>10}{'USS MB':>10}")
+    for role, pid, mem in rows:
+        print(f"{role:<8}{pid:>8}{mem['rss'] / 1024:>10.1f}{mem['pss'] / 1024:>10.1f}{mem['uss'] / 1024:>10.1f}")
+    workers = [mem for role, _, mem in rows if role == 'worker']
+    if workers:
+        avg = {k: sum(m[k] for m in workers) / len(workers) / 1024 for k in ('rss', 'pss', 'uss')}
+        total_pss = sum(mem['pss'] for _, _, mem in rows) / 1024
+        print(f"{'avg/wkr':<16}{avg['rss']:>10.1f}{avg['pss']:>10.1f}{avg['uss']:>10.1f}")
+        print(f"total PSS (master + {len(workers)} workers): {total_pss:.1f} MB")
+
+
+if __name__ == '__main__':
+    main()